@@ -0,0 +1,187 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from src.CSV import CSV
+from src.ActivityTable import ActivityTable
+from src.parsed_cache import parse_video
+from src.bootstrap_standard_error import bootstrap_standard_error
+from benchmarks.synthetic_data import generate_dataset
+
+# Constants --------------------------------------------------------------------
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")   # Directory of the JSON reports
+SCALES = [10, 100, 1000]                               # Sizes of the synthetic datasets (multiples of the shipped data)
+N_REPEATS = 3                                          # Timed runs by scenario and scale
+BOOTSTRAP_REPEATS = 1000                               # Bootstrap resamples of the 'bootstrap' scenario (the scripts use N_REPEATS=50000)
+
+# Scenarios --------------------------------------------------------------------
+# A scenario prepares its inputs (not timed) and returns (run, n_items): run() is the timed hot path, n_items the number of rows it processes
+def scenario_csv_read(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], None], int]:
+    path = get_merged_activities_csv(data_dir, names, work_dir)
+    return (lambda: CSV().read(path)), count_lines(path) - 1
+
+def scenario_csv_write(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], None], int]:
+    dataset = CSV().read(get_merged_activities_csv(data_dir, names, work_dir))
+    output_path = os.path.join(work_dir, "written_Activity.csv")
+    return (lambda: dataset.write(output_path)), len(dataset)
+
+def scenario_parse_videos(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], None], int]:
+    n_rows = sum(count_lines(os.path.join(data_dir, f"{NAME}_{kind}.csv")) - 1 for NAME in names for kind in ["Activity", "Predator"])
+    return (lambda: [parse_video(NAME, data_dir) for NAME in names]), n_rows
+
+def scenario_duration_minutes(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], None], int]:
+    activities = get_activities_table(data_dir, names).to_activities()
+    return (lambda: [activity.duration_minutes(day_part) for activity in activities for day_part in ["all", "day", "night"]]), len(activities)
+
+def scenario_durations_minutes_array(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], None], int]:
+    table = get_activities_table(data_dir, names)
+    return (lambda: [table.durations_minutes(day_part) for day_part in ["all", "day", "night"]]), len(table)
+
+def scenario_bootstrap(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], None], int]:
+    durations = get_activities_table(data_dir, names).durations_minutes("all")
+    return (lambda: bootstrap_standard_error(durations, np.median, n_repeats=BOOTSTRAP_REPEATS, seed=0)), len(durations)
+
+def scenario_generate_stats(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], int], int]:
+    run_dir = get_script_run_dir(data_dir, work_dir)
+    return (lambda: run_script("generate_stats.py", run_dir)), len(names)
+
+def scenario_generate_plot(data_dir: str, names: List[str], work_dir: str) -> Tuple[Callable[[], int], int]:
+    run_dir = get_script_run_dir(data_dir, work_dir)
+    return (lambda: run_script("generate_plot.py", run_dir)), len(names)
+
+SCENARIOS = {
+    "csv_read": scenario_csv_read,
+    "csv_write": scenario_csv_write,
+    "parse_videos": scenario_parse_videos,
+    "duration_minutes": scenario_duration_minutes,
+    "durations_minutes_array": scenario_durations_minutes_array,
+    "bootstrap": scenario_bootstrap,
+    "generate_stats": scenario_generate_stats,
+    "generate_plot": scenario_generate_plot,
+}
+SCRIPTS_SCENARIOS = ["generate_stats", "generate_plot"]  # Run in a subprocess: peak memory is its max RSS
+
+# Main -------------------------------------------------------------------------
+def run_benchmarks(scales: List[int]=SCALES, scenarios: List[str]=list(SCENARIOS), n_repeats: int=N_REPEATS, seed: int=0) -> Dict:
+    """
+    Run each scenario on a synthetic dataset of each scale.
+        * Time: wall-clock seconds of n_repeats runs (min and median are reported).
+        * Peak memory: one more run under tracemalloc (in-process scenarios) or max RSS of the subprocess (scripts scenarios).
+    """
+    for scenario_name in scenarios:
+        assert scenario_name in SCENARIOS, f"ERROR in run_benchmarks(): scenario '{scenario_name}' should be in {list(SCENARIOS)}."
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix=f"benchmark_x{scale}_") as work_dir:
+            data_dir = os.path.join(work_dir, "data")
+            t0 = time.perf_counter()
+            names = generate_dataset(data_dir, scale=scale, seed=seed)
+            print(f"Scale x{scale}: {len(names)} videos generated in {time.perf_counter() - t0:.2f} sec.")
+            for scenario_name in scenarios:
+                result = run_scenario(scenario_name, data_dir, names, work_dir, n_repeats)
+                result["scale"] = scale
+                print(f"    - {scenario_name}: {result['min_seconds']:.4f} sec. (min of {n_repeats}), peak memory {result['peak_memory_bytes'] / 1024**2:.1f} MB ({result['n_items']} items)")
+                results.append(result)
+    return {"metadata": get_metadata(n_repeats, seed), "results": results}
+
+def run_scenario(scenario_name: str, data_dir: str, names: List[str], work_dir: str, n_repeats: int) -> Dict:
+    run, n_items = SCENARIOS[scenario_name](data_dir, names, work_dir)
+    times = []
+    peak_memory_bytes = 0
+    for _ in range(n_repeats):
+        t0 = time.perf_counter()
+        output = run()
+        times.append(time.perf_counter() - t0)
+        if scenario_name in SCRIPTS_SCENARIOS:
+            peak_memory_bytes = max(peak_memory_bytes, output)
+    if scenario_name not in SCRIPTS_SCENARIOS:
+        tracemalloc.start()
+        run()
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "scenario": scenario_name, "n_items": n_items,
+        "times_seconds": times, "min_seconds": min(times), "median_seconds": float(np.median(times)),
+        "peak_memory_bytes": int(peak_memory_bytes),
+        "memory_method": "max_rss" if scenario_name in SCRIPTS_SCENARIOS else "tracemalloc",
+    }
+
+# Dependencies -----------------------------------------------------------------
+def get_merged_activities_csv(data_dir: str, names: List[str], work_dir: str) -> str:
+    """All the activities files in one file (written once by scale)."""
+    path = os.path.join(work_dir, "merged_Activity.csv")
+    if not os.path.isfile(path):
+        with open(path, "w") as fs:
+            for i, NAME in enumerate(names):
+                with open(os.path.join(data_dir, f"{NAME}_Activity.csv")) as video_fs:
+                    lines = video_fs.read().splitlines()
+                fs.write("\n".join(lines if i == 0 else lines[1:]) + "\n")
+    return path
+
+def get_activities_table(data_dir: str, names: List[str]) -> ActivityTable:
+    return ActivityTable.concatenate([parse_video(NAME, data_dir)[0] for NAME in names])
+
+def count_lines(path: str) -> int:
+    with open(path) as fs:
+        return sum(1 for line in fs if line.strip() != "")
+
+def get_script_run_dir(data_dir: str, work_dir: str) -> str:
+    """Working directory of the scripts: './data/' is the synthetic dataset, './stats/' and './fig/' are empty."""
+    run_dir = os.path.join(work_dir, "run")
+    os.makedirs(run_dir, exist_ok=True)
+    if not os.path.exists(os.path.join(run_dir, "data")):
+        os.symlink(data_dir, os.path.join(run_dir, "data"))
+    for output_dir in ["stats", "fig"]:
+        os.makedirs(os.path.join(run_dir, output_dir), exist_ok=True)
+    return run_dir
+
+def run_script(script_name: str, run_dir: str) -> int:
+    """Run a script from a clean build cache, returns the max RSS of its process (in bytes)."""
+    shutil.rmtree(os.path.join(run_dir, ".cache"), ignore_errors=True)
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, script_name)], cwd=run_dir, stdout=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    assert process.returncode == 0, f"ERROR in run_script('{script_name}'): script failed with exit code {process.returncode}."
+    return rusage.ru_maxrss * 1024 # Kilobytes on Linux
+
+def get_metadata(n_repeats: int, seed: int) -> Dict:
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"), "commit": get_commit(),
+        "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(), "n_cpus": os.cpu_count(),
+        "n_repeats": n_repeats, "seed": seed, "bootstrap_repeats": BOOTSTRAP_REPEATS,
+    }
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+# Execution --------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the hot paths of the analysis and plotting scripts on synthetic datasets.")
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)), help="Comma-separated multiples of the shipped data (default: %(default)s).")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios (default: all).")
+    parser.add_argument("--repeats", type=int, default=N_REPEATS, help="Timed runs by scenario (default: %(default)s).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic datasets (default: %(default)s).")
+    parser.add_argument("--output", default=None, help="JSON report path (default: benchmarks/results/benchmark_<date>.json).")
+    args = parser.parse_args()
+
+    report = run_benchmarks([int(scale) for scale in args.scales.split(",")], args.scenarios.split(","), args.repeats, args.seed)
+    output_path = args.output or os.path.join(RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as fs:
+        json.dump(report, fs, indent=1)
+    print(f"Report saved at '{output_path}'.")
@@ -0,0 +1,85 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Tuple
+from benchmarks.run_benchmarks import REPO_DIR, RESULTS_DIR, get_metadata
+
+# Constants --------------------------------------------------------------------
+N_REPEATS = 5                                          # Runs by check (the fastest one is kept: startup times are noisy)
+
+# Startup checks: (name, python arguments, modules that must not be imported, budget in seconds of the imports)
+# Budgets are about twice the time measured on a single-core machine, the forbidden modules are the strict guard
+CHECKS: List[Tuple[str, List[str], List[str], float]] = [
+    (
+        "import generate_stats", ["-c", "import generate_stats"],
+        ["matplotlib", "src.bootstrap_standard_error", "src.interval_overlap", "concurrent.futures.process", "argparse", "cProfile"],
+        0.5,
+    ),
+    (
+        "generate_stats --help", ["generate_stats.py", "--help"],
+        ["matplotlib", "src.bootstrap_standard_error", "src.interval_overlap", "concurrent.futures.process", "cProfile"],
+        0.5,
+    ),
+    (
+        "import generate_plot", ["-c", "import generate_plot"],
+        ["matplotlib", "concurrent.futures.process"],
+        0.5,
+    ),
+]
+
+# Main -------------------------------------------------------------------------
+def run_startup_checks(n_repeats: int=N_REPEATS, budget_factor: float=1.0) -> Dict:
+    """Run each check with 'python -X importtime' and compare its imports with the forbidden modules and the time budget."""
+    results = []
+    for name, args, forbidden_modules, budget_seconds in CHECKS:
+        runs = [get_import_times(args) for _ in range(n_repeats)]
+        totals = [sum(import_times.values()) for import_times in runs]
+        import_times = runs[totals.index(min(totals))]
+        imported_forbidden = [module for module in forbidden_modules if module in import_times]
+        top_modules = sorted(import_times.items(), key=lambda item: -item[1])[:10]
+        result = {
+            "check": name, "args": args,
+            "import_seconds": min(totals), "budget_seconds": budget_seconds * budget_factor,
+            "n_modules": len(import_times), "forbidden_modules": imported_forbidden,
+            "top_modules_self_seconds": dict(top_modules),
+        }
+        result["passed"] = len(imported_forbidden) == 0 and result["import_seconds"] <= result["budget_seconds"]
+        print(f"{'PASS' if result['passed'] else 'FAIL'} {name}: {result['import_seconds']:.3f} sec. of imports (budget {result['budget_seconds']:.3f} sec.), {len(import_times)} modules")
+        for module in imported_forbidden:
+            print(f"    - forbidden module imported at startup: '{module}'")
+        results.append(result)
+    return {"metadata": get_metadata(n_repeats, seed=0), "results": results}
+
+# Dependencies -----------------------------------------------------------------
+def get_import_times(args: List[str]) -> Dict[str, float]:
+    """Self import time (in seconds) of each module imported by 'python -X importtime <args>' (run from the root directory)."""
+    process = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=REPO_DIR, capture_output=True, text=True)
+    assert process.returncode == 0, f"ERROR in get_import_times({args}): command failed with exit code {process.returncode}:\n{process.stderr[-2000:]}"
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        import_times[module.strip()] = int(self_us) * 1e-6
+    return import_times
+
+# Execution --------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Guard the startup time of the scripts against import regressions (exit code 1 on failure).")
+    parser.add_argument("--repeats", type=int, default=N_REPEATS, help="Runs by check, the fastest is kept (default: %(default)s).")
+    parser.add_argument("--budget-factor", type=float, default=1.0, help="Multiply the time budgets (ex: for slow CI machines).")
+    parser.add_argument("--output", default=None, help="JSON report path (default: benchmarks/results/startup_<date>.json).")
+    args = parser.parse_args()
+
+    report = run_startup_checks(args.repeats, args.budget_factor)
+    output_path = args.output or os.path.join(RESULTS_DIR, f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w") as fs:
+        json.dump(report, fs, indent=1)
+    print(f"Report saved at '{output_path}'.")
+    sys.exit(0 if all(result["passed"] for result in report["results"]) else 1)
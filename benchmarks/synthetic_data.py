@@ -0,0 +1,103 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+from typing import List, Union
+import numpy as np
+from src.CSV import CSV
+
+# Constants --------------------------------------------------------------------
+SHIPPED_N_VIDEOS = 4                                   # Number of videos of the shipped data (scale 1)
+CAMERAS = ["cam_inf", "cam_sup"]
+ACTIVITIES = ["resting", "column", "foraging", "transport", "construction", "transport+construction"]
+ACTIVITIES_PROBABILITIES = [0.45, 0.15, 0.15, 0.1, 0.1, 0.05]
+PREDATORS = ["Opiliones", "Reduviidae"]
+N_DAYS = 4                                             # Days by video
+ACTIVITIES_BY_DAY = 3.0                                # Mean number of activities by day and by camera
+GAP_PROBABILITY = 0.1                                  # Probability of a gap (cutted activities) after an activity
+PREDATORS_BY_DAY = 10.0                                # Mean number of predator presences by day (all cameras)
+MAX_ATTACKS = 5                                        # Number of attack columns of the predators files
+
+# Main -------------------------------------------------------------------------
+def generate_dataset(
+        data_dir: str, scale: int=1, n_nests: int=3, n_days: int=N_DAYS, cameras: List[str]=CAMERAS,
+        activities_by_day: float=ACTIVITIES_BY_DAY, predators_by_day: float=PREDATORS_BY_DAY,
+        seed: Union[None, int]=0,
+    ) -> List[str]:
+    """
+    Write a synthetic dataset of <scale> times the number of videos of the shipped data in data_dir (videos are spread over n_nests nests).
+    Returns the names of the videos (files '<NAME>_Activity.csv' and '<NAME>_Predator.csv').
+    """
+    assert 1 <= n_nests <= 9, f"ERROR in generate_dataset(): n_nests={n_nests} should be in [1, 9] (the nest is the second character of the video name)."
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names = []
+    for i in range(SHIPPED_N_VIDEOS * scale):
+        name = f"N{i % n_nests + 1}_video{i + 1}"
+        generate_video(data_dir, name, n_days, cameras, activities_by_day, predators_by_day, rng)
+        names.append(name)
+    return names
+
+def generate_video(
+        data_dir: str, name: str, n_days: int=N_DAYS, cameras: List[str]=CAMERAS,
+        activities_by_day: float=ACTIVITIES_BY_DAY, predators_by_day: float=PREDATORS_BY_DAY,
+        rng: Union[None, np.random.Generator]=None,
+    ) -> None:
+    """
+    Write the '<name>_Activity.csv' and '<name>_Predator.csv' files of a synthetic video of n_days days.
+        * Activities: one contiguous sequence by camera (with a few gaps) from the start to the end of the record, minute resolution.
+        * Predators: presences of 1 to 30 minutes with up to MAX_ATTACKS attacks, second resolution.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    record_start = int(rng.integers(10 * 3600, 18 * 3600)) // 60 * 60
+    record_end = record_start + (n_days - 1) * 24 * 3600 + int(rng.integers(0, 12 * 3600)) // 60 * 60
+
+    # Activities
+    activities = CSV(["day", "start", "end", "activity", "cam"], print_warnings=False)
+    mean_duration = 24 * 3600 / activities_by_day
+    for cam in cameras:
+        t = record_start
+        while t < record_end:
+            duration = int(np.clip(rng.exponential(mean_duration), 60, 20 * 3600)) // 60 * 60
+            end = min(t + duration, record_end)
+            activities.add_entry({
+                "day": get_day_str(t, end), "start": get_time_str(t), "end": get_time_str(end),
+                "activity": ACTIVITIES[rng.choice(len(ACTIVITIES), p=ACTIVITIES_PROBABILITIES)], "cam": cam,
+            })
+            t = end
+            if rng.random() < GAP_PROBABILITY:
+                t += int(rng.exponential(30 * 60)) // 60 * 60
+    activities.write(os.path.join(data_dir, f"{name}_Activity.csv"))
+
+    # Predators
+    attacks_columns = [f"attack{i + 1}" for i in range(MAX_ATTACKS)]
+    predators = CSV(["day", "start", "end", "predator"] + attacks_columns + ["cam"], print_warnings=False)
+    n_predators = int(rng.poisson(predators_by_day * n_days))
+    starts = np.sort(rng.integers(record_start, record_end - 1800, n_predators))
+    for start in starts.tolist():
+        end = start + int(rng.integers(60, 1800))
+        n_attacks = int(rng.choice(MAX_ATTACKS + 1, p=get_attacks_probabilities()))
+        attacks = np.sort(rng.integers(start, end, n_attacks)).tolist()
+        entry = {
+            "day": get_day_str(start, end), "start": get_time_str(start), "end": get_time_str(end),
+            "predator": PREDATORS[int(rng.integers(len(PREDATORS)))], "cam": cameras[int(rng.integers(len(cameras)))],
+        }
+        for i, column in enumerate(attacks_columns):
+            entry[column] = get_time_str(attacks[i]) if i < n_attacks else ""
+        predators.add_entry(entry)
+    predators.write(os.path.join(data_dir, f"{name}_Predator.csv"))
+
+# Dependencies -----------------------------------------------------------------
+def get_time_str(seconds: int) -> str:
+    """'HH:MM:SS' of a moment in seconds since the midnight before the first day."""
+    seconds = seconds % (24 * 3600)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def get_day_str(start_seconds: int, end_seconds: int) -> str:
+    """'day' column: 'D' or 'D1/D2' if the activity ends on another day (days start at 1)."""
+    start_day, end_day = start_seconds // (24 * 3600) + 1, end_seconds // (24 * 3600) + 1
+    return f"{start_day}" if start_day == end_day else f"{start_day}/{end_day}"
+
+def get_attacks_probabilities() -> np.ndarray:
+    """Most presences have no attack, then fewer and fewer presences with more attacks."""
+    weights = np.array([8.0] + [0.5**i for i in range(MAX_ATTACKS)])
+    return weights / np.sum(weights)
@@ -1,26 +1,37 @@
 
 # Imports ----------------------------------------------------------------------
 import os
+import inspect
 from datetime import datetime, time, timedelta
 #import seaborn as sns
-import matplotlib.pyplot as plt
-import matplotlib as mpl
+from typing import Any, Dict, List, Tuple, Union
 from src.CSV import CSV
 from src.Activity import REFERENCE_DATETIME, HOURS_BY_LINE, SECONDS_BY_LINE
-from src.Activity import add_dayshifts, get_coords, get_seconds, Activity, Predator
+from src.Activity import add_dayshifts, get_coords, get_coords_from_seconds, get_seconds, Activity, Predator
+from src.ActivityTable import ActivityTable
+from src.build_cache import get_key, BuildCache
+from src.parsed_cache import load_video
+from src.ingestion import discover_videos
+
+# matplotlib is imported in the functions that render figures: up to date figures, cache keys and tiles indexes do not load it
 
 
 # Constants --------------------------------------------------------------------
 
 # Names and paths
-NAMES_LIST = [                                         # File names to run on
-    "N1_video1-2", "N2_video3-4-5-6-7", "N3_video8", "N3_video9",
-]
 DATA_DIR = "./data/"                                   # Directory of .csv data files (input)
 FIG_DIR = "./fig/"                                     # Directory of figures (output)
+NAMES_LIST = discover_videos(DATA_DIR)                 # File names to run on (all the '<NAME>_Activity.csv'/'<NAME>_Predator.csv' pairs of DATA_DIR)
 EXTENTIONS = ["png"]                                   # List of extentions to which save the figures
 DPI = 300                                              # Dots per inch in saved figures
 
+# Execution parameters
+N_WORKERS = 1                                          # Number of processes rendering figures in parallel (1: no pool)
+SPLIT_CAMERAS = False                                  # Save one figure by video and camera instead of one figure by video
+LINES_BY_PAGE = None                                   # Save one figure by page of n lines (None: whole timeline, 24 // HOURS_BY_LINE: one page by day)
+WRITE_TILES_INDEX = True                               # Save a '<name>_tiles.csv' index of the pages (only when LINES_BY_PAGE is set)
+USE_CACHE = True                                       # Reuse parsed data and skip figures whose data files, code and parameters did not change since they were saved
+
 # Data parameters
 POSSIBLE_CAMERAS = ["cam_inf", "cam_sup"]              # List of possible cameras
 
@@ -61,13 +72,146 @@ HOURS_LINE_TICKS_LENGTH = 175             # Vertical length of the hoursline tic
 BAR_RECTANGLE_LINE_WIDTH = 0.6            # Width of the activity rectangle countour lines (rectangle is here even if there is not activity)
 BAR_COUNTOUR_LINE_WIDTH = 0.5             # Width of the activity countour lines (around each activity)
 BAR_COUNTOUR_COLOR = None                 # Color of the activity countour lines (around each activity): Set None to keep the same color as the activity bar
+BATCHED_RENDERING = True                  # Draw one collection by style (fast) instead of one artist by bar, line and attack (slow)
 
-# Execution --------------------------------------------------------------------
+# Functions --------------------------------------------------------------------
+Color = Union[str, Tuple[float, float, float]]
+
+def draw_lines(ax, lines: List[Tuple[List[float], List[float], float]], batched: bool=BATCHED_RENDERING) -> None:
+    """Draw black lines ([x0, x1], [y0, y1], linewidth) in a single LineCollection (or one plt.plot by line)."""
+    if not batched:
+        for xs, ys, linewidth in lines:
+            ax.plot(xs, ys, color="black", linewidth=linewidth)
+        return
+    if len(lines) == 0: return
+    from matplotlib.collections import LineCollection
+    ax.add_collection(LineCollection(
+        [list(zip(xs, ys)) for xs, ys, _ in lines],
+        colors="black", linewidths=[linewidth for _, _, linewidth in lines],
+        capstyle="projecting", zorder=2,
+    ), autolim=False)
+
+def draw_bars(ax, bars: List[Tuple[float, float, float, float, Color, Color, Union[None, str]]], linewidth: float, batched: bool=BATCHED_RENDERING) -> None:
+    """Draw horizontal bars (left, width, y_center, height, color, edgecolor, hatch) in one PolyCollection by style (or one ax.barh by bar)."""
+    if not batched:
+        for left, width, y_center, height, color, edgecolor, hatch in bars:
+            ax.barh(
+                [y_center], [width], left=[left], height=height,
+                color=color, edgecolor=edgecolor, alpha=1.0, hatch=hatch, linewidth=linewidth,
+            )
+        return
+    from matplotlib.collections import PolyCollection
+    vertices_by_style: Dict[Tuple[Color, Color, Union[None, str]], List[List[Tuple[float, float]]]] = {}
+    for left, width, y_center, height, color, edgecolor, hatch in bars:
+        bottom, top, right = y_center - height / 2, y_center + height / 2, left + width
+        vertices_by_style.setdefault((color, edgecolor, hatch), []).append([(left, bottom), (right, bottom), (right, top), (left, top)])
+    for (color, edgecolor, hatch), vertices in vertices_by_style.items():
+        ax.add_collection(PolyCollection(
+            vertices, facecolors=color, edgecolors=edgecolor, hatch=hatch,
+            linewidths=linewidth, alpha=1.0, joinstyle="miter",
+        ), autolim=False)
+
+def draw_attacks(ax, attacks: List[Tuple[float, float, Color]], batched: bool=BATCHED_RENDERING) -> None:
+    """Draw attacks markers (x, y, color) in one scatter by color (or one plt.scatter by attack)."""
+    if not batched:
+        for x, y, color in attacks:
+            ax.scatter([x], [y], marker="x", color=color, sizes=[ATTACK_MARKER_SIZE], alpha=ATTACK_ALPHA)
+        return
+    points_by_color: Dict[Color, List[Tuple[float, float]]] = {}
+    for x, y, color in attacks:
+        points_by_color.setdefault(color, []).append((x, y))
+    for color, points in points_by_color.items():
+        xs, ys = zip(*points)
+        ax.scatter(xs, ys, marker="x", color=color, sizes=[ATTACK_MARKER_SIZE], alpha=ATTACK_ALPHA)
+
+def get_pages(n_lines: int, lines_by_page: Union[None, int]) -> List[Tuple[int, int]]:
+    """Ranges [first_line, end_line[ of the lines of each page (a single page when lines_by_page is None)."""
+    if lines_by_page is None:
+        return [(0, n_lines)]
+    assert lines_by_page > 0, f"ERROR in get_pages(): lines_by_page={lines_by_page} should be > 0."
+    return [(first_line, min(first_line + lines_by_page, n_lines)) for first_line in range(0, n_lines, lines_by_page)]
+
+def split_by_page(elements: List[Tuple[int, Any]], pages: List[Tuple[int, int]]) -> List[List[Any]]:
+    """Elements (line, element) of each page (ranges [first_line, end_line[ of get_pages()), in their order in elements."""
+    page_of_line = {line: page_i for page_i, (first_line, end_line) in enumerate(pages) for line in range(first_line, end_line)}
+    elements_by_page = [[] for _ in pages]
+    for line, element in elements:
+        if line in page_of_line:
+            elements_by_page[page_of_line[line]].append(element)
+    return elements_by_page
+
+def init_figure(x0: float, x1: float, y0: float, y1: float, y_ticks: List[float]):
+    """New figure and axes of the area [x0, x1] x [y0, y1] of the timeline (one inch by hour, without spines)."""
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    #if DARKGRID:
+    #    sns.set_style("darkgrid")
+    #if not DARKGRID:
+    # Hiding the spines
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+    ax.spines['bottom'].set_visible(False)
+    #plt.title(f"Timeline: {NAME}")
+    ax.set_xlim(x0-X_MARGIN, x1+X_MARGIN)
+    ax.set_ylim(y0, y1)
+    fig.set_size_inches((x1 - x0)/3600, (y1 - y0)/3600)
+    if X_TICKS:
+        ax.set_xticks([x0, x1], ["", ""])
+    else:
+        ax.set_xticks([], [])
+    if Y_TICKS:
+        ax.set_yticks(y_ticks, ["" for _ in y_ticks])
+    else:
+        ax.set_yticks([], [])
+    return fig, ax
+
+def init_worker() -> None:
+    """Use the non-interactive Agg backend in the rendering workers."""
+    import matplotlib.pyplot as plt
+    plt.switch_backend("Agg")
+
+def get_figure_key(NAME: str, selected_cam: Union[None, str]=None) -> str:
+    """Cache key of a figure: content of the data files of the video, of the plotting code and of the plot parameters."""
+    input_paths = [
+        os.path.join(DATA_DIR, f"{NAME}_Activity.csv"), os.path.join(DATA_DIR, f"{NAME}_Predator.csv"),
+        __file__, inspect.getsourcefile(Activity), inspect.getsourcefile(CSV), inspect.getsourcefile(ActivityTable),
+        inspect.getsourcefile(load_video),
+    ]
+    return get_key(
+        input_paths, name=NAME, selected_cam=selected_cam,
+        reference_datetime=REFERENCE_DATETIME, hours_by_line=HOURS_BY_LINE,
+        fig_dir=FIG_DIR, extentions=EXTENTIONS, dpi=DPI, lines_by_page=LINES_BY_PAGE, write_tiles_index=WRITE_TILES_INDEX,
+        batched_rendering=BATCHED_RENDERING, matplotlib_version=get_matplotlib_version(),
+    )
+
+def get_matplotlib_version() -> str:
+    """Installed matplotlib version, read from the package metadata (without importing matplotlib)."""
+    from importlib.metadata import version
+    return version("matplotlib")
+
+def plot_video_task(task: Tuple[str, Union[None, str]]) -> List[str]:
+    """Plot the figure of a (NAME, selected_cam) task, unless it is up to date in the build cache."""
+    NAME, selected_cam = task
+    cache = BuildCache(enabled=USE_CACHE)
+    cache_name = NAME if selected_cam is None else f"{NAME}_{selected_cam}"
+    key = get_figure_key(NAME, selected_cam)
+    if cache.is_up_to_date("figures", cache_name, key):
+        print(f"Figure of '{cache_name}' is up to date: skip")
+        return cache.load("figures", cache_name, key)
+    fig_paths = plot_video(NAME, selected_cam)
+    cache.set_up_to_date("figures", cache_name, key, fig_paths)
+    return fig_paths
 
-for NAME in NAMES_LIST:
+# Main -------------------------------------------------------------------------
+def plot_video(NAME: str, selected_cam: Union[None, str]=None) -> List[str]:
+    """Generate the timeline figure of video NAME (only for camera selected_cam if set) and returns the saved paths."""
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
     print("\n")
     print("\n---------------------------------------------------------------------------------------")
     print(f"GENERATE TIME FIGURE ON '{NAME}' ---------------------------------------------------------")
+    lines_by_page = LINES_BY_PAGE # Read once: pages, their limits, names and the tiles index all use this value
 
     # Init constants
     ATTACK_OPI_CENTER = SPACE_TOP + ATTACK_BAR_HEIGHT / 2
@@ -78,16 +222,13 @@ for NAME in NAMES_LIST:
     HOURS_CENTER = SPACE_TOP + ATTACK_BAR_HEIGHT + PREDATOR_BAR_HEIGHT + SPACE_PREDATORS + ATTACK_BAR_HEIGHT + PREDATOR_BAR_HEIGHT + SPACE_PREDATOR_ACTIVITY + ACTIVITY_BAR_HEIGHT + HOURS_BAR_HEIGHT / 2
     CAM_LINE_HEIGHT =  SPACE_TOP + ATTACK_BAR_HEIGHT + PREDATOR_BAR_HEIGHT + SPACE_PREDATORS + ATTACK_BAR_HEIGHT + PREDATOR_BAR_HEIGHT + SPACE_PREDATOR_ACTIVITY + ACTIVITY_BAR_HEIGHT + HOURS_BAR_HEIGHT + SPACE_BOTTOM
 
-    # Read activity data
-    ACTIVITY_PATH = os.path.join(DATA_DIR, f"{NAME}_Activity.csv")
-    activities_data = CSV().read(ACTIVITY_PATH)
-    add_dayshifts(activities_data)
-    activities_data.show(n_entries=25)
+    # Read activities and predators data (text files are parsed once, then loaded from the parsed cache)
+    activities_table, predators_table = load_video(NAME, DATA_DIR, use_cache=USE_CACHE)
+    print(activities_table)
 
     # Parse activities
     activities_list = []
-    for entry in activities_data:
-        activity = Activity.parse_activity(entry, NAME)
+    for activity in activities_table.to_activities():
         print(activity)
         activities_list.append(activity)
     print()
@@ -100,6 +241,10 @@ for NAME in NAMES_LIST:
             raise ValueError(f"Non-existing cam '{cam}'")
         if cam not in cameras:
             cameras.append(cam)
+    if selected_cam is not None:
+        if selected_cam not in cameras:
+            return []
+        cameras = [selected_cam]
     TIME_LINE_HEIGHT = CAM_LINE_HEIGHT * len(cameras) + SPACE_TIME
     cameras = cameras[::-1] # Reverse the order so cam_sup is before cam_int
 
@@ -114,17 +259,11 @@ for NAME in NAMES_LIST:
                 raise ValueError(f"ERROR in {activity}: \n activity {i} starts before previous activity")
             previous_activity_start = activity.start
 
-    # Read predators data
-    PREDATORS_PATH = os.path.join(DATA_DIR, f"{NAME}_Predator.csv")
-    predators_data = CSV().read(PREDATORS_PATH)
-    add_dayshifts(predators_data)
-    predators_data.show(n_entries=25)
-
     # Parse predators
+    print(predators_table)
     predators_list = []
-    for entry in predators_data:
-        if entry["predator"] == "video": continue
-        predator = Predator.parse_predator(entry, NAME)
+    for predator in predators_table.to_activities():
+        if predator.type == "video": continue
         print(predator)
         predators_list.append(predator)
     print()
@@ -153,84 +292,57 @@ for NAME in NAMES_LIST:
     # Init plot
     first_start, last_end = activities_list[0].start, activities_list[-1].end
     last_y = get_coords(last_end)[1] + 1
-    #if DARKGRID:
-    #    sns.set_style("darkgrid")
-    fig, ax = plt.subplots()
-    #if not DARKGRID:
-    # Hiding the spines
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_visible(False)
-    ax.spines['bottom'].set_visible(False)
-    #plt.title(f"Timeline: {NAME}")
     x0, x1 = 0, SECONDS_BY_LINE
-    dx = x1 - x0
-    y0, y1 = -(TIME_LINE_HEIGHT*last_y - SPACE_TIME), 0
-    dy = y1 - y0
-    plt.xlim(x0-X_MARGIN, x1+X_MARGIN)
-    plt.ylim(y0, y1)
-    #print(dx/3600, dy/3600)
-    plt.gcf().set_size_inches(dx/3600, dy/3600)
-
-    # Set ticks
-    if X_TICKS:
-        ax.set_xticks([x0, x1], ["", ""])
-    else:
-        ax.set_xticks([], [])
+    mpl.rcParams['hatch.linewidth'] = 11
+
+    # Set ticks (elements of the plot are kept as (line, element): each page is drawn only from the elements of its lines)
     y_ticks = []
     for cam_i, cam in enumerate(cameras):
         for i in range(last_y):
-            y_ticks.append(- SPACE_TOP - i*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT)
-            y_ticks.append(- ACTIVITY_CENTER - ACTIVITY_BAR_HEIGHT/2 - i*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT)
-    if Y_TICKS:
-        ax.set_yticks(y_ticks, ["" for _ in y_ticks])
-    else:
-        ax.set_yticks([], [])
+            y_ticks.append((i, - SPACE_TOP - i*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT))
+            y_ticks.append((i, - ACTIVITY_CENTER - ACTIVITY_BAR_HEIGHT/2 - i*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT))
+    hours_lines_ticks = y_ticks[1::2] # only drown hour line at bottom
 
     # Draw hours line, line this: |----------|----------|----------|
-    for i_hoursline, y0 in enumerate(y_ticks):
-        if i_hoursline % 2 == 0: continue # only drown hour line at bottom
-        plt.plot([x0, x1], [y0, y0], color="black", linewidth=HOURS_LINE_WIDTH)
-        dx = (x1 - x0) / HOURS_LINE_N_TICKS
+    lines = []
+    dx = (x1 - x0) / HOURS_LINE_N_TICKS
+    for i, y in hours_lines_ticks:
+        lines.append((i, ([x0, x1], [y, y], HOURS_LINE_WIDTH)))
         for j_hoursline in range(HOURS_LINE_N_TICKS+1):
             x_hoursline = x0 + j_hoursline*dx
-            plt.plot([x_hoursline, x_hoursline], [y0, y0-HOURS_LINE_TICKS_LENGTH], color="black", linewidth=HOURS_LINE_WIDTH)
+            lines.append((i, ([x_hoursline, x_hoursline], [y, y-HOURS_LINE_TICKS_LENGTH], HOURS_LINE_WIDTH)))
 
     # Draw bar rectangle (even when there is no activity)
-    for i_hoursline, y0 in enumerate(y_ticks):
-        if i_hoursline % 2 == 0: continue # only drown hour line at bottom
-        plt.plot([x0, x1], [y0, y0], color="black", linewidth=BAR_RECTANGLE_LINE_WIDTH)
-        plt.plot([x0, x1], [y0+ACTIVITY_BAR_HEIGHT, y0+ACTIVITY_BAR_HEIGHT], color="black", linewidth=BAR_RECTANGLE_LINE_WIDTH)
-        plt.plot([x0, x0], [y0, y0+ACTIVITY_BAR_HEIGHT], color="black", linewidth=BAR_RECTANGLE_LINE_WIDTH)
-        plt.plot([x1, x1], [y0, y0+ACTIVITY_BAR_HEIGHT], color="black", linewidth=BAR_RECTANGLE_LINE_WIDTH)
+    for i, y in hours_lines_ticks:
+        lines.append((i, ([x0, x1], [y, y], BAR_RECTANGLE_LINE_WIDTH)))
+        lines.append((i, ([x0, x1], [y+ACTIVITY_BAR_HEIGHT, y+ACTIVITY_BAR_HEIGHT], BAR_RECTANGLE_LINE_WIDTH)))
+        lines.append((i, ([x0, x0], [y, y+ACTIVITY_BAR_HEIGHT], BAR_RECTANGLE_LINE_WIDTH)))
+        lines.append((i, ([x1, x1], [y, y+ACTIVITY_BAR_HEIGHT], BAR_RECTANGLE_LINE_WIDTH)))
 
     # Plot time steps
+    texts = []
     for cam_i, cam in enumerate(cameras):
         current_datetime = REFERENCE_DATETIME
         current_coords = get_coords(current_datetime)
-        color = COLOR_MAP["hours_font_color"]
         while current_coords[1] < last_y:
-            plt.text( # Plot text-hours
+            texts.append((current_coords[1], ( # Plot text-hours
                 current_coords[0], -HOURS_CENTER - current_coords[1]*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT,
                 current_datetime.strftime('%H:%M'),
-                fontsize=HOURS_FONT_SIZE, horizontalalignment='center', verticalalignment='top', color=color,
-            )
+            )))
             if current_coords[0] == 0 and current_coords[1] != 0:
-                plt.text( # Plot text-hours: repeat also starting hour above
+                texts.append((current_coords[1]-1, ( # Plot text-hours: repeat also starting hour above
                     SECONDS_BY_LINE, -HOURS_CENTER - (current_coords[1]-1)*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT,
                     current_datetime.strftime('%H:%M'),
-                    fontsize=HOURS_FONT_SIZE, horizontalalignment='center', verticalalignment='top', color=color,
-                )
+                )))
             current_datetime += timedelta(hours=DELTA_TICKS_HOURS)
             current_coords = get_coords(current_datetime)
-        plt.text( # Plot text-hours: plot last hour of the last line
+        texts.append((current_coords[1]-1, ( # Plot text-hours: plot last hour of the last line
             SECONDS_BY_LINE, -HOURS_CENTER - (current_coords[1]-1)*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT,
             current_datetime.strftime('%H:%M'),
-            fontsize=HOURS_FONT_SIZE, horizontalalignment='center', verticalalignment='top', color=color,
-        )
+        )))
 
     # Plot activities
-    mpl.rcParams['hatch.linewidth'] = 11
+    activities_bars = []
     for cam_i, cam in enumerate(cameras):
         for activity in activities_list:
             if activity.cam != cam: continue
@@ -239,29 +351,20 @@ for NAME in NAMES_LIST:
                 edgecolor = BAR_COUNTOUR_COLOR if BAR_COUNTOUR_COLOR is not None else color
                 for (start_x, start_y), (end_x, end_y) in activity.get_coords():
                     duration = end_x - start_x
-                    ax.barh(
-                        [-ACTIVITY_CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT], [duration], left=[start_x],
-                        height=ACTIVITY_BAR_HEIGHT,
-                        color=color, edgecolor=edgecolor, alpha=1.0, linewidth=BAR_COUNTOUR_LINE_WIDTH,
-                    )
+                    y_center = -ACTIVITY_CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT
+                    activities_bars.append((start_y, (start_x, duration, y_center, ACTIVITY_BAR_HEIGHT, color, edgecolor, None)))
             else:
                 color1 = COLOR_MAP[activity.type.split("+")[0]]
                 color2 = COLOR_MAP[activity.type.split("+")[1]]
                 edgecolor1 = BAR_COUNTOUR_COLOR if BAR_COUNTOUR_COLOR is not None else color1
                 for (start_x, start_y), (end_x, end_y) in activity.get_coords():
                     duration = end_x - start_x
-                    ax.barh(
-                        [-ACTIVITY_CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT], [duration], left=[start_x],
-                        height=ACTIVITY_BAR_HEIGHT,
-                        color=color1, edgecolor=edgecolor1, alpha=1.0, linewidth=BAR_COUNTOUR_LINE_WIDTH,
-                    )
-                    ax.barh(
-                        [-ACTIVITY_CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT], [duration], left=[start_x],
-                        height=ACTIVITY_BAR_HEIGHT,
-                        color='none', edgecolor=color2, alpha=1.0, hatch='/', linewidth=BAR_COUNTOUR_LINE_WIDTH,
-                    )
+                    y_center = -ACTIVITY_CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT
+                    activities_bars.append((start_y, (start_x, duration, y_center, ACTIVITY_BAR_HEIGHT, color1, edgecolor1, None)))
+                    activities_bars.append((start_y, (start_x, duration, y_center, ACTIVITY_BAR_HEIGHT, 'none', color2, '/')))
 
     # Plot predators
+    predators_bars = []
     for cam_i, cam in enumerate(cameras):
         for predator in predators_list:
             if predator.cam != cam: continue
@@ -269,24 +372,75 @@ for NAME in NAMES_LIST:
             CENTER = OPI_CENTER if predator.type == "Opiliones" else RED_CENTER
             for (start_x, start_y), (end_x, end_y) in predator.get_coords():
                 duration = end_x - start_x
-                ax.barh(
-                        [-CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT], [duration], left=[start_x],
-                        color=[color], edgecolor="none", alpha=1.0, height=PREDATOR_BAR_HEIGHT, linewidth=BAR_COUNTOUR_LINE_WIDTH,
-                )
+                y_center = -CENTER - start_y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT
+                predators_bars.append((start_y, (start_x, duration, y_center, PREDATOR_BAR_HEIGHT, color, "none", None)))
 
     # Plot attacks
+    attacks = []
     for cam_i, cam in enumerate(cameras):
         for predator in predators_list:
             if predator.cam != cam: continue
             color = COLOR_MAP[predator.type]
             CENTER = ATTACK_OPI_CENTER if predator.type == "Opiliones" else ATTACK_RED_CENTER
-            for attack in predator.attacks:
-                x, y = get_coords(attack)
-                plt.scatter([x], [-CENTER - y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT], marker="x", color=color, sizes=[ATTACK_MARKER_SIZE], alpha=ATTACK_ALPHA)
-
-    # Save figure
-    for ext in EXTENTIONS:
-        FIG_PATH = os.path.join(FIG_DIR, f"{NAME}.{ext}")
-        print(f"Save file at '{FIG_PATH}'")
-        plt.savefig(FIG_PATH, bbox_inches='tight', dpi=DPI)
+            for attack_seconds in predator.attacks_seconds:
+                x, y = get_coords_from_seconds(attack_seconds)
+                attacks.append((y, (x, -CENTER - y*TIME_LINE_HEIGHT - cam_i*CAM_LINE_HEIGHT, color)))
+
+    # Save figure (one figure by page, drawn only from the elements of its lines: raster size and artists are bounded by the page)
+    fig_paths = []
+    fig_name = NAME if selected_cam is None else f"{NAME}_{selected_cam}"
+    pages = get_pages(last_y, lines_by_page)
+    pages_y_ticks, pages_lines, pages_texts = split_by_page(y_ticks, pages), split_by_page(lines, pages), split_by_page(texts, pages)
+    pages_activities_bars, pages_predators_bars, pages_attacks = split_by_page(activities_bars, pages), split_by_page(predators_bars, pages), split_by_page(attacks, pages)
+    tiles_index = CSV(["video", "cam", "page", "first_line", "last_line", "start", "end", "path"])
+    for page_i, (first_line, end_line) in enumerate(pages):
+        page_name = fig_name if lines_by_page is None else f"{fig_name}_page{page_i+1:03d}"
+        page_y0, page_y1 = -(TIME_LINE_HEIGHT*end_line - SPACE_TIME), -TIME_LINE_HEIGHT*first_line
+        fig, ax = init_figure(x0, x1, page_y0, page_y1, pages_y_ticks[page_i])
+        draw_lines(ax, pages_lines[page_i])
+        for x, y, text in pages_texts[page_i]:
+            ax.text(
+                x, y, text,
+                fontsize=HOURS_FONT_SIZE, horizontalalignment='center', verticalalignment='top', color=COLOR_MAP["hours_font_color"],
+            )
+        draw_bars(ax, pages_activities_bars[page_i], linewidth=BAR_COUNTOUR_LINE_WIDTH)
+        draw_bars(ax, pages_predators_bars[page_i], linewidth=BAR_COUNTOUR_LINE_WIDTH)
+        draw_attacks(ax, pages_attacks[page_i])
+        for ext in EXTENTIONS:
+            FIG_PATH = os.path.join(FIG_DIR, f"{page_name}.{ext}")
+            print(f"Save file at '{FIG_PATH}'")
+            fig.savefig(FIG_PATH, bbox_inches='tight', dpi=DPI)
+            fig_paths.append(FIG_PATH)
+            tiles_index.add_entry({
+                "video": NAME, "cam": "All" if selected_cam is None else selected_cam,
+                "page": page_i + 1, "first_line": first_line, "last_line": end_line - 1,
+                "start": REFERENCE_DATETIME + timedelta(hours=first_line*HOURS_BY_LINE),
+                "end": REFERENCE_DATETIME + timedelta(hours=end_line*HOURS_BY_LINE),
+                "path": FIG_PATH,
+            })
+        plt.close(fig)
+    if lines_by_page is not None and WRITE_TILES_INDEX:
+        tiles_index_path = os.path.join(FIG_DIR, f"{fig_name}_tiles.csv")
+        print(f"Save file at '{tiles_index_path}'")
+        tiles_index.write(tiles_index_path)
+        fig_paths.append(tiles_index_path)
+    return fig_paths
+
+# Execution --------------------------------------------------------------------
+if __name__ == "__main__":
+
+    # One task by video (or by video and camera)
+    if SPLIT_CAMERAS:
+        tasks = [(NAME, cam) for NAME in NAMES_LIST for cam in POSSIBLE_CAMERAS]
+    else:
+        tasks = [(NAME, None) for NAME in NAMES_LIST]
+
+    # Render figures
+    if N_WORKERS <= 1:
+        for task in tasks:
+            plot_video_task(task)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=N_WORKERS, initializer=init_worker) as executor:
+            list(executor.map(plot_video_task, tasks))
 
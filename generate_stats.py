@@ -1,20 +1,30 @@
 
 # Imports ----------------------------------------------------------------------
 import os
-from typing import List
-from datetime import datetime, time, timedelta
+import inspect
+from typing import Any, Callable, Dict, List, Tuple, Union
 import numpy as np
 from src.CSV import CSV
 from src.Activity import REFERENCE_DATETIME, HOURS_BY_LINE, SECONDS_BY_LINE
-from src.Activity import add_dayshifts, get_coords, get_seconds, Activity, Predator
-from src.bootstrap_standard_error import bootstrap_standard_error
+from src.Activity import get_activity_groupped, get_active_status, Activity
+from src.ActivityCube import ActivityCube
+from src.DurationsCube import DurationsCube
+from src.QuantileSketch import QuantileSketch
+from src.ActivityTable import ActivityTable, PredatorTable
+from src.build_cache import get_key, BuildCache
+from src.parsed_cache import load_video
+from src.profiling import enable_profiler, get_profiler, stage, count
+from src.ingestion import discover_videos, ingest_videos, read_video_tables
+
+# Modules only needed by some tables or options are imported where they are used (fast startup for small runs):
+# bootstrap (4d), interval overlaps (7), process pools (n_workers > 1) and argparse (CLI)
 
 # Constants --------------------------------------------------------------------
 
 # Names and paths
-NAMES_LIST = ["N1_video1-2", "N2_video3-4-5-6-7", "N3_video8", "N3_video9"]              # File names to run on
 DATA_DIR = "./data/"                                   # Directory of .csv data files (input)
 STATS_DIR = "./stats/"                                 # Directory of stats (output)
+NAMES_LIST = None                                      # File names to run on (None: all the '<NAME>_Activity.csv'/'<NAME>_Predator.csv' pairs of DATA_DIR)
 
 # Data parameters
 NESTS = ["1", "2", "3"]
@@ -23,488 +33,542 @@ ACTIVITIES_SPLITTES = ["resting", "column", "foraging", "transport", "constructi
 ACTIVITIES_GROUPED = ["resting", "column", "foraging", "transport/construction"]
 ACTIVE_STATUS = ["active", "inactive"]
 PREDATORS = ["Opiliones", "Reduviidae"]
+IMCOMPLETE_ACTIVITY_DURATION_THR = 5                   # Activities cutted by the video that last at most this duration (in minutes) are skipped
 
-# Functions --------------------------------------------------------------------
-def read_activities(do_print: bool=False) -> List[Activity]:
-    activities_list = []
-    for NAME in NAMES_LIST:
-        ACTIVITY_PATH = os.path.join(DATA_DIR, f"{NAME}_Activity.csv")
-        activities_data = CSV().read(ACTIVITY_PATH)
-        add_dayshifts(activities_data)
-        for activity in Activity.parse_activies(activities_data, NAME):
-            if do_print: print(activity)
-            activities_list.append(activity)
-    return activities_list
-
-def read_predators(do_print: bool=False) -> List[Predator]:
-    predators_list = []
-    for NAME in NAMES_LIST:
-        PREDATORS_PATH = os.path.join(DATA_DIR, f"{NAME}_Predator.csv")
-        predators_data = CSV().read(PREDATORS_PATH)
-        add_dayshifts(predators_data)
-        for predator in Predator.parse_predators(predators_data, NAME):
-            if do_print: print(predator)
-            predators_list.append(predator)
-    return predators_list
-
-def read_complete_activities() -> List[Activity]:
-    IMCOMPLETE_ACTIVITY_DURATION_THR = 5
-    complete_activities = []
-    for NAME in NAMES_LIST:
-        ACTIVITY_PATH = os.path.join(DATA_DIR, f"{NAME}_Activity.csv")
-        activities_data = CSV().read(ACTIVITY_PATH)
-        activities_video = []
-        add_dayshifts(activities_data)
-        for activity in Activity.parse_activies(activities_data, NAME):
-            activities_video.append(activity)
-        activities_lists_by_cam = [
-            [a for a in activities_video if a.cam == cam]
-            for cam in CAMERAS
-        ]
-        for activities_list_cam in activities_lists_by_cam:
-            for i, a in enumerate(activities_list_cam):
-                
-                # Case of activities cutted by the video
-                if (i == 0 or i == len(activities_list_cam)-1) or a.start != activities_list_cam[i-1].end or a.end != activities_list_cam[i+1].start:
-                    # Skip cutted activities that are clearly too short
-                    if a.duration_minutes() <= IMCOMPLETE_ACTIVITY_DURATION_THR:
-                        continue
-
-                complete_activities.append(a)
-    return complete_activities
-
-def merge_activities(activities_list: List[Activity]) -> List[Activity]:
-    merged_activities_list = []
-    for i, activity in enumerate(activities_list):
-        previous = activities_list[i-1]
-        if previous.video == activity.video and previous.cam == activity.cam and previous.activity_groupped == activity.activity_groupped and previous.end == activity.start:
-            merged_activity = Activity(previous.start, activity.end, activity.type, activity.cam, activity.video)
-            merged_activities_list.append(merged_activity)
-        else:
-            merged_activities_list.append(activity)
-    return merged_activities_list
+# Bootstrap parameters
+BOOTSTRAP_SEED = 2024                                  # Seed of the bootstrap random streams (None for a non-reproducible run)
+N_WORKERS = 1                                          # Number of processes for the ingestion, the tables and the bootstrap (results do not depend on it)
 
-def get_duration(activities: List[Activity], day_part: str="all") -> int:
-    n_min = 0
-    for activity in activities:
-        n_min += activity.duration_minutes(day_part)
-    return n_min
+# Cache parameters
+USE_CACHE = True                                       # Reuse parsed data, per-video tables and bootstrap results of previous runs when their inputs did not change
 
-# Execution --------------------------------------------------------------------
+# Profiling parameters
+PROFILE = True                                         # Time each stage and save a report in STATS_DIR ('timing_report.json' and 'timing_report.csv')
+PROFILE_MODE = None                                    # Capture of the functions: None, "cprofile" (+ 'timing_report.prof') or "sampling"
 
+# Streaming parameters
+STREAMING = False                                      # Aggregate the videos chunk by chunk and only keep mergeable aggregates (flat memory, same tables)
+STREAMING_CHUNK_SIZE = 8                               # Number of videos loaded and aggregated at once in streaming mode
+COLUMNAR_CSV = False                                   # Parse the text files in ColumnarCSV objects (one typed array by column: less memory, same tables)
 
-# Read Activities and Predators
-activities_list = read_activities(do_print=False)
-predators_list = read_predators(do_print=False)
-complete_activities_list = read_complete_activities()
-
-
-# STATS 0: Video Durations
-print("\nVideos Durations ------------------------------------------------------")
-videos_duration = CSV(["video", "cam", "duration_minutes", "duration_hours"])
-for name in ["All"] + NAMES_LIST:
-    name_activities = [a for a in activities_list if name == "All" or a.video == name]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in name_activities if cam == "All" or a.cam == cam]
-        if len(cam_activities) == 0: continue
-        t = get_duration(cam_activities)
-        h, m = t // 60, t % 60
-        t_timedelta = timedelta(minutes=t)
-        print(f"{name}-{cam}: {t} minutes ({h}h+{m}m)")
-        entry = {"video": name, "cam": cam, "duration_minutes": t, "duration_hours": f"{h}h+{m}m"}
-        videos_duration.add_entry(entry)
-videos_duration_path = os.path.join(STATS_DIR, "0_video_durations.csv")
-print(f"   -> Save file in '{videos_duration_path}'")
-videos_duration.write(videos_duration_path)
-
-
-# STAT 1a: temps en minutes par activités + temps total de la video: SPLITTED
-print("\nTime by Activities: SPLITTED ------------------------------------------")
-header = ["nest", "cam"]
-for day_part in ["", "_day", "_night"]:
-    for a in ACTIVITIES_SPLITTES:
-        for measure in ["minutes", "ratio"]:
-            header.append(f"{a}{day_part}_{measure}")
-    header.append(f"total{day_part}_minutes")
-time_by_activities = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in activities_list if nest == "All" or a.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        if len(cam_activities) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-            "total_minutes": get_duration(cam_activities),
-            "total_day_minutes": get_duration(cam_activities, "day"),
-            "total_night_minutes": get_duration(cam_activities, "night"),
-        }
-        for a_type in ACTIVITIES_SPLITTES:
-            type_activities = [a for a in cam_activities if a.activity_splitted == a_type]
-            for day_part in["", "_day", "_night"]:
-                minutes = get_duration(type_activities, day_part.removeprefix("_"))
-                total = entry[f"total{day_part}_minutes"]
-                entry[f"{a_type}{day_part}_minutes"] = minutes
-                entry[f"{a_type}{day_part}_ratio"] = f"{minutes / total:.4f}"
-        time_by_activities.add_entry(entry)
-time_by_activities.show()
-time_by_activities_path = os.path.join(STATS_DIR, "1a_time_by_acivities_splitted.csv")
-print(f"   -> Save file in '{time_by_activities_path}'")
-time_by_activities.write(time_by_activities_path)
-
-
-# STAT 1b: temps en minutes par activités + temps total de la video: GROUPED
-print("\nTime by Activities: GROUPED -------------------------------------------")
-header = ["nest", "cam"]
-for day_part in ["", "_day", "_night"]:
-    for a in ACTIVITIES_GROUPED:
-        for measure in ["minutes", "ratio"]:
-            header.append(f"{a}{day_part}_{measure}")
-    header.append(f"total{day_part}_minutes")
-time_by_activities = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in activities_list if nest == "All" or a.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        if len(cam_activities) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-            "total_minutes": get_duration(cam_activities),
-            "total_day_minutes": get_duration(cam_activities, "day"),
-            "total_night_minutes": get_duration(cam_activities, "night"),
-        }
-        for a_type in ACTIVITIES_GROUPED:
-            type_activities = [a for a in cam_activities if a.activity_groupped == a_type]
-            for day_part in["", "_day", "_night"]:
-                minutes = get_duration(type_activities, day_part.removeprefix("_"))
-                total = entry[f"total{day_part}_minutes"]
-                entry[f"{a_type}{day_part}_minutes"] = minutes
-                entry[f"{a_type}{day_part}_ratio"] = f"{minutes / total:.4f}"
-        time_by_activities.add_entry(entry)
-time_by_activities.show()
-time_by_activities_path = os.path.join(STATS_DIR, "1b_time_by_acivities_grouped.csv")
-print(f"   -> Save file in '{time_by_activities_path}'")
-time_by_activities.write(time_by_activities_path)
-
-
-# STAT 1c: temps en minutes par activités + temps total de la video: ACTIVE STATUS
-print("\nTime by Activities: ACTIVE STATUS -------------------------------------")
-header = ["nest", "cam"]
-for day_part in ["", "_day", "_night"]:
-    for a in ACTIVE_STATUS:
-        for measure in ["minutes", "ratio"]:
-            header.append(f"{a}{day_part}_{measure}")
-    header.append(f"total{day_part}_minutes")
-time_by_activities = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in activities_list if nest == "All" or a.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        if len(cam_activities) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-            "total_minutes": get_duration(cam_activities),
-            "total_day_minutes": get_duration(cam_activities, "day"),
-            "total_night_minutes": get_duration(cam_activities, "night"),
+# Functions --------------------------------------------------------------------
+def get_video_tables_key(NAME: str, data_dir: str=DATA_DIR) -> str:
+    """Cache key of the tables of video NAME: content of its data files, of the parsing code and of the constants."""
+    input_paths = [
+        os.path.join(data_dir, f"{NAME}_Activity.csv"), os.path.join(data_dir, f"{NAME}_Predator.csv"),
+        __file__, inspect.getsourcefile(Activity), inspect.getsourcefile(CSV), inspect.getsourcefile(ActivityTable),
+        inspect.getsourcefile(load_video), inspect.getsourcefile(read_video_tables),
+    ]
+    return get_key(
+        input_paths, name=NAME,
+        reference_datetime=REFERENCE_DATETIME, hours_by_line=HOURS_BY_LINE,
+        cameras=CAMERAS, imcomplete_activity_duration_thr=IMCOMPLETE_ACTIVITY_DURATION_THR,
+    )
+
+def get_bootstrap_key(tasks: List[tuple]) -> str:
+    """Cache key of bootstrap results: content of the arrays, measures and bootstrap settings."""
+    from src.bootstrap_standard_error import N_REPEATS, CI_RANGE, MAX_MEMORY_BYTES, BLOCK_SIZE, bootstrap_standard_errors
+    return get_key(
+        [inspect.getsourcefile(bootstrap_standard_errors)],
+        arrays=[arr for arr, _ in tasks], measures=[measure_function.__name__ for _, measure_function in tasks],
+        n_repeats=N_REPEATS, ci_range=CI_RANGE, max_memory_bytes=MAX_MEMORY_BYTES, block_size=BLOCK_SIZE, seed=BOOTSTRAP_SEED,
+    )
+
+def get_time_by_types(types_cube: ActivityCube, types: List[str], total_cube: ActivityCube) -> CSV:
+    """Table of minutes and ratios (over the total minutes of total_cube) by type for each nest and cam."""
+    header = ["nest", "cam"]
+    for day_part in ["", "_day", "_night"]:
+        for t in types:
+            for measure in ["minutes", "ratio"]:
+                header.append(f"{t}{day_part}_{measure}")
+        header.append(f"total{day_part}_minutes")
+    time_by_types = CSV(header)
+    for nest in ["All"] + NESTS:
+        for cam in ["All"] + CAMERAS:
+            if total_cube.get_count(nest=nest, cam=cam) == 0: continue
+            entry = {
+                "nest": nest, "cam": cam,
+                "total_minutes": total_cube.get_minutes("all", nest=nest, cam=cam),
+                "total_day_minutes": total_cube.get_minutes("day", nest=nest, cam=cam),
+                "total_night_minutes": total_cube.get_minutes("night", nest=nest, cam=cam),
+            }
+            for t in types:
+                for day_part in ["", "_day", "_night"]:
+                    minutes = types_cube.get_minutes(day_part.removeprefix("_"), nest=nest, cam=cam, types=t)
+                    total = entry[f"total{day_part}_minutes"]
+                    entry[f"{t}{day_part}_minutes"] = minutes
+                    entry[f"{t}{day_part}_ratio"] = f"{minutes / total:.4f}"
+            time_by_types.add_entry(entry)
+    return time_by_types
+
+def get_durations_table(durations_cube: DurationsCube, types: List[str], count_name: str="n") -> CSV:
+    """Table of the number, average and median durations by type (types of the cube) for each nest and cam."""
+    header = ["nest", "cam"]
+    for a in types:
+        for measure in [count_name, "average_duration_minutes", "median_duration_minutes"]:
+            header.append(f"{a}_{measure}")
+    activities_durations = CSV(header)
+
+    # Durations sketches of each (nest, cam, type), merged into the rows on 'All' nests or cams (without the activities)
+    sketches = durations_cube.rollup(["nest", "cam", "type"])
+    for nest in ["All"] + NESTS:
+        for cam in ["All"] + CAMERAS:
+            cam_sketches = {
+                (n, c, t): sketch for (n, c, t), sketch in sketches.items()
+                if (nest == "All" or n == nest) and (cam == "All" or c == cam)
+            }
+            if sum(sketch.count for sketch in cam_sketches.values()) == 0: continue
+            entry = {
+                "nest": nest, "cam": cam,
+            }
+            for a_type in types:
+                type_sketch = QuantileSketch.merge([sketch for (_, _, t), sketch in cam_sketches.items() if t == a_type])
+                entry[f"{a_type}_{count_name}"] = type_sketch.count
+                entry[f"{a_type}_average_duration_minutes"] = f"{type_sketch.mean():.4f}"
+                entry[f"{a_type}_median_duration_minutes"] = f"{type_sketch.median():.4f}"
+            activities_durations.add_entry(entry)
+    return activities_durations
+
+# Dataset ----------------------------------------------------------------------
+def load_dataset(
+        data_dir: str=DATA_DIR, names: Union[None, List[str]]=NAMES_LIST,
+        use_cache: bool=USE_CACHE, n_workers: int=N_WORKERS, streaming: bool=STREAMING,
+        keep_durations: bool=True, columnar_csv: bool=COLUMNAR_CSV,
+    ) -> Dict[str, Any]:
+    """
+    Aggregates of the videos shared by all the stats tables (see get_aggregates()).
+        * One partial by video, reused from the build cache when its inputs did not change.
+        * Missing partials are ingested in parallel: each text file is parsed once and the complete/merged tables are derived from it.
+        * streaming=False: the tables of all the videos are concatenated (and kept in the dataset), then aggregated at once.
+        * streaming=True: videos are loaded and aggregated STREAMING_CHUNK_SIZE at a time and only the mergeable aggregates are kept
+          (stats tables are identical while the groups of 4a/4b/4c have at most MAX_EXACT_CENTROIDS distinct durations, their
+          medians are approximate t-digest medians beyond). Cubes grow with the number of videos, not of activities, except the raw merged durations
+          of STATS 4d: the bootstrap resamples them, so they are kept (one integer by merged activity) unless keep_durations=False.
+        * columnar_csv: text files are parsed in ColumnarCSV objects instead of one :dict by entry (see load_video()).
+    """
+    names = discover_videos(data_dir) if names is None else list(names)
+    dataset = {"names": names, "use_cache": use_cache, "n_workers": n_workers}
+
+    # Streaming: load and aggregate chunk by chunk, then merge the partial aggregates
+    if streaming:
+        chunks_aggregates = []
+        for chunk_start in range(0, max(len(names), 1), STREAMING_CHUNK_SIZE):
+            chunk_names = names[chunk_start:chunk_start + STREAMING_CHUNK_SIZE]
+            with stage("load"):
+                videos_tables = load_videos_tables(chunk_names, data_dir, use_cache, n_workers, columnar_csv)
+            with stage("aggregate"):
+                chunks_aggregates.append(get_aggregates(concatenate_videos_tables(videos_tables), keep_durations=keep_durations))
+            del videos_tables
+        with stage("merge"):
+            dataset.update(merge_aggregates(chunks_aggregates))
+
+    # In memory: load all videos, merge per-video partials in array-backed tables and aggregate them
+    else:
+        with stage("load"):
+            videos_tables = load_videos_tables(names, data_dir, use_cache, n_workers, columnar_csv)
+        with stage("merge"):
+            tables = concatenate_videos_tables(videos_tables)
+            for tables_name, table in tables.items():
+                dataset[f"{tables_name}_table"] = table
+
+        # Aggregate Activities and Predators
+        with stage("aggregate"):
+            dataset.update(get_aggregates(tables, keep_durations=keep_durations))
+
+    # Rollups on groups of activities
+    dataset["activities_grouped_cube"] = dataset["activities_cube"].group_types(get_activity_groupped)
+    dataset["activities_status_cube"] = dataset["activities_cube"].group_types(get_active_status)
+    return dataset
+
+def load_videos_tables(names: List[str], data_dir: str, use_cache: bool, n_workers: int, columnar_csv: bool=COLUMNAR_CSV) -> List[Dict[str, ActivityTable]]:
+    """Tables of each video of names (see read_video_tables()), from the build cache or ingested (and saved in the cache)."""
+    cache = BuildCache(enabled=use_cache)
+    videos_keys = {NAME: get_video_tables_key(NAME, data_dir) for NAME in names}
+    videos_tables_map = {NAME: cache.load("video_tables", NAME, videos_keys[NAME]) for NAME in names}
+    missing_names = [NAME for NAME in names if videos_tables_map[NAME] is None]
+    for NAME, tables in zip(missing_names, ingest_videos(missing_names, data_dir, CAMERAS, IMCOMPLETE_ACTIVITY_DURATION_THR, use_cache=use_cache, n_workers=n_workers, columnar_csv=columnar_csv)):
+        cache.save("video_tables", NAME, videos_keys[NAME], tables)
+        videos_tables_map[NAME] = tables
+    return [videos_tables_map[NAME] for NAME in names]
+
+def concatenate_videos_tables(videos_tables: List[Dict[str, ActivityTable]]) -> Dict[str, ActivityTable]:
+    """Tables of several videos concatenated in one table by kind (activities, predators, complete_activities, merged_activities)."""
+    return {
+        "activities": ActivityTable.concatenate([tables["activities"] for tables in videos_tables]),
+        "predators": PredatorTable.concatenate([tables["predators"] for tables in videos_tables]),
+        "complete_activities": ActivityTable.concatenate([tables["complete_activities"] for tables in videos_tables]),
+        "merged_activities": ActivityTable.concatenate([tables["merged_activities"] for tables in videos_tables]),
+    }
+
+def get_aggregates(tables: Dict[str, ActivityTable], keep_durations: bool=True) -> Dict[str, Any]:
+    """
+    Mergeable aggregates of the tables of one video, of a chunk of videos or of all of them (see merge_aggregates()).
+        * Cubes of the minutes, counts and attacks of the activities and predators.
+        * Cubes of the durations distributions (counts, means and medians) of the predators, complete and merged activities.
+        * Cubes of the predators during an active/inactive activity and of their overlap seconds with active/inactive periods.
+        * Durations of the merged activities by grouped activity, in the order of the videos (resampled by the bootstrap of STATS 4d),
+          only if keep_durations (they are the only aggregate whose size grows with the number of activities).
+    """
+    from src.interval_overlap import KeyedIntervals, get_video_cam_keys
+    activities_table, predators_table, merged_activities_table = tables["activities"], tables["predators"], tables["merged_activities"]
+    aggregates = {
+        "activities_cube": ActivityCube.from_table(activities_table),
+        "predators_cube": ActivityCube.from_table(predators_table),
+        "predators_durations_cube": DurationsCube.from_table(predators_table),
+        "complete_activities_durations_cube": DurationsCube.from_table(tables["complete_activities"]),
+        "merged_activities_durations_cube": DurationsCube.from_table(merged_activities_table, type_key="groupped"),
+    }
+    if keep_durations:
+        merged_activities_durations = merged_activities_table.durations_minutes()
+        aggregates["merged_activities_durations"] = {
+            a_type: merged_activities_durations[merged_activities_table.mask(groupped=a_type)]
+            for a_type in ACTIVITIES_GROUPED
         }
-        for a_type in ACTIVE_STATUS:
-            type_activities = [a for a in cam_activities if a.active_status == a_type]
-            for day_part in["", "_day", "_night"]:
-                minutes = get_duration(type_activities, day_part.removeprefix("_"))
-                total = entry[f"total{day_part}_minutes"]
-                entry[f"{a_type}{day_part}_minutes"] = minutes
-                entry[f"{a_type}{day_part}_ratio"] = f"{minutes / total:.4f}"
-        time_by_activities.add_entry(entry)
-time_by_activities.show()
-time_by_activities_path = os.path.join(STATS_DIR, "1c_time_by_acive_status.csv")
-print(f"   -> Save file in '{time_by_activities_path}'")
-time_by_activities.write(time_by_activities_path)
-
-
-# STATS 2: temps de présence en minutes par prédateurs + temps total de la video
-print("\nPredator Presence Time ------------------------------------------------")
-header = ["nest", "cam"]
-for day_part in ["", "_day", "_night"]:
+
+    # Split predators if ther are during an active or an inactive activity (once by predator, sweep-line by (video, cam))
+    # and get the true overlap (in seconds) of each predator presence with the active and inactive periods
+    with stage("overlap_scan"):
+        predators_keys = get_video_cam_keys(predators_table)
+        predators_overlap_cube = ActivityCube(predators_table.videos_labels, predators_table.cams_labels, predators_table.types_labels)
+        for a in ACTIVE_STATUS:
+            status_intervals = KeyedIntervals.from_table(activities_table.filter(status=a))
+            predators_in_status = status_intervals.contains(predators_table.starts, predators_keys)
+            aggregates[f"predators_{a}_cube"] = ActivityCube.from_table(predators_table.select(predators_in_status))
+            predators_overlap_cube.add_sums(f"{a}_overlap_seconds", predators_table, status_intervals.overlap(predators_table.starts, predators_table.ends, predators_keys))
+            count("overlap_predators_scanned", len(predators_table))
+        aggregates["predators_overlap_cube"] = predators_overlap_cube
+    return aggregates
+
+def merge_aggregates(aggregates_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the aggregates of disjoint sets of videos (cubes are merged, durations are concatenated in the order of the list)."""
+    merged_aggregates = {}
+    for key, aggregate in aggregates_list[0].items():
+        if isinstance(aggregate, ActivityCube):
+            merged_aggregates[key] = ActivityCube.merge([aggregates[key] for aggregates in aggregates_list])
+        elif isinstance(aggregate, DurationsCube):
+            merged_aggregates[key] = DurationsCube.merge([aggregates[key] for aggregates in aggregates_list])
+        else:
+            merged_aggregates[key] = {
+                a_type: np.concatenate([aggregates[key][a_type] for aggregates in aggregates_list])
+                for a_type in aggregate
+            }
+    return merged_aggregates
+
+# Tables -----------------------------------------------------------------------
+def compute_videos_durations(dataset: Dict[str, Any]) -> CSV:
+    """STATS 0: Video Durations"""
+    activities_cube = dataset["activities_cube"]
+    videos_duration = CSV(["video", "cam", "duration_minutes", "duration_hours"])
+    for name in ["All"] + dataset["names"]:
+        for cam in ["All"] + CAMERAS:
+            if activities_cube.get_count(video=name, cam=cam) == 0: continue
+            t = activities_cube.get_minutes(video=name, cam=cam)
+            h, m = t // 60, t % 60
+            entry = {"video": name, "cam": cam, "duration_minutes": t, "duration_hours": f"{h}h+{m}m"}
+            videos_duration.add_entry(entry)
+    return videos_duration
+
+def compute_time_by_activities_splitted(dataset: Dict[str, Any]) -> CSV:
+    """STAT 1a: temps en minutes par activités + temps total de la video: SPLITTED"""
+    return get_time_by_types(dataset["activities_cube"], ACTIVITIES_SPLITTES, dataset["activities_cube"])
+
+def compute_time_by_activities_grouped(dataset: Dict[str, Any]) -> CSV:
+    """STAT 1b: temps en minutes par activités + temps total de la video: GROUPED"""
+    return get_time_by_types(dataset["activities_grouped_cube"], ACTIVITIES_GROUPED, dataset["activities_cube"])
+
+def compute_time_by_active_status(dataset: Dict[str, Any]) -> CSV:
+    """STAT 1c: temps en minutes par activités + temps total de la video: ACTIVE STATUS"""
+    return get_time_by_types(dataset["activities_status_cube"], ACTIVE_STATUS, dataset["activities_cube"])
+
+def compute_predators_presence_time(dataset: Dict[str, Any]) -> CSV:
+    """STATS 2: temps de présence en minutes par prédateurs + temps total de la video"""
+    return get_time_by_types(dataset["predators_cube"], PREDATORS, dataset["activities_cube"])
+
+def compute_predators_counts(dataset: Dict[str, Any]) -> CSV:
+    """STATS 3: nb d'attaque moyen par moment de présence par prédateurs, nb de présence par prédateur"""
+    activities_cube, predators_cube = dataset["activities_cube"], dataset["predators_cube"]
+    header = ["nest", "cam"]
     for p in PREDATORS:
-        for measure in ["minutes", "ratio"]:
-            header.append(f"{p}{day_part}_{measure}")
-    header.append(f"total{day_part}_minutes")
-predator_presence_times = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in activities_list if nest == "All" or a.nest == nest]
-    nest_predators = [p for p in predators_list if nest == "All" or p.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        cam_predators = [p for p in nest_predators if cam == "All" or p.cam == cam]
-        if len(cam_activities) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-            "total_minutes": get_duration(cam_activities),
-            "total_day_minutes": get_duration(cam_activities, "day"),
-            "total_night_minutes": get_duration(cam_activities, "night"),
-        }
-        for p_type in PREDATORS:
-            type_predators = [p for p in cam_predators if p.type == p_type]
-            for day_part in["", "_day", "_night"]:
-                minutes = get_duration(type_predators, day_part.removeprefix("_"))
-                total = entry[f"total{day_part}_minutes"]
-                entry[f"{p_type}{day_part}_minutes"] = minutes
-                entry[f"{p_type}{day_part}_ratio"] = f"{minutes / total:.4f}"
-        predator_presence_times.add_entry(entry)
-predator_presence_times.show()
-predator_presence_times_path = os.path.join(STATS_DIR, "2_predators_presence_time.csv")
-print(f"   -> Save file in '{predator_presence_times_path}'")
-predator_presence_times.write(predator_presence_times_path)
-
-
-# STATS 3: nb d'attaque moyen par moment de présence par prédateurs, nb de présence par prédateur
-print("\nPredator Counts and Attack Counts -------------------------------------")
-header = ["nest", "cam"]
-for p in PREDATORS:
-    for measure in ["n_presences", "n_attacks", "n_attacks_by_presence"]:
-        header.append(f"{p}_{measure}")
-header.append(f"total_minutes")
-predators_counts = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in activities_list if nest == "All" or a.nest == nest]
-    nest_predators = [p for p in predators_list if nest == "All" or p.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        cam_predators = [p for p in nest_predators if cam == "All" or p.cam == cam]
-        if len(cam_activities) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-            "total_minutes": get_duration(cam_activities),
-        }
-        for p_type in PREDATORS:
-            type_predators = [p for p in cam_predators if p.type == p_type]
-            entry[f"{p_type}_n_presences"] = len(type_predators)
-            entry[f"{p_type}_n_attacks"] = sum([len(p.attacks) for p in type_predators])
-            entry[f"{p_type}_n_attacks_by_presence"] = f"{np.mean([len(p.attacks) for p in type_predators]):.4f}"
-        predators_counts.add_entry(entry)
-predators_counts.show()
-predators_counts_path = os.path.join(STATS_DIR, "3_predators_counts.csv")
-print(f"   -> Save file in '{predators_counts_path}'")
-predators_counts.write(predators_counts_path)
-
-
-# STATS 4a: temps moyen de présence des prédateurs
-print("\nPredator Average Precence Duration -------------------------------------")
-header = ["nest", "cam"]
-for p in PREDATORS:
-    for measure in ["n_presences", "average_duration_minutes", "median_duration_minutes"]:
-        header.append(f"{p}_{measure}")
-predators_average_times = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_predators = [p for p in predators_list if nest == "All" or p.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_predators = [p for p in nest_predators if cam == "All" or p.cam == cam]
-        if len(cam_predators) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-        }
-        for p_type in PREDATORS:
-            type_predators = [p for p in cam_predators if p.type == p_type]
-            entry[f"{p_type}_n_presences"] = len(type_predators)
-            entry[f"{p_type}_average_duration_minutes"] = f"{np.mean([p.duration_minutes() for p in type_predators]):.4f}"
-            entry[f"{p_type}_median_duration_minutes"] = f"{np.median([p.duration_minutes() for p in type_predators]):.4f}"
-        predators_average_times.add_entry(entry)
-predators_average_times.show()
-predators_average_times_path = os.path.join(STATS_DIR, "4a_predators_average_duration.csv")
-print(f"   -> Save file in '{predators_average_times_path}'")
-predators_average_times.write(predators_average_times_path)
-
-
-# STATS 4b: temps moyen par activité (si on a le début et la fin de l'activité)
-print("\nActivities durations SPLIEED ------------------------------------------")
-header = ["nest", "cam"]
-for a in ACTIVITIES_SPLITTES:
-    for measure in ["n", "average_duration_minutes", "median_duration_minutes"]:
-        header.append(f"{a}_{measure}")
-activities_durations = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in complete_activities_list if nest == "All" or a.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        if len(cam_activities) == 0: continue
-        entry = {
-            "nest": nest, "cam": cam,
-        }
-        for a_type in ACTIVITIES_SPLITTES:
-            type_activities = [a for a in cam_activities if a.activity_splitted == a_type]
-            n = len(type_activities)
-            average_duration = np.mean([a.duration_minutes() for a in type_activities])
-            median_duration = np.median([a.duration_minutes() for a in type_activities])
-            entry[f"{a_type}_n"] = n
-            entry[f"{a_type}_average_duration_minutes"] = f"{average_duration:.4f}"
-            entry[f"{a_type}_median_duration_minutes"] = f"{median_duration:.4f}"
-        activities_durations.add_entry(entry)
-activities_durations.show()
-activities_durations_path = os.path.join(STATS_DIR, "4b_activities_splitted_average_duration.csv")
-print(f"   -> Save file in '{activities_durations_path}'")
-activities_durations.write(activities_durations_path)
-
-
-# STATS 4c: temps moyen par activité GROUPED (si on a le début et la fin de l'activité)
-print("\nActivities durations GROUPED ------------------------------------------")
-header = ["nest", "cam"]
-for a in ACTIVITIES_GROUPED:
-    for measure in ["n", "average_duration_minutes", "median_duration_minutes"]:
-        header.append(f"{a}_{measure}")
-merged_activities = merge_activities(complete_activities_list)
-activities_durations = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in merged_activities if nest == "All" or a.nest == nest]
-    for cam in ["All"] + CAMERAS:
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        if len(cam_activities) == 0: continue
+        for measure in ["n_presences", "n_attacks", "n_attacks_by_presence"]:
+            header.append(f"{p}_{measure}")
+    header.append(f"total_minutes")
+    predators_counts = CSV(header)
+    for nest in ["All"] + NESTS:
+        for cam in ["All"] + CAMERAS:
+            if activities_cube.get_count(nest=nest, cam=cam) == 0: continue
+            entry = {
+                "nest": nest, "cam": cam,
+                "total_minutes": activities_cube.get_minutes(nest=nest, cam=cam),
+            }
+            for p_type in PREDATORS:
+                n_presences = predators_cube.get_count(nest=nest, cam=cam, types=p_type)
+                n_attacks = predators_cube.get_attacks(nest=nest, cam=cam, types=p_type)
+                entry[f"{p_type}_n_presences"] = n_presences
+                entry[f"{p_type}_n_attacks"] = n_attacks
+                entry[f"{p_type}_n_attacks_by_presence"] = f"{n_attacks / n_presences if n_presences > 0 else np.nan:.4f}"
+            predators_counts.add_entry(entry)
+    return predators_counts
+
+def compute_predators_average_duration(dataset: Dict[str, Any]) -> CSV:
+    """STATS 4a: temps moyen de présence des prédateurs"""
+    return get_durations_table(dataset["predators_durations_cube"], PREDATORS, "n_presences")
+
+def compute_activities_splitted_average_duration(dataset: Dict[str, Any]) -> CSV:
+    """STATS 4b: temps moyen par activité (si on a le début et la fin de l'activité)"""
+    return get_durations_table(dataset["complete_activities_durations_cube"], ACTIVITIES_SPLITTES)
+
+def compute_activities_grouped_average_duration(dataset: Dict[str, Any]) -> CSV:
+    """STATS 4c: temps moyen par activité GROUPED (si on a le début et la fin de l'activité)"""
+    return get_durations_table(dataset["merged_activities_durations_cube"], ACTIVITIES_GROUPED)
+
+def compute_activities_durations_standard_errors(dataset: Dict[str, Any]) -> CSV:
+    """STATS 4d: temps moyen des activités + standard deviation + standard error + bootstrap"""
+    from src.bootstrap_standard_error import bootstrap_standard_errors
+    assert "merged_activities_durations" in dataset, f"ERROR in compute_activities_durations_standard_errors(): dataset was loaded without the merged durations (keep_durations=False)."
+    durations_by_type = dataset["merged_activities_durations"]
+    header = [
+        "activity", "n_observations",
+        "duration_mean", "duration_median", "duration_standard_deviation",
+        "standard_error_on_mean", "considence_interval_95_on_mean",
+        "standard_error_on_mean_bootstrap", "considence_interval_95_on_mean_bootstrap",
+        "standard_error_on_median_bootstrap", "considence_interval_95_on_median_bootstrap",
+    ]
+    activities_durations_se = CSV(header)
+    ZSCORE_95 = 1.96
+    bootstrap_tasks = []
+    for a_type in ACTIVITIES_GROUPED:
+        bootstrap_tasks += [(durations_by_type[a_type], np.mean), (durations_by_type[a_type], np.median)]
+    with stage("bootstrap"):
+        n_workers = dataset["n_workers"]
+        if BOOTSTRAP_SEED is None: # Not reproducible: never cached
+            bootstrap_results = bootstrap_standard_errors(bootstrap_tasks, seed=BOOTSTRAP_SEED, n_workers=n_workers)
+        else:
+            bootstrap_results = BuildCache(enabled=dataset["use_cache"]).get_or_compute(
+                "bootstrap", "4d_activities_durations", get_bootstrap_key(bootstrap_tasks),
+                lambda: bootstrap_standard_errors(bootstrap_tasks, seed=BOOTSTRAP_SEED, n_workers=n_workers),
+            )
+    for i, a_type in enumerate(ACTIVITIES_GROUPED):
+
+        # Get durations
+        durations = durations_by_type[a_type]
         entry = {
-            "nest": nest, "cam": cam,
+            "activity": a_type,
+            "n_observations": len(durations)
         }
-        for a_type in ACTIVITIES_GROUPED:
-            type_activities = [a for a in cam_activities if a.activity_groupped == a_type]
-            n = len(type_activities)
-            average_duration = np.mean([a.duration_minutes() for a in type_activities])
-            median_duration = np.median([a.duration_minutes() for a in type_activities])
-            entry[f"{a_type}_n"] = n
-            entry[f"{a_type}_average_duration_minutes"] = f"{average_duration:.4f}"
-            entry[f"{a_type}_median_duration_minutes"] = f"{median_duration:.4f}"
-        activities_durations.add_entry(entry)
-activities_durations.show()
-activities_durations_path = os.path.join(STATS_DIR, "4c_activities_grouped_average_duration.csv")
-print(f"   -> Save file in '{activities_durations_path}'")
-activities_durations.write(activities_durations_path)
-
-
-# STATS 4d: temps moyen des activités + standard deviation + standard error + bootstrap 
-print("\nActivities durations + standard errors --------------------------------")
-header = [
-    "activity", "n_observations",
-    "duration_mean", "duration_median", "duration_standard_deviation",
-    "standard_error_on_mean", "considence_interval_95_on_mean",
-    "standard_error_on_mean_bootstrap", "considence_interval_95_on_mean_bootstrap",
-    "standard_error_on_median_bootstrap", "considence_interval_95_on_median_bootstrap",
-]
-activities_durations_se = CSV(header)
-ZSCORE_95 = 1.96
-for a_type in ACTIVITIES_GROUPED:
-
-    # Get durations
-    type_activities = [a for a in merged_activities if a.activity_groupped == a_type]
-    durations = np.array([a.duration_minutes() for a in type_activities])
-    entry = {
-        "activity": a_type,
-        "n_observations": len(durations)
-    }
 
-    # Base stats
-    mean = np.mean(durations)
-    median = np.median(durations)
-    std = np.sqrt((1.0/(len(durations) - 1.0)) * np.sum((durations - mean)**2)) # Since N is low, we use the Bessel's correction (which np.std() does not).
-    entry["duration_mean"] = f"{mean:.4f}"
-    entry["duration_median"] = f"{median:.4f}"
-    entry["duration_standard_deviation"] = f"{std:.4f}"
-
-
-    # Classical SEM, CI computations on mean
-    sem_mean = std / np.sqrt(len(durations))
-    ci95_mean = mean + np.array([-sem_mean, +sem_mean])*ZSCORE_95
-    entry["standard_error_on_mean"] = f"{sem_mean:4f}"
-    entry["considence_interval_95_on_mean"] = f"{ci95_mean[0]:4f}:{ci95_mean[1]:.4f}"
-
-    # Bootstrap SEM, CI computations on mean
-    sem_mean_boot, ci95_mean_boot = bootstrap_standard_error(durations, np.mean)
-    entry["standard_error_on_mean_bootstrap"] = f"{sem_mean_boot:4f}"
-    entry["considence_interval_95_on_mean_bootstrap"] = f"{ci95_mean_boot[0]:4f}:{ci95_mean_boot[1]:.4f}"
-
-    # Bootstrap SEM, CI computations on median
-    sem_median_boot, ci95_median_boot = bootstrap_standard_error(durations, np.median)
-    entry["standard_error_on_median_bootstrap"] = f"{sem_median_boot:4f}"
-    entry["considence_interval_95_on_median_bootstrap"] = f"{ci95_median_boot[0]:4f}:{ci95_median_boot[1]:.4f}"
-
-    activities_durations_se.add_entry(entry)
-activities_durations_se.show()
-activities_durations_se_path = os.path.join(STATS_DIR, "4d_activities_durations_standard_errors.csv")
-print(f"   -> Save file in '{activities_durations_se_path}'")
-activities_durations_se.write(activities_durations_se_path)
-
-
-# STATS 7: predateur temps de presence en presence de constricto et en absence
-#   3temps : temps total de présence par prédateurs, en présence des constricto et en absence  = resting) + temps total de la video ou les constricto on été actif et inactif 
-print("\nPredator times by Active/Inactive -------------------------------------")
-header = ["nest", "cam"]
-predator_properties = [
-    "predator", "predator_active", "predator_inactive",
-    "Opiliones", "Opiliones_active", "Opiliones_inactive",
-    "Reduviidae", "Reduviidae_active", "Reduviidae_inactive",
-]
-for a in ACTIVE_STATUS:
-    for measure in ["minutes", "ratio"]:
-        header.append(f"{a}_{measure}")
-for p in PREDATORS:
-    for measure in ["minutes", "ratio"]:
-            header.append(f"{p}_{measure}")
-for p in PREDATORS:
+        # Base stats
+        mean = np.mean(durations)
+        median = np.median(durations)
+        std = np.sqrt((1.0/(len(durations) - 1.0)) * np.sum((durations - mean)**2)) # Since N is low, we use the Bessel's correction (which np.std() does not).
+        entry["duration_mean"] = f"{mean:.4f}"
+        entry["duration_median"] = f"{median:.4f}"
+        entry["duration_standard_deviation"] = f"{std:.4f}"
+
+
+        # Classical SEM, CI computations on mean
+        sem_mean = std / np.sqrt(len(durations))
+        ci95_mean = mean + np.array([-sem_mean, +sem_mean])*ZSCORE_95
+        entry["standard_error_on_mean"] = f"{sem_mean:4f}"
+        entry["considence_interval_95_on_mean"] = f"{ci95_mean[0]:4f}:{ci95_mean[1]:.4f}"
+
+        # Bootstrap SEM, CI computations on mean
+        sem_mean_boot, ci95_mean_boot = bootstrap_results[2*i]
+        entry["standard_error_on_mean_bootstrap"] = f"{sem_mean_boot:4f}"
+        entry["considence_interval_95_on_mean_bootstrap"] = f"{ci95_mean_boot[0]:4f}:{ci95_mean_boot[1]:.4f}"
+
+        # Bootstrap SEM, CI computations on median
+        sem_median_boot, ci95_median_boot = bootstrap_results[2*i+1]
+        entry["standard_error_on_median_bootstrap"] = f"{sem_median_boot:4f}"
+        entry["considence_interval_95_on_median_bootstrap"] = f"{ci95_median_boot[0]:4f}:{ci95_median_boot[1]:.4f}"
+
+        activities_durations_se.add_entry(entry)
+    return activities_durations_se
+
+def compute_predators_constricto_activity(dataset: Dict[str, Any]) -> CSV:
+    """
+    STATS 7: predateur temps de presence en presence de constricto et en absence
+      3temps : temps total de présence par prédateurs, en présence des constricto et en absence  = resting) + temps total de la video ou les constricto on été actif et inactif
+    """
+    activities_cube, predators_cube, activities_status_cube = dataset["activities_cube"], dataset["predators_cube"], dataset["activities_status_cube"]
+    predators_active_cube, predators_inactive_cube = dataset["predators_active_cube"], dataset["predators_inactive_cube"]
+    predators_overlap_cube = dataset["predators_overlap_cube"]
+    header = ["nest", "cam"]
+    predator_properties = [
+        "predator", "predator_active", "predator_inactive",
+        "Opiliones", "Opiliones_active", "Opiliones_inactive",
+        "Reduviidae", "Reduviidae_active", "Reduviidae_inactive",
+    ]
     for a in ACTIVE_STATUS:
         for measure in ["minutes", "ratio"]:
-            header.append(f"{p}_{a}_{measure}")
-header.append(f"total_minutes")
-predators_constricto_activity = CSV(header)
-for nest in ["All"] + NESTS:
-    nest_activities = [a for a in activities_list if nest == "All" or a.nest == nest]
-    nest_predators = [p for p in predators_list if nest == "All" or p.nest == nest]
-    for cam in ["All"] + CAMERAS:
-
-        # List activities and predators of the cam
-        cam_activities = [a for a in nest_activities if cam == "All" or a.cam == cam]
-        cam_predators = [p for p in nest_predators if cam == "All" or p.cam == cam]
-
-        # Skip when no occurances
-        if len(cam_activities) == 0: continue
-        if len(cam_predators) == 0: continue
-
-        # Split active / inactive activities
-        activities_active = [a for a in cam_activities if a.is_active]
-        activities_inactive = [a for a in cam_activities if not a.is_active]
-
-        # Get times and ratios
-        total_minutes = get_duration(cam_activities)
-        active_minutes = get_duration(activities_active)
-        inactive_minutes = get_duration(activities_inactive)
-        active_ratio = active_minutes / total_minutes
-        inactive_ratio = inactive_minutes / total_minutes
-
-        # Set entry base properties
-        entry = {
-            "nest": nest, "cam": cam,
-            "total_minutes": total_minutes,
-            "active_minutes": active_minutes,
-            "active_ratio": f"{active_ratio:.4f}",
-            "inactive_minutes": inactive_minutes,
-            "inactive_ratio": f"{inactive_ratio:.4f}",
-        }
+            header.append(f"{a}_{measure}")
+    for p in PREDATORS:
+        for measure in ["minutes", "ratio"]:
+                header.append(f"{p}_{measure}")
+    for p in PREDATORS:
+        for a in ACTIVE_STATUS:
+            for measure in ["minutes", "ratio"]:
+                header.append(f"{p}_{a}_{measure}")
+    header.append(f"total_minutes")
+    for p in PREDATORS:
+        for a in ACTIVE_STATUS:
+            for measure in ["minutes", "ratio"]:
+                header.append(f"{p}_{a}_overlap_{measure}")
+    predators_constricto_activity = CSV(header)
 
-        for p_type in PREDATORS:
+    for nest in ["All"] + NESTS:
+        for cam in ["All"] + CAMERAS:
 
-            # Split predators if ther are during an active or an inactive activity
-            predators = [p for p in cam_predators if p.type == p_type]
-            predators_active =   [p for p in predators if any([p.start in a and p.cam == a.cam and p.video == a.video for a in activities_active])]
-            predators_inactive = [p for p in predators if any([p.start in a and p.cam == a.cam and p.video == a.video for a in activities_inactive])]
+            # Skip when no occurances
+            if activities_cube.get_count(nest=nest, cam=cam) == 0: continue
+            if predators_cube.get_count(nest=nest, cam=cam) == 0: continue
 
             # Get times and ratios
-            predator_minutes = get_duration(predators)
-            predator_ratio = predator_minutes / total_minutes
-            predator_active_minutes = get_duration(predators_active)
-            predator_active_ratio = predator_active_minutes / active_minutes
-            predator_inactive_minutes = get_duration(predators_inactive)
-            predator_inactive_ratio = predator_inactive_minutes / inactive_minutes
-            entry[f"{p_type}_minutes"] = predator_minutes
-            entry[f"{p_type}_ratio"] = f"{predator_ratio:.4f}"
-            entry[f"{p_type}_active_minutes"] = predator_active_minutes
-            entry[f"{p_type}_active_ratio"] = f"{predator_active_ratio:.4f}"
-            entry[f"{p_type}_inactive_minutes"] = predator_inactive_minutes
-            entry[f"{p_type}_inactive_ratio"] = f"{predator_inactive_ratio:.4f}"
-        predators_constricto_activity.add_entry(entry)
-predators_constricto_activity.show()
-predators_constricto_activity_path = os.path.join(STATS_DIR, "7_predators_constricto_activity.csv")
-print(f"   -> Save file in '{predators_constricto_activity_path}'")
-predators_constricto_activity.write(predators_constricto_activity_path)
+            total_minutes = activities_status_cube.get_minutes(nest=nest, cam=cam)
+            active_minutes = activities_status_cube.get_minutes(nest=nest, cam=cam, types="active")
+            inactive_minutes = activities_status_cube.get_minutes(nest=nest, cam=cam, types="inactive")
+            active_ratio = active_minutes / total_minutes
+            inactive_ratio = inactive_minutes / total_minutes
+
+            # Set entry base properties
+            entry = {
+                "nest": nest, "cam": cam,
+                "total_minutes": total_minutes,
+                "active_minutes": active_minutes,
+                "active_ratio": f"{active_ratio:.4f}",
+                "inactive_minutes": inactive_minutes,
+                "inactive_ratio": f"{inactive_ratio:.4f}",
+            }
+
+            for p_type in PREDATORS:
+
+                # Get times and ratios
+                predator_minutes = predators_cube.get_minutes(nest=nest, cam=cam, types=p_type)
+                predator_ratio = predator_minutes / total_minutes
+                predator_active_minutes = predators_active_cube.get_minutes(nest=nest, cam=cam, types=p_type)
+                predator_active_ratio = predator_active_minutes / active_minutes
+                predator_inactive_minutes = predators_inactive_cube.get_minutes(nest=nest, cam=cam, types=p_type)
+                predator_inactive_ratio = predator_inactive_minutes / inactive_minutes
+                entry[f"{p_type}_minutes"] = predator_minutes
+                entry[f"{p_type}_ratio"] = f"{predator_ratio:.4f}"
+                entry[f"{p_type}_active_minutes"] = predator_active_minutes
+                entry[f"{p_type}_active_ratio"] = f"{predator_active_ratio:.4f}"
+                entry[f"{p_type}_inactive_minutes"] = predator_inactive_minutes
+                entry[f"{p_type}_inactive_ratio"] = f"{predator_inactive_ratio:.4f}"
+
+                # Get true overlap times and ratios
+                for a, a_minutes in zip(ACTIVE_STATUS, [active_minutes, inactive_minutes]):
+                    overlap_minutes = predators_overlap_cube.get_sum(f"{a}_overlap_seconds", nest=nest, cam=cam, types=p_type) // 60
+                    entry[f"{p_type}_{a}_overlap_minutes"] = overlap_minutes
+                    entry[f"{p_type}_{a}_overlap_ratio"] = f"{overlap_minutes / a_minutes:.4f}"
+            predators_constricto_activity.add_entry(entry)
+    return predators_constricto_activity
+
+# Table id -> (title, output file name, compute function)
+TABLES: Dict[str, Tuple[str, str, Callable[[Dict[str, Any]], CSV]]] = {
+    "0": ("Videos Durations", "0_video_durations.csv", compute_videos_durations),
+    "1a": ("Time by Activities: SPLITTED", "1a_time_by_acivities_splitted.csv", compute_time_by_activities_splitted),
+    "1b": ("Time by Activities: GROUPED", "1b_time_by_acivities_grouped.csv", compute_time_by_activities_grouped),
+    "1c": ("Time by Activities: ACTIVE STATUS", "1c_time_by_acive_status.csv", compute_time_by_active_status),
+    "2": ("Predator Presence Time", "2_predators_presence_time.csv", compute_predators_presence_time),
+    "3": ("Predator Counts and Attack Counts", "3_predators_counts.csv", compute_predators_counts),
+    "4a": ("Predator Average Precence Duration", "4a_predators_average_duration.csv", compute_predators_average_duration),
+    "4b": ("Activities durations SPLIEED", "4b_activities_splitted_average_duration.csv", compute_activities_splitted_average_duration),
+    "4c": ("Activities durations GROUPED", "4c_activities_grouped_average_duration.csv", compute_activities_grouped_average_duration),
+    "4d": ("Activities durations + standard errors", "4d_activities_durations_standard_errors.csv", compute_activities_durations_standard_errors),
+    "7": ("Predator times by Active/Inactive", "7_predators_constricto_activity.csv", compute_predators_constricto_activity),
+}
+
+# Main -------------------------------------------------------------------------
+def generate_stats(
+        tables: List[str]=list(TABLES), data_dir: str=DATA_DIR, stats_dir: str=STATS_DIR,
+        names: Union[None, List[str]]=NAMES_LIST, n_workers: int=N_WORKERS, use_cache: bool=USE_CACHE,
+        profile: bool=PROFILE, profile_mode: Union[None, str]=PROFILE_MODE, streaming: bool=STREAMING,
+        columnar_csv: bool=COLUMNAR_CSV,
+    ) -> Dict[str, CSV]:
+    """
+    Compute the selected stats tables (ids of TABLES) from one shared parsed dataset and save them in stats_dir.
+        * n_workers > 1: the ingestion and the tables are spread over pools of processes
+          (when several tables run in parallel, the bootstrap of table 4d runs in its table worker).
+        * streaming=True: videos are aggregated chunk by chunk without keeping their tables (see load_dataset()).
+    """
+    for table_id in tables:
+        assert table_id in TABLES, f"ERROR in generate_stats(): table '{table_id}' should be in {list(TABLES)}."
+    tables = [table_id for table_id in TABLES if table_id in tables]
+    profiler = enable_profiler(profile_mode) if profile else get_profiler()
+
+    # Read and aggregate Activities and Predators
+    dataset = load_dataset(data_dir, names, use_cache, n_workers, streaming, keep_durations="4d" in tables, columnar_csv=columnar_csv)
+
+    # Compute tables
+    if n_workers <= 1 or len(tables) <= 1:
+        results = {}
+        for table_id in tables:
+            with stage(f"stats_{table_id}"):
+                results[table_id] = compute_table(dataset, table_id)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with stage("stats_tables"), ProcessPoolExecutor(max_workers=min(n_workers, len(tables)), initializer=init_table_worker, initargs=(dataset,)) as executor:
+            results = dict(zip(tables, executor.map(compute_table_task, tables)))
+
+    # Save tables
+    for table_id in tables:
+        title, file_name, _ = TABLES[table_id]
+        print(f"\n{title} {'-' * max(3, 71 - len(title))}")
+        results[table_id].show()
+        table_path = os.path.join(stats_dir, file_name)
+        print(f"   -> Save file in '{table_path}'")
+        results[table_id].write(table_path)
+
+    # Timing report
+    if profiler.enabled:
+        print("\nTiming report ---------------------------------------------------------")
+        timing_report_paths = profiler.write_report(stats_dir)
+        for stage_report in profiler.get_report()["stages"]:
+            print(f"{stage_report['stage']}: {stage_report['seconds']:.4f} sec. ({100 * stage_report['ratio']:.1f}%)")
+        print(f"   -> Save files in {timing_report_paths}")
+    return results
+
+def compute_table(dataset: Dict[str, Any], table_id: str) -> CSV:
+    _, _, compute_function = TABLES[table_id]
+    return compute_function(dataset)
+
+# Workers of the tables pool: the dataset is sent once by worker
+WORKER_DATASET: Dict[str, Any] = {}
+
+def init_table_worker(dataset: Dict[str, Any]) -> None:
+    WORKER_DATASET.update(dataset)
+    WORKER_DATASET["n_workers"] = 1 # No nested pools
+
+def compute_table_task(table_id: str) -> CSV:
+    return compute_table(WORKER_DATASET, table_id)
+
+def parse_args(args: Union[None, List[str]]=None) -> "argparse.Namespace":
+    import argparse
+    parser = argparse.ArgumentParser(description="Compute the stats tables of the activities and predators annotations.")
+    parser.add_argument("--tables", default="all", help=f"Comma-separated tables to compute among {','.join(TABLES)} (default: all).")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory of the '<NAME>_Activity.csv'/'<NAME>_Predator.csv' files (default: %(default)s).")
+    parser.add_argument("--stats-dir", default=STATS_DIR, help="Directory of the stats tables (default: %(default)s).")
+    parser.add_argument("--videos", default=None, help="Comma-separated videos to run on (default: all the videos of --data-dir).")
+    parser.add_argument("--workers", type=int, default=N_WORKERS, help="Number of processes (default: %(default)s).")
+    parser.add_argument("--streaming", action="store_true", help="Aggregate the videos chunk by chunk (flat memory for large datasets, same tables).")
+    parser.add_argument("--columnar-csv", action="store_true", help="Parse the text files in columnar CSV objects (less memory for large files, same tables).")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute everything without reading or writing the build cache.")
+    parser.add_argument("--no-profile", action="store_true", help="Do not time the stages nor save the timing report.")
+    parser.add_argument("--profile-mode", default=PROFILE_MODE, choices=["cprofile", "sampling"], help="Also capture the slowest functions in the timing report.")
+    parsed_args = parser.parse_args(args)
+    parsed_args.tables = list(TABLES) if parsed_args.tables == "all" else [table_id.strip() for table_id in parsed_args.tables.split(",")]
+    unknown_tables = [table_id for table_id in parsed_args.tables if table_id not in TABLES]
+    if len(unknown_tables) > 0:
+        parser.error(f"unknown tables {unknown_tables}, choose among {list(TABLES)}.")
+    parsed_args.videos = None if parsed_args.videos is None else [NAME.strip() for NAME in parsed_args.videos.split(",")]
+    return parsed_args
+
+# Execution --------------------------------------------------------------------
+if __name__ == "__main__":
+    args = parse_args()
+    generate_stats(
+        tables=args.tables, data_dir=args.data_dir, stats_dir=args.stats_dir, names=args.videos,
+        n_workers=args.workers, use_cache=USE_CACHE and not args.no_cache,
+        profile=PROFILE and not args.no_profile, profile_mode=args.profile_mode, streaming=STREAMING or args.streaming,
+        columnar_csv=COLUMNAR_CSV or args.columnar_csv,
+    )
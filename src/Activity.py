@@ -1,8 +1,12 @@
 
 # Imports ----------------------------------------------------------------------
-from typing import List, Tuple, Union
-from datetime import datetime, time
-from src.CSV import CSV
+import re
+import sys
+from typing import List, Sequence, Tuple, Union
+from datetime import datetime, time, timedelta
+import numpy as np
+from src.CSV import CSV, ColumnarCSV
+from src.profiling import count
 
 
 # Contants ---------------------------------------------------------------------
@@ -11,40 +15,119 @@ HOURS_BY_LINE = 12                                     # Number of hours by line
 SECONDS_BY_LINE = HOURS_BY_LINE * 3600
 REFERENCE_H, REFERENCE_M = REFERENCE_DATETIME.hour, REFERENCE_DATETIME.minute
 REFERENCE_MIN_ID = 60*REFERENCE_H + REFERENCE_M
+REFERENCE_SECONDS_IN_DAY = 3600*REFERENCE_H + 60*REFERENCE_M + REFERENCE_DATETIME.second
+SECONDS_BY_DAY = 24 * 3600
+TIME_PATTERN = re.compile(r"([0-9]{1,2}):([0-9]{1,2}):([0-9]{1,2})")     # Pattern of a stripped time string (canonical form 'HH:MM:SS')
+DAY_PARTS = ["all", "day", "night"]                    # Parts of the day for durations (day: even lines, night: odd lines)
 
 # ReferenceTime functions ------------------------------------------------------
 
+def parse_hms(time_str: str) -> Tuple[int, int, int]:
+    """
+    Hours, minutes and seconds of a time string 'HH:MM:SS': the rules of all the time parsers (scalar and vectorized).
+        * Surrounding whitespace is ignored, fields have one or two ASCII digits and must be in range (h < 24, m < 60, s < 60).
+    """
+    match = TIME_PATTERN.fullmatch(time_str.strip())
+    h, m, s = (0, 0, 0) if match is None else [int(value) for value in match.groups()]
+    if match is None or h >= 24 or m >= 60 or s >= 60:
+        raise ValueError(f"ERROR in parse_hms(): malformed time '{time_str}' (expected 'HH:MM:SS').")
+    return h, m, s
+
 def parse_datetime(time_str: str, dayshift: int=0) -> datetime:
     """Read a [datetime] object from a string of time and a dayshift (number of days to add to REFERENCE_DAY)."""
-    h, m, s = time_str.split(":")
-    h, m, s = int(h), int(m), int(s)
-    return datetime(REFERENCE_DATETIME.year, REFERENCE_DATETIME.month, REFERENCE_DATETIME.day + dayshift, h, m, s)
+    h, m, s = parse_hms(time_str)
+    return datetime(REFERENCE_DATETIME.year, REFERENCE_DATETIME.month, REFERENCE_DATETIME.day, h, m, s) + timedelta(days=dayshift)
+
+def parse_seconds_array(times_str: Sequence[str], dayshifts: Union[int, Sequence[int]]=0, column_name: str="time") -> np.ndarray:
+    """
+    Vectorized parse of time strings 'HH:MM:SS' and dayshifts (number of days to add to REFERENCE_DAY) into seconds since REFERENCE_DATETIME.
+        * Same values as get_seconds(parse_datetime(time_str, dayshift)) for any recording length (no datetime objects are created).
+        * Same accepted values as parse_hms(): values are stripped once, then canonical values are parsed at once and the others one by one.
+        * Raise a ValueError with the entries numbers (starting at 1) of the malformed values.
+    """
+    times_str = np.char.strip(np.asarray(times_str, dtype=str))
+    n = len(times_str)
+    dayshifts = np.broadcast_to(np.asarray(dayshifts, dtype=np.int64), (n,))
+    hms = np.zeros((n, 3), dtype=np.int64)
+    is_valid = np.zeros(n, dtype=bool)
+
+    # Canonical 'HH:MM:SS' values: parse the unicode code points of all values at once
+    is_canonical = np.char.str_len(times_str) == 8
+    chars = np.ascontiguousarray(times_str[is_canonical].astype("U8")).view(np.uint32).reshape(-1, 8).astype(np.int64) - ord("0")
+    digits = chars[:, [0, 1, 3, 4, 6, 7]]
+    separators = chars[:, [2, 5]] + ord("0")
+    is_valid[is_canonical] = np.all((digits >= 0) & (digits <= 9), axis=1) & np.all(separators == ord(":"), axis=1)
+    hms[is_canonical] = digits[:, [0, 2, 4]] * 10 + digits[:, [1, 3, 5]]
+
+    # Other values (ex: 'H:MM:SS'): one by one
+    for i in np.flatnonzero(~is_canonical).tolist():
+        match = TIME_PATTERN.fullmatch(times_str[i])
+        if match is not None:
+            hms[i] = [int(value) for value in match.groups()]
+            is_valid[i] = True
+
+    # Reject malformed values
+    is_valid &= (hms[:, 0] < 24) & (hms[:, 1] < 60) & (hms[:, 2] < 60)
+    if not np.all(is_valid):
+        invalid_ids = np.flatnonzero(~is_valid)[:10].tolist()
+        invalid_examples = ", ".join([f"{i+1}: '{times_str[i]}'" for i in invalid_ids])
+        raise ValueError(f"ERROR in parse_seconds_array(): {np.sum(~is_valid)} malformed '{column_name}' values (expected 'HH:MM:SS') at entries {invalid_examples}{', ...' if np.sum(~is_valid) > len(invalid_ids) else ''}.")
+    return dayshifts * SECONDS_BY_DAY + hms[:, 0] * 3600 + hms[:, 1] * 60 + hms[:, 2] - REFERENCE_SECONDS_IN_DAY
 
 def parse_time(time_str: str) -> time:
     """Read a [time] object from a string of time."""
-    h, m, s = time_str.split(":")
-    h, m, s = int(h), int(m), int(s)
-    return time(h, m, s)
+    return time(*parse_hms(time_str))
 
 def add_dayshifts(csv: CSV) -> None:
-    """Scan the CSV object and add a dayshift value for start and end of each entry."""
+    """Scan the CSV object and add a dayshift value for start and end of each entry (columns 'dayshift_start' and 'dayshift_end')."""
+    dayshifts_start, dayshifts_end = parse_dayshifts_array(csv.get_col("day", as_numpy=True))
+    if isinstance(csv, ColumnarCSV): # Typed columns from the arrays
+        csv.add_col("dayshift_start", dayshifts_start)
+        csv.add_col("dayshift_end", dayshifts_end)
+    else:
+        csv.add_col("dayshift_start", dayshifts_start.tolist())
+        csv.add_col("dayshift_end", dayshifts_end.tolist())
+
+def parse_dayshifts_array(days_str: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized parse of a 'day' column ('1' or '1/2', days start at 1) into dayshifts of starts and ends.
+        * Raise a ValueError with the entries numbers (starting at 1) of the malformed values.
+    """
+    days_str = np.char.strip(np.asarray(days_str, dtype=str))
+    days_start, separators, days_end = np.char.partition(days_str, "/").T if len(days_str) > 0 else np.zeros((3, 0), dtype=str)
+    days_end = np.where(separators == "/", days_end, days_start)
+    is_valid = np.char.isdigit(days_start) & np.char.isdigit(days_end)
+    if not np.all(is_valid):
+        invalid_ids = np.flatnonzero(~is_valid)[:10].tolist()
+        invalid_examples = ", ".join([f"{i+1}: '{days_str[i]}'" for i in invalid_ids])
+        raise ValueError(f"ERROR in parse_dayshifts_array(): {np.sum(~is_valid)} malformed 'day' values (expected 'D' or 'D/D') at entries {invalid_examples}{', ...' if np.sum(~is_valid) > len(invalid_ids) else ''}.")
+    return days_start.astype(np.int64) - 1, days_end.astype(np.int64) - 1
 
-    # Init
-    csv.add_empty_col("dayshift_start")
-    csv.add_empty_col("dayshift_end")
+def parse_attacks_array(attacks_str: np.ndarray, starts_str: Sequence[str], dayshifts_start: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized parse of the attacks columns (attack1..attackN) of a predators dataset into a ragged array (offsets, seconds).
+        * attacks_str: (n_entries, N) strings, the attacks of an entry stop at its first empty value.
+        * Rollover: an attack earlier in the day than the previous attack (or than the start) is on the next day.
+    """
+    attacks_str = np.char.strip(np.asarray(attacks_str, dtype=str))
+    assert attacks_str.ndim == 2 and len(attacks_str) == len(starts_str), f"ERROR in parse_attacks_array(): attacks_str shape {attacks_str.shape} should be (n_entries={len(starts_str)}, N)."
+    n_entries, n_columns = attacks_str.shape
+    is_attack = np.cumprod(attacks_str != "", axis=1).astype(bool)
+    n_attacks = np.sum(is_attack, axis=1)
+    offsets = np.concatenate([[0], np.cumsum(n_attacks)]).astype(np.int64)
 
-    # Loop on entries
-    for entry in csv:
+    # Seconds in day of the start and of each attack (non-attacks repeat the previous time: no rollover)
+    times_in_day = np.zeros((n_entries, n_columns + 1), dtype=np.int64)
+    times_in_day[:, 0] = parse_seconds_array(starts_str, column_name="start")
+    times_in_day[:, 1:][is_attack] = parse_seconds_array(attacks_str[is_attack], column_name="attack")
+    for j in range(1, n_columns + 1):
+        times_in_day[:, j] = np.where(is_attack[:, j - 1], times_in_day[:, j], times_in_day[:, j - 1])
 
-        day = entry["day"]
-        if len(day.split("/")) == 1:
-            dayshift = int(day) - 1
-            entry["dayshift_start"] = dayshift
-            entry["dayshift_end"] = dayshift
-        elif len(day.split("/")) == 2:
-            dayshift_start, dayshift_end = [int(d) - 1 for d in day.split("/")]
-            entry["dayshift_start"] = dayshift_start
-            entry["dayshift_end"] = dayshift_end
+    # Dayshifts: start dayshift + number of rollovers since the start
+    rollovers = np.cumsum(times_in_day[:, 1:] < times_in_day[:, :-1], axis=1)
+    dayshifts = np.asarray(dayshifts_start, dtype=np.int64)[:, np.newaxis] + rollovers
+    seconds = (times_in_day[:, 1:] + dayshifts * SECONDS_BY_DAY)[is_attack]
+    return offsets, seconds
 
 def get_seconds(current_datetime: datetime) -> int:
     """"""
@@ -60,24 +143,158 @@ def get_minute_id_in_day(current_datetime: datetime) -> int:
 def get_coords(current_datetime: datetime) -> Tuple[int, int]:
     """"""
     seconds = get_seconds(current_datetime)
+    return get_coords_from_seconds(seconds)
+
+def get_coords_from_seconds(seconds: int) -> Tuple[int, int]:
+    """Coords (x: seconds in line, y: line) in the plot of a number of seconds since REFERENCE_DATETIME."""
     return seconds % SECONDS_BY_LINE, seconds // SECONDS_BY_LINE
 
+def get_datetime(seconds: int) -> datetime:
+    """Inverse of get_seconds(): [datetime] object from a number of seconds since REFERENCE_DATETIME."""
+    return REFERENCE_DATETIME + timedelta(seconds=seconds)
+
+def to_seconds(moment: Union[datetime, int]) -> int:
+    """Number of seconds since REFERENCE_DATETIME of a [datetime] object (int are already seconds)."""
+    if isinstance(moment, datetime):
+        return get_seconds(moment)
+    return int(moment)
+
+def intern_str(value: str) -> str:
+    """Intern strings (type, cam, video) so that all activities share the same objects."""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+# Durations functions ----------------------------------------------------------
+
+def get_durations_minutes(start_seconds: int, end_seconds: int) -> Tuple[int, int, int]:
+    """
+    Durations in minutes for each part of the day in DAY_PARTS (all, day, night) of the interval [start_seconds, end_seconds].
+        * Closed form (O(1)) of the sum over the line segments of Activity.get_coords().
+        * Keeps the truncation of each line segment to an integer number of minutes.
+        * Lines of even index are day, lines of odd index are night.
+    """
+    line_start, x_start = divmod(start_seconds, SECONDS_BY_LINE)
+    line_end, x_end = divmod(end_seconds, SECONDS_BY_LINE)
+
+    # Single segment (also when end is before start)
+    if line_end <= line_start:
+        n_min = int((x_end - x_start) / 60)
+        if line_start % 2 == 0:
+            return n_min, n_min, 0
+        return n_min, 0, n_min
+
+    # First segment, full lines in between and last segment
+    n_min_first = int((SECONDS_BY_LINE - x_start) / 60)
+    n_min_last = int(x_end / 60)
+    n_min_line = int(SECONDS_BY_LINE / 60)
+    n_lines_between = line_end - line_start - 1
+    n_lines_between_day = (line_end - 1) // 2 - line_start // 2 # Number of even lines in [line_start+1, line_end-1]
+    n_min_day = n_min_line * n_lines_between_day
+    n_min_night = n_min_line * (n_lines_between - n_lines_between_day)
+    if line_start % 2 == 0:
+        n_min_day += n_min_first
+    else:
+        n_min_night += n_min_first
+    if line_end % 2 == 0:
+        n_min_day += n_min_last
+    else:
+        n_min_night += n_min_last
+    return n_min_day + n_min_night, n_min_day, n_min_night
+
+def get_durations_minutes_array(starts_seconds: np.ndarray, ends_seconds: np.ndarray) -> np.ndarray:
+    """
+    Batched get_durations_minutes() on arrays of starts and ends seconds: returns an array of shape (n, 3) of minutes (all, day, night).
+        * Counts the line segments summed in closed form as 'get_coords_segments' (the segments Activity.get_coords() would produce).
+    """
+    starts_seconds = np.asarray(starts_seconds, dtype=np.int64)
+    ends_seconds = np.asarray(ends_seconds, dtype=np.int64)
+    line_start, x_start = np.divmod(starts_seconds, SECONDS_BY_LINE)
+    line_end, x_end = np.divmod(ends_seconds, SECONDS_BY_LINE)
+    count("get_coords_segments", int((np.maximum(line_end - line_start, 0) + 1).sum()))
+    start_is_day = line_start % 2 == 0
+    end_is_day = line_end % 2 == 0
+
+    # Single segment (also when end is before start)
+    is_single = line_end <= line_start
+    n_min_single = np.trunc((x_end - x_start) / 60).astype(np.int64)
+
+    # First segment, full lines in between and last segment
+    n_min_first = (SECONDS_BY_LINE - x_start) // 60
+    n_min_last = x_end // 60
+    n_min_line = int(SECONDS_BY_LINE / 60)
+    n_lines_between = line_end - line_start - 1
+    n_lines_between_day = (line_end - 1) // 2 - line_start // 2
+    n_min_day = n_min_line * n_lines_between_day + n_min_first * start_is_day + n_min_last * end_is_day
+    n_min_night = n_min_line * (n_lines_between - n_lines_between_day) + n_min_first * ~start_is_day + n_min_last * ~end_is_day
+
+    durations = np.empty((len(starts_seconds), len(DAY_PARTS)), dtype=np.int64)
+    durations[:, 1] = np.where(is_single, n_min_single * start_is_day, n_min_day)
+    durations[:, 2] = np.where(is_single, n_min_single * ~start_is_day, n_min_night)
+    durations[:, 0] = durations[:, 1] + durations[:, 2]
+    return durations
+
+
+# Activity categories functions ------------------------------------------------
+
+def get_nest(video: str) -> str:
+    """Nest of a video from its name (ex: 'N2_video3-4-5-6-7' -> '2')."""
+    return video[1]
+
+def get_activity_groupped(activity_type: str) -> str:
+    """Grouped activity of an activity type (transport and construction are grouped)."""
+    if "transport" in activity_type or "construction" in activity_type:
+        return "transport/construction"
+    elif len(activity_type.split("+")) > 1:
+        raise ValueError(f"ERROR in get_activity_groupped(): activity='{activity_type}' is composed but is ont 'transport' or 'construction'.")
+    return activity_type
+
+def get_active_status(activity_type: str) -> str:
+    """Active status ('active' or 'inactive') of an activity type."""
+    if activity_type == "resting":
+        return "inactive"
+    else:
+        return "active"
+
 
 # Activity and Predator containers classes -------------------------------------
 
 class Activity():
-    """Contain class for an Activity."""
+    """
+    Contain class for an Activity.
+        * Compact: start and end are stored as integer seconds since REFERENCE_DATETIME (datetimes are created only on access).
+        * start and end can be given as [datetime] objects or as seconds since REFERENCE_DATETIME.
+    """
+
+    __slots__ = ("start_seconds", "end_seconds", "type", "cam", "video")
+
+    def __init__(self, start: Union[datetime, int], end: Union[datetime, int], type: str, cam: str, video: str=""):
+        self.start_seconds = to_seconds(start)
+        self.end_seconds = to_seconds(end)
+        self.type = intern_str(type)
+        self.cam = intern_str(cam)
+        self.video = intern_str(video)
 
-    def __init__(self, start: datetime, end: datetime, type: str, cam: str, video: str=""):
-        self.start = start
-        self.end = end
-        self.type = type
-        self.cam = cam
-        self.video = video
+    @property
+    def start(self) -> datetime:
+        return get_datetime(self.start_seconds)
+
+    @start.setter
+    def start(self, start: Union[datetime, int]) -> None:
+        self.start_seconds = to_seconds(start)
+
+    @property
+    def end(self) -> datetime:
+        return get_datetime(self.end_seconds)
+
+    @end.setter
+    def end(self, end: Union[datetime, int]) -> None:
+        self.end_seconds = to_seconds(end)
 
     @property
     def nest(self) -> str:
-        return self.video[1]
+        return get_nest(self.video)
     
     @property
     def activity_splitted(self) -> str:
@@ -85,18 +302,11 @@ class Activity():
 
     @property
     def activity_groupped(self) -> str:
-        if "transport" in self.type or "construction" in self.type:
-            return "transport/construction"
-        elif self.is_composed:
-            raise ValueError(f"ERROR in {self}: activity='{self.type}' is composed but is ont 'transport' or 'construction'.")
-        return self.type
+        return get_activity_groupped(self.type)
     
     @ property
     def active_status(self) -> str:
-        if self.type == "resting":
-            return "inactive"
-        else:
-            return "active"
+        return get_active_status(self.type)
         
     @property
     def is_active(self) -> bool:
@@ -104,58 +314,46 @@ class Activity():
     
     @classmethod
     def parse_activity(cls, entry: dict, video: str="") -> "Activity":
-        return Activity(
-            parse_datetime(entry["start"], entry["dayshift_start"]),
-            parse_datetime(entry["end"], entry["dayshift_end"]),
-            entry["activity"], entry["cam"], video
-        )
+        start, end = parse_seconds_array([entry["start"], entry["end"]], [int(entry["dayshift_start"]), int(entry["dayshift_end"])]).tolist()
+        return Activity(start, end, entry["activity"], entry["cam"], video)
     
     @classmethod
     def parse_activies(cls, dataset: CSV, video: str="") -> List["Activity"]:
-        return [cls.parse_activity(entry, video) for entry in dataset]
+        """Activities of an '_Activity.csv' dataset (with dayshifts, see add_dayshifts()), times are parsed column by column."""
+        from src.ActivityTable import ActivityTable # ActivityTable imports this module
+        return ActivityTable.parse_activities(dataset, video).to_activities()
 
     def __str__(self) -> str:
         return f"Activity('{self.type}', c='{self.cam}', v='{self.video}'): {self.start} -> {self.end} ({self.duration_seconds} sec.)"
     
-    def __contains__(self, input_datetime: datetime) -> bool:
-        return self.start <= input_datetime < self.end
+    def __contains__(self, input_datetime: Union[datetime, int]) -> bool:
+        return self.start_seconds <= to_seconds(input_datetime) < self.end_seconds
     
     @property
     def is_composed(self) -> bool:
         return len(self.type.split("+")) > 1
     
-    @property
-    def start_seconds(self) -> int:
-        return get_seconds(self.start)
-
     @property
     def start_coords(self) -> Tuple[int, int]:
-        return get_coords(self.start)
-    
-    @property
-    def end_seconds(self) -> int:
-        return get_seconds(self.end)
+        return get_coords_from_seconds(self.start_seconds)
     
     @property
     def end_coords(self) -> Tuple[int, int]:
-        return get_coords(self.end)
+        return get_coords_from_seconds(self.end_seconds)
     
     @property
     def duration_seconds(self) -> int:
         return self.end_seconds - self.start_seconds
         
     def duration_minutes(self, day_part: Union[None, str]=None) -> int:
-        coords_list = self.get_coords()
-        if day_part is not None:
-            assert day_part.lower() in ["", "all", "day", "night"], f"ERROR in duration_minutes(): day_part='{day_part}' should be in ['all', 'day', 'night']."
-            if day_part.lower() == "day":
-                coords_list = [c for c in coords_list if c[0][1] % 2 == 0]
-            elif day_part.lower() == "night":
-                coords_list = [c for c in coords_list if c[0][1] % 2 == 1]
-        n_min = 0
-        for coord_start, coord_end in coords_list:
-            n_min += int((coord_end[0] - coord_start[0]) / 60)
-        return n_min
+        if day_part is None or day_part == "":
+            day_part = "all"
+        assert day_part.lower() in DAY_PARTS, f"ERROR in duration_minutes(): day_part='{day_part}' should be in {DAY_PARTS}."
+        return self.durations_minutes()[DAY_PARTS.index(day_part.lower())]
+
+    def durations_minutes(self) -> Tuple[int, int, int]:
+        """Durations in minutes for each part of the day in DAY_PARTS (all, day, night)."""
+        return get_durations_minutes(self.start_seconds, self.end_seconds)
     
     def get_coords(self) -> List[Tuple[int, int]]:
         coords_list = []
@@ -169,44 +367,45 @@ class Activity():
             else:
                 coords_list.append([current_coord, end_coords])
                 break
+        count("get_coords_segments", len(coords_list))
         return coords_list
 
 class Predator(Activity):
     """Contain class for an Predator."""
 
-    def __init__(self, start: datetime, end: datetime, type: str, cam: str, video: str="", attacks: List[datetime]=[]):
+    __slots__ = ("attacks_seconds",)
+
+    def __init__(self, start: Union[datetime, int], end: Union[datetime, int], type: str, cam: str, video: str="", attacks: List[Union[datetime, int]]=[]):
         super().__init__(start, end, type, cam, video)
-        self.attacks = attacks
+        self.attacks_seconds = tuple(to_seconds(attack) for attack in attacks)
+
+    @property
+    def attacks(self) -> Tuple[datetime, ...]:
+        """Attacks as datetimes (immutable: replace them with 'predator.attacks = [...]')."""
+        return tuple(get_datetime(attack_seconds) for attack_seconds in self.attacks_seconds)
+
+    @attacks.setter
+    def attacks(self, attacks: List[Union[datetime, int]]) -> None:
+        self.attacks_seconds = tuple(to_seconds(attack) for attack in attacks)
+
+    @property
+    def n_attacks(self) -> int:
+        return len(self.attacks_seconds)
 
     @classmethod
     def parse_predator(cls, entry: dict, video: str="") -> "Predator":
-
-        # Parse attacks
-        attacks = []
-        dayshift_start = entry["dayshift_start"]
-        previous_attack_time = parse_time(entry["start"])
-        i = 1
-        while f"attack{i}" in entry:
-            attack_str = entry[f"attack{i}"]
-            if attack_str == "": break
-            attack_time = parse_time(attack_str)
-            if attack_time < previous_attack_time:
-                dayshift_start += 1
-            attack = parse_datetime(attack_str, dayshift_start)
-            attacks.append(attack)
-            previous_attack_time = attack_time
-            i += 1
-        
-        # Generate predator
-        return Predator(
-            parse_datetime(entry["start"], entry["dayshift_start"]),
-            parse_datetime(entry["end"], entry["dayshift_end"]),
-            entry["predator"], entry["cam"], video, attacks
-        )
+        start, end = parse_seconds_array([entry["start"], entry["end"]], [int(entry["dayshift_start"]), int(entry["dayshift_end"])]).tolist()
+        from src.ActivityTable import get_attacks_columns # ActivityTable imports this module
+        attacks_columns = get_attacks_columns(list(entry.keys()))
+        attacks_str = np.array([[entry[column] for column in attacks_columns]], dtype=str).reshape(1, len(attacks_columns))
+        _, attacks_seconds = parse_attacks_array(attacks_str, [entry["start"]], [int(entry["dayshift_start"])])
+        return Predator(start, end, entry["predator"], entry["cam"], video, attacks_seconds.tolist())
     
     @classmethod
     def parse_predators(cls, dataset: CSV, video: str="") -> List["Predator"]:
-        return [cls.parse_predator(entry, video) for entry in dataset]
+        """Predators of a '_Predator.csv' dataset (with dayshifts, see add_dayshifts()), attacks rollovers are inferred column by column."""
+        from src.ActivityTable import PredatorTable # ActivityTable imports this module
+        return PredatorTable.parse_predators(dataset, video).to_activities()
     
     def __str__(self) -> str:
-        return f"Predator('{self.type}', c='{self.cam}', n='{self.video}'): {self.start} -> {self.end} ({len(self.attacks)} attacks, {self.duration_seconds} sec.)"
+        return f"Predator('{self.type}', c='{self.cam}', n='{self.video}'): {self.start} -> {self.end} ({self.n_attacks} attacks, {self.duration_seconds} sec.)"
@@ -0,0 +1,165 @@
+
+# Imports ----------------------------------------------------------------------
+from typing import Callable, Dict, List, Union
+import numpy as np
+from src.Activity import DAY_PARTS, get_nest, get_durations_minutes_array, Activity
+from src.ActivityTable import get_labels
+from src.profiling import count
+
+
+# Main -------------------------------------------------------------------------
+class ActivityCube:
+    """
+    Aggregation cube of a list of activities (or predators), filled in a single pass on the activities.
+        * minutes[video, cam, type, day_part]: sum of the durations in minutes of the activities (for each part of the day in DAY_PARTS)
+        * counts[video, cam, type]: number of activities
+        * attacks[video, cam, type]: number of attacks (for predators)
+        * sums[name][video, cam, type]: optional named sums of values by activity (see .add_sums())
+    Rollups on 'All' nests, videos, cams or types and groups of types (grouped activities, active status) are sums over the cube.
+    Cubes are mergeable: cubes of different videos (or chunks of videos) are summed with ActivityCube.merge().
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, videos: List[str]=[], cams: List[str]=[], types: List[str]=[]):
+        self.videos = [v for v in videos]
+        self.cams = [c for c in cams]
+        self.types = [t for t in types]
+        self.minutes = np.zeros((len(self.videos), len(self.cams), len(self.types), len(DAY_PARTS)), dtype=np.int64)
+        self.counts = np.zeros((len(self.videos), len(self.cams), len(self.types)), dtype=np.int64)
+        self.attacks = np.zeros((len(self.videos), len(self.cams), len(self.types)), dtype=np.int64)
+        self.sums: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_activities(cls, activities: List[Activity]) -> "ActivityCube":
+        """Fill the cube with a single pass on the activities (labels are set in order of appearance)."""
+
+        # Set labels
+        videos, cams, types = {}, {}, {}
+        ids_list = [
+            (videos.setdefault(a.video, len(videos)), cams.setdefault(a.cam, len(cams)), types.setdefault(a.type, len(types)))
+            for a in activities
+        ]
+        cube = cls(list(videos), list(cams), list(types))
+
+        # Fill cube
+        for activity, (v, c, t) in zip(activities, ids_list):
+            cube.minutes[v, c, t] += activity.durations_minutes()
+            cube.counts[v, c, t] += 1
+            cube.attacks[v, c, t] += getattr(activity, "n_attacks", 0)
+        return cube
+
+    @classmethod
+    def from_table(cls, table: "ActivityTable") -> "ActivityCube":
+        """Fill the cube with array operations from an ActivityTable (or a PredatorTable)."""
+        cube = cls(table.videos_labels, table.cams_labels, table.types_labels)
+        cube.add_table(table)
+        return cube
+
+    @classmethod
+    def merge(cls, cubes: List["ActivityCube"]) -> "ActivityCube":
+        """Sum of cubes (ex: one cube by video or by chunk of videos), labels are merged in order of appearance."""
+        cube = cls(
+            get_labels([v for c in cubes for v in c.videos]),
+            get_labels([c_label for c in cubes for c_label in c.cams]),
+            get_labels([t for c in cubes for t in c.types]),
+        )
+        for name in get_labels([name for c in cubes for name in c.sums]):
+            cube.sums[name] = np.zeros(cube.counts.shape, dtype=np.int64)
+        for other in cubes:
+            ids = np.ix_(
+                np.array([cube.videos.index(v) for v in other.videos], dtype=np.int64),
+                np.array([cube.cams.index(c) for c in other.cams], dtype=np.int64),
+                np.array([cube.types.index(t) for t in other.types], dtype=np.int64),
+            )
+            cube.minutes[ids] += other.minutes
+            cube.counts[ids] += other.counts
+            cube.attacks[ids] += other.attacks
+            for name, values in other.sums.items():
+                cube.sums[name][ids] += values
+        return cube
+
+    def add_table(self, table: "ActivityTable") -> None:
+        """Add the activities of a table whose labels are the labels of the cube."""
+        assert (table.videos_labels, table.cams_labels, table.types_labels) == (self.videos, self.cams, self.types), f"ERROR in {self}.add_table(): labels of {table} differ from the labels of the cube."
+        count("activities_scanned", len(table))
+        ids = (table.videos, table.cams, table.types)
+        np.add.at(self.minutes, ids, get_durations_minutes_array(table.starts, table.ends))
+        np.add.at(self.counts, ids, 1)
+        if hasattr(table, "n_attacks"):
+            np.add.at(self.attacks, ids, table.n_attacks)
+
+    def add_sums(self, name: str, table: "ActivityTable", values: np.ndarray) -> None:
+        """Add values (one integer by activity of a table whose labels are the labels of the cube) to the named sums 'name'."""
+        assert (table.videos_labels, table.cams_labels, table.types_labels) == (self.videos, self.cams, self.types), f"ERROR in {self}.add_sums(): labels of {table} differ from the labels of the cube."
+        assert len(values) == len(table), f"ERROR in {self}.add_sums(): length of values ({len(values)}) != length of {table}."
+        if name not in self.sums:
+            self.sums[name] = np.zeros(self.counts.shape, dtype=np.int64)
+        np.add.at(self.sums[name], (table.videos, table.cams, table.types), np.asarray(values, dtype=np.int64))
+
+    # Basic properties ---------------------------------------------------------
+    @property
+    def nests(self) -> List[str]:
+        nests = []
+        for video in self.videos:
+            nest = get_nest(video)
+            if nest not in nests:
+                nests.append(nest)
+        return nests
+
+    def __str__(self) -> str:
+        return f"ActivityCube(v={len(self.videos)}, c={len(self.cams)}, t={len(self.types)})"
+
+    # Methods ------------------------------------------------------------------
+    def group_types(self, group_function: Callable[[str], str]) -> "ActivityCube":
+        """Returns a new cube where types are replaced by group_function(type) (ex: get_activity_groupped, get_active_status)."""
+        groups = []
+        for t in self.types:
+            group = group_function(t)
+            if group not in groups:
+                groups.append(group)
+        cube = ActivityCube(self.videos, self.cams, groups)
+        for t_id, t in enumerate(self.types):
+            g_id = groups.index(group_function(t))
+            cube.minutes[:, :, g_id] += self.minutes[:, :, t_id]
+            cube.counts[:, :, g_id] += self.counts[:, :, t_id]
+            cube.attacks[:, :, g_id] += self.attacks[:, :, t_id]
+            for name, values in self.sums.items():
+                cube.sums.setdefault(name, np.zeros(cube.counts.shape, dtype=np.int64))[:, :, g_id] += values[:, :, t_id]
+        return cube
+
+    def get_minutes(
+            self, day_part: str="all",
+            nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None,
+        ) -> int:
+        """Sum of the durations in minutes of the selection ('All' or None for no selection)."""
+        if day_part == "":
+            day_part = "all"
+        assert day_part.lower() in DAY_PARTS, f"ERROR in {self}.get_minutes(): day_part='{day_part}' should be in {DAY_PARTS}."
+        selection = self.minutes[..., DAY_PARTS.index(day_part.lower())]
+        return int(selection[self.get_selection(nest, cam, video, types)].sum())
+
+    def get_count(self, nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None) -> int:
+        """Number of activities of the selection ('All' or None for no selection)."""
+        return int(self.counts[self.get_selection(nest, cam, video, types)].sum())
+
+    def get_attacks(self, nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None) -> int:
+        """Number of attacks of the selection ('All' or None for no selection)."""
+        return int(self.attacks[self.get_selection(nest, cam, video, types)].sum())
+
+    def get_sum(self, name: str, nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None) -> int:
+        """Named sum 'name' of the selection ('All' or None for no selection, 0 if the cube has no such sums)."""
+        if name not in self.sums:
+            return 0
+        return int(self.sums[name][self.get_selection(nest, cam, video, types)].sum())
+
+    def get_selection(self, nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None) -> tuple:
+        """Index (for the first 3 axis of the arrays of the cube) of the selection."""
+        if isinstance(types, str):
+            types = [types]
+        videos_mask = np.array([
+            (video == "All" or v == video) and (nest == "All" or get_nest(v) == nest)
+            for v in self.videos
+        ], dtype=bool)
+        cams_mask = np.array([cam == "All" or c == cam for c in self.cams], dtype=bool)
+        types_mask = np.array([types is None or t in types for t in self.types], dtype=bool)
+        return np.ix_(videos_mask, cams_mask, types_mask)
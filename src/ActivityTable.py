@@ -0,0 +1,361 @@
+
+# Imports ----------------------------------------------------------------------
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from src.CSV import CSV
+from src.Activity import DAY_PARTS, get_nest, get_activity_groupped, get_active_status, get_durations_minutes_array, parse_seconds_array, parse_attacks_array
+from src.Activity import Activity, Predator
+
+
+# Main -------------------------------------------------------------------------
+class ActivityTable:
+    """
+    Array-backed container of activities (one numpy array by property instead of one Activity object by activity).
+        * starts, ends: int64 seconds since REFERENCE_DATETIME.
+        * types, cams, videos: categorical codes (int32) of the labels in types_labels, cams_labels, videos_labels.
+        * nests, groupped, status: derived categorical codes (nest of the video, grouped activity and active status of the type).
+    Selections are boolean masks (.mask(), .select()) and durations are computed with array operations.
+    """
+
+    # Constants ----------------------------------------------------------------
+    KEYS = ["video", "cam", "nest", "type", "groupped", "status"]
+
+    # Constructor --------------------------------------------------------------
+    def __init__(
+            self,
+            starts: np.ndarray, ends: np.ndarray,
+            types: np.ndarray, cams: np.ndarray, videos: np.ndarray,
+            types_labels: List[str], cams_labels: List[str], videos_labels: List[str],
+        ):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.types = np.asarray(types, dtype=np.int32)
+        self.cams = np.asarray(cams, dtype=np.int32)
+        self.videos = np.asarray(videos, dtype=np.int32)
+        self.types_labels = [t for t in types_labels]
+        self.cams_labels = [c for c in cams_labels]
+        self.videos_labels = [v for v in videos_labels]
+        n = len(self.starts)
+        for property_name in ["ends", "types", "cams", "videos"]:
+            assert len(getattr(self, property_name)) == n, f"ERROR in ActivityTable(): length of '{property_name}' ({len(getattr(self, property_name))}) != length of 'starts' ({n})."
+
+    @classmethod
+    def from_activities(cls, activities: List[Activity]) -> "ActivityTable":
+        starts, ends, codes, labels = get_activities_arrays(activities)
+        return cls(starts, ends, *codes, *labels)
+
+    @classmethod
+    def parse_activities(cls, dataset: CSV, video: str="", type_column: str="activity") -> "ActivityTable":
+        """
+        Table of the entries of an '_Activity.csv' dataset (with dayshifts, see add_dayshifts()), parsed column by column.
+            * Same table as ActivityTable.from_activities(Activity.parse_activies(dataset, video)) without creating Activity objects.
+            * Columns are read as numpy arrays (the typed columns of a ColumnarCSV are read directly).
+        """
+        starts = parse_seconds_array(dataset.get_col("start", as_numpy=True), dataset.get_col("dayshift_start", as_numpy=True).astype(np.int64), "start")
+        ends = parse_seconds_array(dataset.get_col("end", as_numpy=True), dataset.get_col("dayshift_end", as_numpy=True).astype(np.int64), "end")
+        types, types_labels = get_codes_and_labels(dataset.get_col(type_column, as_numpy=True))
+        cams, cams_labels = get_codes_and_labels(dataset.get_col("cam", as_numpy=True))
+        return cls(starts, ends, types, cams, np.zeros(len(starts), dtype=np.int32), types_labels, cams_labels, [video] if len(starts) > 0 else [])
+
+    @classmethod
+    def concatenate(cls, tables: List["ActivityTable"]) -> "ActivityTable":
+        """Concatenate tables (ex: one table by video), labels are merged in order of appearance."""
+        return cls(*get_concatenated_arrays(tables))
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], prefix: str="") -> "ActivityTable":
+        """Table from the arrays of .to_arrays() (ex: loaded from a .npz file)."""
+        return cls(
+            arrays[f"{prefix}starts"], arrays[f"{prefix}ends"],
+            arrays[f"{prefix}types"], arrays[f"{prefix}cams"], arrays[f"{prefix}videos"],
+            arrays[f"{prefix}types_labels"].tolist(), arrays[f"{prefix}cams_labels"].tolist(), arrays[f"{prefix}videos_labels"].tolist(),
+        )
+
+    def to_arrays(self, prefix: str="") -> Dict[str, np.ndarray]:
+        """All columns and labels as numpy arrays (ex: to save in a .npz file)."""
+        return {
+            f"{prefix}starts": self.starts, f"{prefix}ends": self.ends,
+            f"{prefix}types": self.types, f"{prefix}cams": self.cams, f"{prefix}videos": self.videos,
+            f"{prefix}types_labels": np.array(self.types_labels, dtype=str),
+            f"{prefix}cams_labels": np.array(self.cams_labels, dtype=str),
+            f"{prefix}videos_labels": np.array(self.videos_labels, dtype=str),
+        }
+
+    def to_activities(self) -> List[Activity]:
+        return [
+            Activity(start, end, self.types_labels[t], self.cams_labels[c], self.videos_labels[v])
+            for start, end, t, c, v in zip(self.starts.tolist(), self.ends.tolist(), self.types.tolist(), self.cams.tolist(), self.videos.tolist())
+        ]
+
+    # Basic properties ---------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(n={len(self)}, videos={len(self.videos_labels)}, cams={len(self.cams_labels)}, types={len(self.types_labels)})"
+
+    @property
+    def nests_labels(self) -> List[str]:
+        return get_labels([get_nest(video) for video in self.videos_labels])
+
+    @property
+    def nests(self) -> np.ndarray:
+        return map_codes(self.videos, [get_nest(video) for video in self.videos_labels], self.nests_labels)
+
+    @property
+    def groupped_labels(self) -> List[str]:
+        return get_labels([get_activity_groupped(t) for t in self.types_labels])
+
+    @property
+    def groupped(self) -> np.ndarray:
+        return map_codes(self.types, [get_activity_groupped(t) for t in self.types_labels], self.groupped_labels)
+
+    @property
+    def status_labels(self) -> List[str]:
+        return get_labels([get_active_status(t) for t in self.types_labels])
+
+    @property
+    def status(self) -> np.ndarray:
+        return map_codes(self.types, [get_active_status(t) for t in self.types_labels], self.status_labels)
+
+    @property
+    def durations_seconds(self) -> np.ndarray:
+        return self.ends - self.starts
+
+    def get_codes(self, key: str) -> Tuple[np.ndarray, List[str]]:
+        """Codes and labels of a categorical key (among KEYS)."""
+        assert key in ActivityTable.KEYS, f"ERROR in {self}.get_codes(): key='{key}' should be in {ActivityTable.KEYS}."
+        codes_name = {"video": "videos", "cam": "cams", "nest": "nests", "type": "types", "groupped": "groupped", "status": "status"}[key]
+        return getattr(self, codes_name), getattr(self, f"{codes_name}_labels")
+
+    # Selection ----------------------------------------------------------------
+    def mask(
+            self,
+            nest: str="All", cam: str="All", video: str="All",
+            type: Union[None, str]=None, groupped: Union[None, str]=None, status: Union[None, str]=None,
+        ) -> np.ndarray:
+        """Boolean mask of the activities that match the selection ('All' or None for no selection)."""
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in [("nest", nest), ("cam", cam), ("video", video), ("type", type), ("groupped", groupped), ("status", status)]:
+            if value is None or value == "All": continue
+            codes, labels = self.get_codes(key)
+            if value not in labels:
+                return np.zeros(len(self), dtype=bool)
+            mask &= codes == labels.index(value)
+        return mask
+
+    def select(self, ids: np.ndarray) -> "ActivityTable":
+        """New table with the activities selected by ids (boolean mask or array of indices)."""
+        return self.__class__(
+            self.starts[ids], self.ends[ids],
+            self.types[ids], self.cams[ids], self.videos[ids],
+            self.types_labels, self.cams_labels, self.videos_labels,
+        )
+
+    def filter(self, **selection) -> "ActivityTable":
+        """New table with the activities that match the selection (see .mask())."""
+        return self.select(self.mask(**selection))
+
+    def group_by(self, keys: List[str]) -> Dict[Tuple[str, ...], "ActivityTable"]:
+        """Map {(label_key1, label_key2, ...) -> sub-table} for each existing combination of keys."""
+        groups_ids, groups_labels = self.get_groups_ids(keys)
+        order = np.argsort(groups_ids, kind="stable")
+        unique_ids, starts = np.unique(groups_ids[order], return_index=True)
+        ends = list(starts[1:]) + [len(order)]
+        return {
+            groups_labels[group_id]: self.select(order[start:end])
+            for group_id, start, end in zip(unique_ids.tolist(), starts.tolist(), ends)
+        }
+
+    def get_groups_ids(self, keys: List[str]) -> Tuple[np.ndarray, Dict[int, Tuple[str, ...]]]:
+        """Group id of each activity for the combination of keys and map {group_id -> (label_key1, label_key2, ...)}."""
+        groups_ids = np.zeros(len(self), dtype=np.int64)
+        keys_labels = []
+        for key in keys:
+            codes, labels = self.get_codes(key)
+            groups_ids = groups_ids * len(labels) + codes
+            keys_labels.append(labels)
+        groups_labels = {}
+        for group_id in np.unique(groups_ids).tolist():
+            labels, current_id = [], group_id
+            for key_labels in keys_labels[::-1]:
+                current_id, code = divmod(current_id, len(key_labels))
+                labels.append(key_labels[code])
+            groups_labels[group_id] = tuple(labels[::-1])
+        return groups_ids, groups_labels
+
+    # Durations ----------------------------------------------------------------
+    def durations_minutes(self, day_part: str="all") -> np.ndarray:
+        """Durations in minutes of each activity (same values as Activity.duration_minutes(day_part))."""
+        if day_part == "":
+            day_part = "all"
+        assert day_part.lower() in DAY_PARTS, f"ERROR in {self}.durations_minutes(): day_part='{day_part}' should be in {DAY_PARTS}."
+        return get_durations_minutes_array(self.starts, self.ends)[:, DAY_PARTS.index(day_part.lower())]
+
+    def sum_minutes(self, day_part: str="all") -> int:
+        """Sum of the durations in minutes of the activities."""
+        return int(self.durations_minutes(day_part).sum())
+
+    def sum_minutes_by(self, keys: List[str], day_part: str="all") -> Dict[Tuple[str, ...], int]:
+        """Map {(label_key1, label_key2, ...) -> sum of durations in minutes} for each existing combination of keys."""
+        groups_ids, groups_labels = self.get_groups_ids(keys)
+        unique_ids, inverse = np.unique(groups_ids, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.durations_minutes(day_part), minlength=len(unique_ids)).astype(np.int64)
+        return {groups_labels[group_id]: int(n_min) for group_id, n_min in zip(unique_ids.tolist(), sums.tolist())}
+
+
+class PredatorTable(ActivityTable):
+    """
+    Array-backed container of predators.
+        * Same columns as ActivityTable.
+        * Attacks are stored as a ragged array: attacks of predator i are attacks_seconds[attacks_offsets[i]:attacks_offsets[i+1]].
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(
+            self,
+            starts: np.ndarray, ends: np.ndarray,
+            types: np.ndarray, cams: np.ndarray, videos: np.ndarray,
+            types_labels: List[str], cams_labels: List[str], videos_labels: List[str],
+            attacks_offsets: Union[None, np.ndarray]=None, attacks_seconds: Union[None, np.ndarray]=None,
+        ):
+        super().__init__(starts, ends, types, cams, videos, types_labels, cams_labels, videos_labels)
+        if attacks_offsets is None:
+            attacks_offsets, attacks_seconds = np.zeros(len(self) + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self.attacks_offsets = np.asarray(attacks_offsets, dtype=np.int64)
+        self.attacks_seconds = np.asarray(attacks_seconds, dtype=np.int64)
+        assert len(self.attacks_offsets) == len(self) + 1, f"ERROR in PredatorTable(): length of 'attacks_offsets' ({len(self.attacks_offsets)}) != number of predators + 1 ({len(self) + 1})."
+        assert self.attacks_offsets[-1] == len(self.attacks_seconds), f"ERROR in PredatorTable(): last attack offset ({self.attacks_offsets[-1]}) != number of attacks ({len(self.attacks_seconds)})."
+
+    @classmethod
+    def from_activities(cls, predators: List[Predator]) -> "PredatorTable":
+        starts, ends, codes, labels = get_activities_arrays(predators)
+        n_attacks = np.array([p.n_attacks for p in predators], dtype=np.int64)
+        attacks_offsets = np.concatenate([[0], np.cumsum(n_attacks)]).astype(np.int64)
+        attacks_seconds = np.array([attack for p in predators for attack in p.attacks_seconds], dtype=np.int64)
+        return cls(starts, ends, *codes, *labels, attacks_offsets, attacks_seconds)
+
+    @classmethod
+    def parse_predators(cls, dataset: CSV, video: str="") -> "PredatorTable":
+        """
+        Table of the entries of a '_Predator.csv' dataset (with dayshifts, see add_dayshifts()), parsed column by column.
+            * Same table as PredatorTable.from_activities(Predator.parse_predators(dataset, video)) without creating Predator objects.
+        """
+        table = ActivityTable.parse_activities(dataset, video, type_column="predator")
+        attacks_columns = get_attacks_columns(dataset.header())
+        starts_str = dataset.get_col("start", as_numpy=True)
+        attacks_str = np.array([dataset.get_col(column, as_numpy=True) for column in attacks_columns], dtype=str).reshape(len(attacks_columns), len(starts_str)).T
+        attacks_offsets, attacks_seconds = parse_attacks_array(attacks_str, starts_str, dataset.get_col("dayshift_start", as_numpy=True).astype(np.int64))
+        return cls(
+            table.starts, table.ends, table.types, table.cams, table.videos,
+            table.types_labels, table.cams_labels, table.videos_labels,
+            attacks_offsets, attacks_seconds,
+        )
+
+    @classmethod
+    def concatenate(cls, tables: List["PredatorTable"]) -> "PredatorTable":
+        """Concatenate tables (ex: one table by video), labels are merged in order of appearance."""
+        offsets_shifts = np.cumsum([0] + [len(table.attacks_seconds) for table in tables])
+        attacks_offsets = np.concatenate([[0]] + [table.attacks_offsets[1:] + shift for table, shift in zip(tables, offsets_shifts)])
+        attacks_seconds = np.concatenate([np.zeros(0, dtype=np.int64)] + [table.attacks_seconds for table in tables])
+        return cls(*get_concatenated_arrays(tables), attacks_offsets, attacks_seconds)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], prefix: str="") -> "PredatorTable":
+        table = ActivityTable.from_arrays(arrays, prefix)
+        return cls(
+            table.starts, table.ends, table.types, table.cams, table.videos,
+            table.types_labels, table.cams_labels, table.videos_labels,
+            arrays[f"{prefix}attacks_offsets"], arrays[f"{prefix}attacks_seconds"],
+        )
+
+    def to_arrays(self, prefix: str="") -> Dict[str, np.ndarray]:
+        arrays = super().to_arrays(prefix)
+        arrays[f"{prefix}attacks_offsets"] = self.attacks_offsets
+        arrays[f"{prefix}attacks_seconds"] = self.attacks_seconds
+        return arrays
+
+    def to_activities(self) -> List[Predator]:
+        offsets = self.attacks_offsets.tolist()
+        attacks_seconds = self.attacks_seconds.tolist()
+        return [
+            Predator(start, end, self.types_labels[t], self.cams_labels[c], self.videos_labels[v], attacks_seconds[offsets[i]:offsets[i+1]])
+            for i, (start, end, t, c, v) in enumerate(zip(self.starts.tolist(), self.ends.tolist(), self.types.tolist(), self.cams.tolist(), self.videos.tolist()))
+        ]
+
+    # Basic properties ---------------------------------------------------------
+    @property
+    def n_attacks(self) -> np.ndarray:
+        """Number of attacks of each predator."""
+        return np.diff(self.attacks_offsets)
+
+    # Selection ----------------------------------------------------------------
+    def select(self, ids: np.ndarray) -> "PredatorTable":
+        """New table with the predators selected by ids (boolean mask or array of indices)."""
+        ids = np.arange(len(self))[ids]
+        n_attacks = self.n_attacks[ids]
+        attacks_offsets = np.concatenate([[0], np.cumsum(n_attacks)]).astype(np.int64)
+        # Gather the attacks of each selected predator in the flat array of attacks
+        attacks_ids = np.repeat(self.attacks_offsets[ids] - attacks_offsets[:-1], n_attacks) + np.arange(attacks_offsets[-1])
+        return PredatorTable(
+            self.starts[ids], self.ends[ids],
+            self.types[ids], self.cams[ids], self.videos[ids],
+            self.types_labels, self.cams_labels, self.videos_labels,
+            attacks_offsets, self.attacks_seconds[attacks_ids],
+        )
+
+
+# Dependencies -----------------------------------------------------------------
+def get_labels(values: List[str]) -> List[str]:
+    """Unique values in order of appearance."""
+    return list({value: None for value in values})
+
+def get_attacks_columns(header: List[str]) -> List[str]:
+    """Consecutive attacks columns of a predators header: attack1, attack2, ... (stops at the first missing one)."""
+    attacks_columns = []
+    while f"attack{len(attacks_columns) + 1}" in header:
+        attacks_columns.append(f"attack{len(attacks_columns) + 1}")
+    return attacks_columns
+
+def get_codes_and_labels(values: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Categorical codes of values and their labels (unique values in order of appearance), vectorized."""
+    values = np.asarray(values, dtype=str)
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int32), []
+    unique_values, first_ids, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first_ids, kind="stable")
+    ranks = np.empty(len(order), dtype=np.int32)
+    ranks[order] = np.arange(len(order), dtype=np.int32)
+    return ranks[inverse.reshape(-1)], unique_values[order].tolist()
+
+def map_codes(codes: np.ndarray, values_of_codes: List[str], labels: List[str]) -> np.ndarray:
+    """Map codes to the codes of values_of_codes[code] in labels."""
+    codes_map = np.array([labels.index(value) for value in values_of_codes], dtype=np.int32)
+    if len(codes_map) == 0:
+        return np.zeros(len(codes), dtype=np.int32)
+    return codes_map[codes]
+
+def get_activities_arrays(activities: List[Activity]) -> Tuple[np.ndarray, np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray], Tuple[List[str], List[str], List[str]]]:
+    """Arrays (starts, ends), codes (types, cams, videos) and labels (types, cams, videos) of a list of activities."""
+    starts = np.array([a.start_seconds for a in activities], dtype=np.int64)
+    ends = np.array([a.end_seconds for a in activities], dtype=np.int64)
+    codes, labels = [], []
+    for property_name in ["type", "cam", "video"]:
+        labels_ids = {}
+        codes.append(np.array([labels_ids.setdefault(getattr(a, property_name), len(labels_ids)) for a in activities], dtype=np.int32))
+        labels.append(list(labels_ids))
+    return starts, ends, tuple(codes), tuple(labels)
+
+def get_concatenated_arrays(tables: List[ActivityTable]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str], List[str], List[str]]:
+    """Arrays (starts, ends, types, cams, videos) and labels (types, cams, videos) of the concatenation of tables."""
+    starts = np.concatenate([np.zeros(0, dtype=np.int64)] + [table.starts for table in tables])
+    ends = np.concatenate([np.zeros(0, dtype=np.int64)] + [table.ends for table in tables])
+    codes, labels = [], []
+    for property_name in ["types", "cams", "videos"]:
+        property_labels = get_labels([label for table in tables for label in getattr(table, f"{property_name}_labels")])
+        codes.append(np.concatenate([np.zeros(0, dtype=np.int32)] + [
+            map_codes(getattr(table, property_name), getattr(table, f"{property_name}_labels"), property_labels)
+            for table in tables
+        ]))
+        labels.append(property_labels)
+    return (starts, ends, *codes, *labels)
@@ -2,6 +2,7 @@
 # Imports ----------------------------------------------------------------------
 import os.path
 import csv
+from collections.abc import Mapping
 from typing import Union, Tuple, List, Dict, Callable
 import numpy as np
 
@@ -296,6 +297,35 @@ class CSV:
     
     def read(self, input_path: str, col_types: Dict[str, type]={}, col_default: dict={}):
         """Read from file."""
+        self.entries = list(self.iter_read(input_path, col_types=col_types, col_default=col_default))
+        return self
+
+    def iter_read(self, input_path: str, col_types: Dict[str, type]={}, col_default: dict={}, chunk_size: Union[None, int]=None):
+        """
+        Read from file as a stream (the whole file is never loaded in memory).
+            * chunk_size=None: yields entries (:dict) one by one.
+            * chunk_size=n: yields CSV objects (same class and header) of at most n entries.
+            * Column types (col_types) are applied during the parse.
+            * Name and header of the CSV are set when the iteration starts.
+        """
+        if chunk_size is None:
+            for values in self.iter_values(input_path, col_types=col_types, col_default=col_default):
+                yield {prop: value for prop, value in zip(self._header, values)}
+            return
+        assert chunk_size > 0, f"ERROR in {self}.iter_read('{input_path}'): chunk_size={chunk_size} should be > 0."
+        chunk = None
+        for values in self.iter_values(input_path, col_types=col_types, col_default=col_default):
+            if chunk is None:
+                chunk = self.__class__(self.header(), sep=self.sep, name=self.name, print_warnings=self.print_warnings)
+            chunk.add_entry({prop: value for prop, value in zip(self._header, values)})
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = None
+        if chunk is not None:
+            yield chunk
+
+    def iter_values(self, input_path: str, col_types: Dict[str, type]={}, col_default: dict={}):
+        """Read from file as a stream of lines (list of values in header order, typed by col_types)."""
 
         # Guardians
         assert any([input_path.endswith(f".{extention}")] for extention in CSV.ALLOWED_EXTENTIONS), f"ERROR in {self}.read('{input_path}'): extention sould be among {CSV.ALLOWED_EXTENTIONS})."
@@ -308,25 +338,197 @@ class CSV:
 
         # Parse csv from file
         with open(input_path, newline='') as csvfile:
-            csv_lines = list(csv.reader(csvfile, delimiter=self.sep))
+            csv_reader = csv.reader(csvfile, delimiter=self.sep)
+
+            # Set CSV header
+            header = next(csv_reader)
+            if len(header) <= 1:
+                self.warning(f".read('{input_path}'): header contains {len(header)} values. Maybe sep='{self.sep}' parameter in incorrect.")
+            self._header = Header(header, self.sep)
+
+            # Set column types converters
+            converters = []
+            for col_name, dt in col_types.items():
+                assert col_name in self._header, f"ERROR in {self}.read('{input_path}'): col_name='{col_name}' from col_types does not exists."
+                converters.append((self._header.idof(col_name), dt, col_default.get(col_name, None)))
+
+            # Yield CSV entries values
+            for i, line in enumerate(csv_reader):
+                assert len(line) == len(header), f"ERROR in {self}.read('{input_path}'): number of elements ({len(line)}) in entry ({i+1}) does not match the header ({len(header)})."
+                for col_id, dt, default_value in converters:
+                    line[col_id] = to_type(line[col_id], dt, default_value=default_value)
+                yield line
+
+class ColumnarCSV(CSV):
+    """
+    CSV with a columnar storage: one typed numpy array by column instead of one :dict by entry.
+        * String columns are stored as category codes, numeric columns as numpy numeric arrays.
+        * Entries are accessed through Row views (entry["col"], entry.items(), ...) so that functions written for CSV keep working.
+        * Row views refer to a position in the CSV: they are invalidated by .filter().
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(
+            self, header: List[str]=[],
+            sep: str=";", name: str="DataFrame",
+            print_warnings: bool=True,
+        ):
+        self._columns = {}
+        self._n_rows = 0
+        super().__init__(header, sep=sep, name=name, print_warnings=print_warnings)
 
-        # Set CSV header
-        header = csv_lines[0]
-        if len(header) <= 1:
-            self.warning(f".read('{input_path}'): header contains {len(header)} values. Maybe sep='{self.sep}' parameter in incorrect.")
-        self._header = Header(header, self.sep)
+    # Entries as Row views -----------------------------------------------------
+    @property
+    def entries(self) -> List["Row"]:
+        return [Row(self, id) for id in range(self._n_rows)]
 
-        # Set CSV entries
-        self.entries = []
-        for i, line in enumerate(csv_lines[1:]):
-            assert len(line) == len(header), f"ERROR in {self}.read('{input_path}'): number of elements ({len(line)}) in entry ({i+1}/{len(csv_lines)-1}) does not match the header ({len(header)})."
-            self.entries.append({prop: value for prop, value in zip(header, line)})
+    @entries.setter
+    def entries(self, entries: List[dict]) -> None:
+        self._columns = {
+            prop: Column.from_values([entry[prop] for entry in entries])
+            for prop in self._header
+        }
+        self._n_rows = len(entries)
+
+    # Basic properties ---------------------------------------------------------
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __getitem__(self, id: int) -> "Row":
+        if id < 0: id += self._n_rows
+        if not 0 <= id < self._n_rows:
+            raise IndexError(f"ERROR in {self}[{id}]: index out of range.")
+        return Row(self, id)
+
+    def __iter__(self):
+        return (Row(self, id) for id in range(self._n_rows))
+
+    def __str__(self) -> str:
+        return f"ColumnarCSV('{self.name}', r={self.n_rows}, c={self.n_cols})"
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns arrays."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    # Mutation Methods ---------------------------------------------------------
+    def add_entry(self, entry: dict):
+        values = [entry[prop] for prop in self._header]
+        for prop, value in zip(self._header, values):
+            self._columns[prop].append(value)
+        self._n_rows += 1
+        return self
+
+    def add_col(self, property: str, values: list, allow_replacement=False):
+        if property in self._header:
+            assert allow_replacement, f"ERROR in {self}.add_col(): property='{property}' already exists and allow_replacement is set to False."
+        assert len(values) == len(self), f"ERROR in {self}.add_col(): values length ({len(values)}) != CSV length ({len(self)})."
+        if property not in self._header:
+            self._header.add(property)
+        self._columns[property] = Column.from_values(values)
+        return self
 
-        # Set column types if required
-        for col_name, dt in col_types.items():
-            col_default_value = col_default.get(col_name, None)
-            self.set_col_type(col_name, dt, default_value=col_default_value)
+    def remove_col(self, property: str):
+        self._header.remove(property)
+        del self._columns[property]
+        return self
+
+    def rename_col(self, property_old: str, property_new: str):
+        self._header.rename(property_old, property_new)
+        self._columns[property_new] = self._columns.pop(property_old)
+        return self
+
+    def filter(self, keep_entry_function: Callable, do_print: bool=False, filter_name: str=""):
+        """Filter entries in the CSV with a filter_function."""
+        l1 = len(self)
+        keep_mask = np.fromiter((bool(keep_entry_function(entry)) for entry in self), dtype=bool, count=l1)
+        self.take(keep_mask)
+        l2 = len(self)
+        if do_print:
+            print(f"{self}: Filter('{filter_name}'): {l1} -> {l2}")
+        return self
 
+    def take(self, ids: np.ndarray):
+        """Keep only entries selected by ids (boolean mask or array of indices)."""
+        ids = np.arange(self._n_rows)[ids]
+        self._columns = {prop: column.take(ids) for prop, column in self._columns.items()}
+        self._n_rows = len(ids)
+        return self
+
+    def set_col_type(self, property_name: str, dt: type, default_value=None):
+        assert property_name in self._header, f"ERROR in {self}.set_col_type(): property_name='{property_name}' does not exists."
+        values = [to_type(value, dt, default_value=default_value) for value in self._columns[property_name].to_list()]
+        self._columns[property_name] = Column.from_values(values)
+
+    # Get Methods --------------------------------------------------------------
+    def get_col(self, property: str, dt: Union[None, type]=None, default_value=None, as_numpy: bool=False):
+        """Get Column of CSV as array."""
+        assert property in self, f"ERROR in {self}.get_array('{property}'): property does not exists."
+        if dt is None and as_numpy:
+            return self._columns[property].to_numpy()
+        col_list = self._columns[property].to_list()
+        if dt is not None:
+            col_list = [to_type(el, dt, default_value=default_value) for el in col_list]
+        if as_numpy:
+            col_list = np.array(col_list)
+        return col_list
+
+    def get_X(self, features: List[str]) -> np.ndarray:
+        """Get features matrix X (numpy) from the CSV."""
+        for feature in features:
+            assert feature in self, f"ERROR in {self}.get_X(): feature='{feature}' does not exists."
+        X = np.empty((len(self), len(features)), dtype=float)
+        for i, feature in enumerate(features):
+            X[:, i] = self._columns[feature].to_float()
+        return X
+
+    def get_y(self, label: str) -> np.ndarray:
+        """Get label array y (numpy) from the CSV."""
+        assert label in self, f"ERROR in {self}.get_y(): label='{label}' does not exists."
+        return self._columns[label].to_float()
+
+    def copy(self):
+        """Copy CSV object."""
+        new_csv = ColumnarCSV()
+        new_csv.name = self.name
+        new_csv.print_warnings = self.print_warnings
+        new_csv._header = self._header.copy()
+        new_csv._columns = {prop: column.copy() for prop, column in self._columns.items()}
+        new_csv._n_rows = self._n_rows
+        return new_csv
+
+    # IO -----------------------------------------------------------------------
+    def write(self, output_path: str):
+        """Save to file."""
+
+        # Guardians
+        assert any([output_path.endswith(f".{extention}")] for extention in CSV.ALLOWED_EXTENTIONS), f"ERROR in {self}.write('{output_path}'): extention sould be among {CSV.ALLOWED_EXTENTIONS})."
+        assert os.path.isdir(os.path.dirname(output_path)), f"ERROR in {self}.write('{output_path}'): destination folder does not exists."
+
+        # Stringify (column by column)
+        str_header = self.sep.join(self._header.properties)
+        str_columns = [self._columns[prop].to_str_list() for prop in self._header.properties]
+        str_entries_list = [self.sep.join(str_values) for str_values in zip(*str_columns)]
+        str_lines = [str_header] + str_entries_list
+
+        # Write
+        with open(output_path, "w") as fs:
+            fs.write("\n".join(str_lines))
+        return self
+
+    def read(self, input_path: str, col_types: Dict[str, type]={}, col_default: dict={}):
+        """Read from file (line by line, directly into columns)."""
+        columns, n_rows = None, 0
+        for values in self.iter_values(input_path, col_types=col_types, col_default=col_default):
+            if columns is None:
+                columns = [Column() for _ in self._header]
+            for column, value in zip(columns, values):
+                column.append(value)
+            n_rows += 1
+        if columns is None:
+            columns = [Column() for _ in self._header]
+        self._columns = {prop: column for prop, column in zip(self._header, columns)}
+        self._n_rows = n_rows
         return self
 
 # Dependencies -----------------------------------------------------------------
@@ -426,6 +628,214 @@ class Header:
     def copy(self):
         return Header([p for p in self], self.sep)
     
+class Row:
+    """
+    View on an entry of a ColumnarCSV object.
+        -> behaves like the :dict of an entry of a CSV object (entry["col"], entry.items(), ...).
+    """
+
+    __slots__ = ("_csv", "_id")
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, csv: ColumnarCSV, id: int):
+        self._csv = csv
+        self._id = id
+
+    # Basic properties ---------------------------------------------------------
+    def __getitem__(self, property_name: str):
+        return self._csv._columns[property_name][self._id]
+
+    def __setitem__(self, property_name: str, value) -> None:
+        assert property_name in self._csv._header, f"ERROR in {self}: property_name='{property_name}' not in header (use .add_col() to add a column)."
+        self._csv._columns[property_name][self._id] = value
+
+    def __contains__(self, property_name: str) -> bool:
+        return property_name in self._csv._header
+
+    def __iter__(self):
+        return iter(self._csv._header)
+
+    def __len__(self) -> int:
+        return len(self._csv._header)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping) and not isinstance(other, Row):
+            return NotImplemented
+        return self.to_dict() == dict(other.items())
+
+    def __str__(self) -> str:
+        return f"Row({self.to_dict()})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    # Methods ------------------------------------------------------------------
+    def keys(self) -> List[str]:
+        return self._csv.header()
+
+    def values(self) -> list:
+        return [self[prop] for prop in self._csv._header]
+
+    def items(self) -> List[Tuple[str, object]]:
+        return [(prop, self[prop]) for prop in self._csv._header]
+
+    def get(self, property_name: str, default_value=None):
+        return self[property_name] if property_name in self else default_value
+
+    def to_dict(self) -> dict:
+        return {prop: self[prop] for prop in self._csv._header}
+
+class Column:
+    """
+    Typed storage of the values of a ColumnarCSV column.
+        * kind 'category': :str values stored as int32 codes of a list of categories.
+        * kind 'numeric': int, float or bool values stored in a numpy array of that type.
+        * kind 'object': any other (or mixed) values.
+        -> the column is converted to kind 'object' when a value does not fit its type.
+    """
+
+    # Constants ----------------------------------------------------------------
+    INITIAL_CAPACITY = 16
+    NUMERIC_TYPES = {"i": (int, np.integer), "f": (float, np.floating), "b": (bool, np.bool_)}
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self):
+        self.kind = "category"
+        self.data = np.zeros(Column.INITIAL_CAPACITY, dtype=np.int32)
+        self.size = 0
+        self.categories = []
+        self.categories_ids = {}
+
+    @classmethod
+    def from_values(cls, values) -> "Column":
+        column = cls()
+        if isinstance(values, np.ndarray) and values.dtype.kind in Column.NUMERIC_TYPES:
+            column.kind = "numeric"
+            column.data = values.copy()
+        elif all(type(v) is str for v in values):
+            categories_ids = {}
+            column.data = np.array([categories_ids.setdefault(v, len(categories_ids)) for v in values], dtype=np.int32)
+            column.categories = list(categories_ids)
+            column.categories_ids = categories_ids
+        elif all(type(v) is int for v in values):
+            try:
+                column.kind, column.data = "numeric", np.array(values, dtype=np.int64)
+            except OverflowError:
+                column.kind, column.data = "object", to_object_array(values)
+        elif all(type(v) is float for v in values):
+            column.kind, column.data = "numeric", np.array(values, dtype=np.float64)
+        elif all(type(v) is bool for v in values):
+            column.kind, column.data = "numeric", np.array(values, dtype=bool)
+        else:
+            column.kind, column.data = "object", to_object_array(values)
+        column.size = len(column.data)
+        return column
+
+    # Basic properties ---------------------------------------------------------
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, id: int):
+        value = self.data[id]
+        if self.kind == "category":
+            return self.categories[value]
+        elif self.kind == "numeric":
+            return value.item()
+        return value
+
+    def __setitem__(self, id: int, value) -> None:
+        if self.kind == "category":
+            if type(value) is str:
+                self.data[id] = self.get_code(value)
+                return
+        elif self.kind == "numeric":
+            numeric_types = Column.NUMERIC_TYPES[self.data.dtype.kind]
+            if isinstance(value, numeric_types) and (self.data.dtype.kind == "b" or not isinstance(value, (bool, np.bool_))):
+                self.data[id] = value
+                return
+        self.to_object()
+        self.data[id] = value
+
+    @property
+    def nbytes(self) -> int:
+        return self.data[:self.size].nbytes
+
+    # Methods ------------------------------------------------------------------
+    def get_code(self, value: str) -> int:
+        code = self.categories_ids.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self.categories_ids[value] = code
+        return code
+
+    def append(self, value) -> None:
+        if self.size == 0 and type(value) is not str:
+            self.init_type(value)
+        if self.size == len(self.data):
+            new_data = np.zeros(max(Column.INITIAL_CAPACITY, 2*len(self.data)), dtype=self.data.dtype)
+            new_data[:self.size] = self.data[:self.size]
+            self.data = new_data
+        self.size += 1
+        self[self.size - 1] = value
+
+    def init_type(self, value) -> None:
+        """Set the kind of an empty column from the type of its first value."""
+        for dtype in [bool, np.int64, np.float64]:
+            numeric_types = Column.NUMERIC_TYPES[np.dtype(dtype).kind]
+            if isinstance(value, numeric_types) and (dtype is bool or not isinstance(value, (bool, np.bool_))):
+                self.kind = "numeric"
+                self.data = np.zeros(len(self.data), dtype=dtype)
+                return
+        self.kind = "object"
+        self.data = np.empty(len(self.data), dtype=object)
+
+    def to_object(self) -> None:
+        """Convert column to kind 'object'."""
+        if self.kind == "object": return
+        data = to_object_array(self.to_list())
+        self.data = np.empty(len(self.data), dtype=object)
+        self.data[:self.size] = data
+        self.kind = "object"
+        self.categories, self.categories_ids = [], {}
+
+    def to_list(self) -> list:
+        if self.kind == "category":
+            categories = self.categories
+            return [categories[code] for code in self.data[:self.size].tolist()]
+        elif self.kind == "numeric":
+            return self.data[:self.size].tolist()
+        return list(self.data[:self.size])
+
+    def to_str_list(self) -> List[str]:
+        if self.kind == "category":
+            return self.to_list()
+        return [str(value) for value in self.to_list()]
+
+    def to_numpy(self) -> np.ndarray:
+        if self.kind == "category":
+            return np.array(self.categories, dtype=str)[self.data[:self.size]] if len(self.categories) > 0 else np.array([], dtype=str)
+        return self.data[:self.size].copy()
+
+    def to_float(self) -> np.ndarray:
+        if self.kind == "category":
+            return np.array([float(category) for category in self.categories], dtype=float)[self.data[:self.size]]
+        elif self.kind == "numeric":
+            return self.data[:self.size].astype(float)
+        return np.array([float(value) for value in self.data[:self.size]], dtype=float)
+
+    def take(self, ids: np.ndarray) -> "Column":
+        column = Column()
+        column.kind = self.kind
+        column.data = self.data[:self.size][ids]
+        column.size = len(column.data)
+        column.categories = [category for category in self.categories]
+        column.categories_ids = {k: v for k, v in self.categories_ids.items()}
+        return column
+
+    def copy(self) -> "Column":
+        return self.take(slice(None))
+
 # Dependency: Utils Funcions ---------------------------------------------------
 def to_type(input, dt:type, default_value=None):
     """Convert input to type dt. If default_value is set, returns default_value when convertion fails."""
@@ -437,6 +847,13 @@ def to_type(input, dt:type, default_value=None):
         else:
             return default_value
 
+def to_object_array(values: list) -> np.ndarray:
+    """Convert a list to a 1D numpy array of dtype object (without numpy trying to broadcast nested values)."""
+    arr = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        arr[i] = value
+    return arr
+
 def print_line(
         line_list,
         sep: str=" | ", dots_str: str="...",
@@ -518,6 +935,15 @@ if __name__ == "__main__":
     data = CSV().read(decoy_path2, col_types={"DDG": float, "RSA": float, "PoP": float})
     data.show()
 
+    print("\nRead copy dataset with columnar storage:")
+    data = ColumnarCSV().read(decoy_path2, col_types={"DDG": float, "RSA": float, "PoP": float})
+    data.show()
+    print(f"{data.nbytes} bytes in columns")
+
+    print("\nRead copy dataset as a stream of chunks:")
+    for chunk in CSV().iter_read(decoy_path2, col_types={"DDG": float}, chunk_size=2):
+        print(chunk, chunk.get_col("DDG"))
+
     # Delete created files
     os.remove(decoy_path1)
     os.remove(decoy_path2)
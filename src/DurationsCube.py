@@ -0,0 +1,91 @@
+
+# Imports ----------------------------------------------------------------------
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from src.Activity import get_nest
+from src.ActivityTable import get_labels, ActivityTable
+from src.QuantileSketch import QuantileSketch
+
+
+# Main -------------------------------------------------------------------------
+class DurationsCube:
+    """
+    Mergeable distributions of the durations in minutes of a list of activities (or predators) by (video, cam, type).
+        * cells[(video, cam, type)]: QuantileSketch of the durations of the cell (distinct durations and their counts).
+        * Durations are integer minutes: sketches stay exact while they have at most MAX_EXACT_CENTROIDS distinct durations
+          (counts, means and medians are then the values of numpy), larger ones are compressed as t-digests.
+    Cubes of different videos (or chunks of videos) are merged with DurationsCube.merge(), rollups on nests, cams or 'All'
+    merge the sketches of the selected cells without the activities.
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, videos: List[str]=[], cams: List[str]=[], types: List[str]=[]):
+        self.videos = [v for v in videos]
+        self.cams = [c for c in cams]
+        self.types = [t for t in types]
+        self.cells: Dict[Tuple[str, str, str], QuantileSketch] = {}
+
+    @classmethod
+    def from_table(cls, table: ActivityTable, type_key: str="type") -> "DurationsCube":
+        """Fill the cube with array operations from an ActivityTable (type_key: 'type', 'groupped' or 'status')."""
+        types_codes, types_labels = table.get_codes(type_key)
+        cube = cls(table.videos_labels, table.cams_labels, types_labels)
+        cells_ids = (table.videos.astype(np.int64) * len(cube.cams) + table.cams) * len(cube.types) + types_codes
+        durations = table.durations_minutes().astype(np.int64)
+
+        # Sort by (cell, duration) and count each distinct pair
+        order = np.lexsort((durations, cells_ids))
+        cells_ids, durations = cells_ids[order], durations[order]
+        is_new_pair = np.ones(len(order), dtype=bool)
+        is_new_pair[1:] = (cells_ids[1:] != cells_ids[:-1]) | (durations[1:] != durations[:-1])
+        pairs_starts = np.flatnonzero(is_new_pair)
+        pairs_cells, pairs_values = cells_ids[pairs_starts], durations[pairs_starts]
+        pairs_counts = np.diff(np.append(pairs_starts, len(order)))
+
+        # Split pairs by cell
+        cells_starts = np.flatnonzero(np.concatenate([[True], pairs_cells[1:] != pairs_cells[:-1]])) if len(pairs_cells) > 0 else pairs_starts
+        for start, end in zip(cells_starts.tolist(), np.append(cells_starts[1:], len(pairs_cells)).tolist()):
+            v_c, t = divmod(int(pairs_cells[start]), len(cube.types))
+            v, c = divmod(v_c, len(cube.cams))
+            cube.cells[(cube.videos[v], cube.cams[c], cube.types[t])] = QuantileSketch(pairs_values[start:end], pairs_counts[start:end])
+        return cube
+
+    @classmethod
+    def merge(cls, cubes: List["DurationsCube"]) -> "DurationsCube":
+        """Merge cubes (ex: one cube by video or by chunk of videos), labels are merged in order of appearance."""
+        cube = cls(
+            get_labels([v for c in cubes for v in c.videos]),
+            get_labels([c_label for c in cubes for c_label in c.cams]),
+            get_labels([t for c in cubes for t in c.types]),
+        )
+        for other in cubes:
+            for cell, sketch in other.cells.items():
+                cube.cells[cell] = QuantileSketch.merge([cube.cells[cell], sketch]) if cell in cube.cells else sketch
+        return cube
+
+    # Basic properties ---------------------------------------------------------
+    def __str__(self) -> str:
+        return f"DurationsCube(v={len(self.videos)}, c={len(self.cams)}, t={len(self.types)}, cells={len(self.cells)})"
+
+    # Methods ------------------------------------------------------------------
+    def get_sketch(self, nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None) -> QuantileSketch:
+        """QuantileSketch of the durations of the selection ('All' or None for no selection), merged from the sketches of its cells."""
+        if isinstance(types, str):
+            types = [types]
+        return QuantileSketch.merge([
+            sketch for (v, c, t), sketch in self.cells.items()
+            if (video == "All" or v == video) and (nest == "All" or get_nest(v) == nest)
+            and (cam == "All" or c == cam) and (types is None or t in types)
+        ])
+
+    def get_count(self, nest: str="All", cam: str="All", video: str="All", types: Union[None, str, List[str]]=None) -> int:
+        """Number of activities of the selection."""
+        return self.get_sketch(nest, cam, video, types).count
+
+    def rollup(self, keys: List[str]) -> Dict[Tuple[str, ...], QuantileSketch]:
+        """Map {(label_key1, label_key2, ...) -> merged sketch} for each existing combination of keys (among 'nest', 'video', 'cam', 'type')."""
+        cells_by_group = {}
+        for (v, c, t), sketch in self.cells.items():
+            labels = {"nest": get_nest(v), "video": v, "cam": c, "type": t}
+            cells_by_group.setdefault(tuple(labels[key] for key in keys), []).append(sketch)
+        return {group: QuantileSketch.merge(sketches) for group, sketches in cells_by_group.items()}
@@ -0,0 +1,115 @@
+
+# Imports ----------------------------------------------------------------------
+from typing import List, Union
+import numpy as np
+
+# Constants --------------------------------------------------------------------
+MAX_EXACT_CENTROIDS = 2048                             # Sketches with at most this number of distinct values are exact
+COMPRESSION = 400                                      # t-digest compression of larger sketches (about COMPRESSION / 2 centroids)
+
+
+# Main -------------------------------------------------------------------------
+class QuantileSketch:
+    """
+    Mergeable summary of a list of values for counts, means and quantiles without keeping the values.
+        * means, weights: centroids (sorted by mean). While there are at most max_exact_centroids distinct values,
+          each centroid is one distinct value and its count: quantiles are exact (same values as np.quantile()).
+        * Beyond, centroids are compressed as a merging t-digest (scale function k1): size stays O(compression)
+          and quantiles are approximate (rank error about 1 / compression near the median, smaller in the tails).
+        * count, sum, min and max are kept apart from the centroids: the mean stays exact for integer values (ex: durations in minutes).
+    Sketches of disjoint lists (ex: by video and cam) are combined with QuantileSketch.merge() into the sketch of their union.
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(
+            self, means: Union[None, np.ndarray]=None, weights: Union[None, np.ndarray]=None,
+            compression: float=COMPRESSION, max_exact_centroids: int=MAX_EXACT_CENTROIDS,
+        ):
+        self.means = np.zeros(0, dtype=np.int64) if means is None else np.asarray(means)
+        self.weights = np.zeros(0, dtype=np.int64) if weights is None else np.asarray(weights, dtype=np.int64)
+        assert len(self.means) == len(self.weights), f"ERROR in QuantileSketch(): length of means ({len(self.means)}) != length of weights ({len(self.weights)})."
+        assert np.all(self.weights > 0), f"ERROR in QuantileSketch(): weights should be positive."
+        self.compression = compression
+        self.max_exact_centroids = max_exact_centroids
+        self.is_exact = True
+        self.count = int(self.weights.sum())
+        self.sum = (self.means * self.weights).sum().item() if len(self.means) > 0 else 0
+        self.min = self.means.min().item() if len(self.means) > 0 else np.nan
+        self.max = self.means.max().item() if len(self.means) > 0 else np.nan
+        if len(self.means) > self.max_exact_centroids:
+            self.compress()
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: float=COMPRESSION, max_exact_centroids: int=MAX_EXACT_CENTROIDS) -> "QuantileSketch":
+        """Sketch of a list of values (distinct values and their counts, compressed if there are too many)."""
+        means, weights = np.unique(np.asarray(values), return_counts=True)
+        return cls(means, weights, compression, max_exact_centroids)
+
+    @classmethod
+    def merge(cls, sketches: List["QuantileSketch"]) -> "QuantileSketch":
+        """Sketch of the union of the lists summarized by sketches (exact if they all are and the union is small enough)."""
+        if len(sketches) == 0:
+            return cls()
+        if len(sketches) == 1:
+            return sketches[0]
+        sketches = [sketch for sketch in sketches if sketch.count > 0]
+        if len(sketches) <= 1:
+            return sketches[0] if len(sketches) == 1 else cls()
+        means = np.concatenate([sketch.means for sketch in sketches])
+        weights = np.concatenate([sketch.weights for sketch in sketches])
+        if all(sketch.is_exact for sketch in sketches):
+            means, inverse = np.unique(means, return_inverse=True) # Sorted merge of the distinct values
+            weights = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(means)).astype(np.int64)
+            return cls(means, weights, sketches[0].compression, sketches[0].max_exact_centroids)
+        order = np.argsort(means, kind="stable")
+        sketch = cls.__new__(cls)
+        sketch.means, sketch.weights = means[order], weights[order]
+        sketch.compression, sketch.max_exact_centroids = sketches[0].compression, sketches[0].max_exact_centroids
+        sketch.is_exact = False
+        sketch.count = sum(s.count for s in sketches)
+        sketch.sum = sum(s.sum for s in sketches)
+        sketch.min = min(s.min for s in sketches)
+        sketch.max = max(s.max for s in sketches)
+        sketch.compress()
+        return sketch
+
+    # Basic properties ---------------------------------------------------------
+    def __len__(self) -> int:
+        return self.count
+
+    def __str__(self) -> str:
+        return f"QuantileSketch(n={self.count}, centroids={len(self.means)}, exact={self.is_exact})"
+
+    # Methods ------------------------------------------------------------------
+    def mean(self) -> float:
+        """Mean of the values (nan if empty)."""
+        return self.sum / self.count if self.count > 0 else np.nan
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def quantile(self, q: float) -> float:
+        """Quantile q (in [0, 1]) of the values: linear interpolation as np.quantile() when exact, t-digest interpolation otherwise (nan if empty)."""
+        assert 0.0 <= q <= 1.0, f"ERROR in {self}.quantile(): q={q} should be in [0, 1]."
+        if self.count == 0:
+            return np.nan
+        cumulated_weights = np.cumsum(self.weights)
+        if self.is_exact:
+            position = (self.count - 1) * q
+            lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+            lower, upper = self.means[np.searchsorted(cumulated_weights, [lower_rank, upper_rank], side="right")].tolist()
+            return float(lower + (position - lower_rank) * (upper - lower))
+        centers = cumulated_weights - self.weights / 2 # Rank of the center of each centroid
+        return float(np.interp(q * self.count, np.concatenate([[0], centers, [self.count]]), np.concatenate([[self.min], self.means, [self.max]])))
+
+    def compress(self) -> None:
+        """Merge adjacent centroids into t-digest centroids: each one spans at most one unit of the k1 scale function."""
+        self.is_exact = False
+        cumulated_weights = np.cumsum(self.weights)
+        q_starts = (cumulated_weights - self.weights) / self.count
+        k_starts = self.compression / (2 * np.pi) * np.arcsin(2 * q_starts - 1)
+        groups = np.floor(k_starts - k_starts[0]).astype(np.int64)
+        groups = np.concatenate([[0], np.cumsum(groups[1:] != groups[:-1])]) # Consecutive ids
+        weights = np.bincount(groups, weights=self.weights)
+        self.means = np.bincount(groups, weights=self.means * self.weights) / weights
+        self.weights = weights.astype(np.int64)
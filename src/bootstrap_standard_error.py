@@ -1,28 +1,131 @@
 
 # Imports ----------------------------------------------------------------------
 import numpy as np
-from typing import Callable
+from typing import Callable, Iterator, List, Tuple, Union
+from src.profiling import count
+
+# Constants --------------------------------------------------------------------
+N_REPEATS = 50000                                      # Number of bootstrap resamples
+CI_RANGE = [2.5, 97.5]                                 # Percentiles of the confidence interval
+MAX_MEMORY_BYTES = 256 * 1024**2                       # Memory cap for one block of resamples (sets the chunk size)
+BLOCK_SIZE = 5000                                      # Number of resamples by random stream (unit of work of the workers)
 
 # Main -------------------------------------------------------------------------
-def bootstrap_standard_error(arr: np.ndarray, measure_function: Callable):
+def bootstrap_standard_error(
+        arr: np.ndarray, measure_function: Callable,
+        n_repeats: int=N_REPEATS, max_memory_bytes: int=MAX_MEMORY_BYTES,
+        vectorized: bool=True,
+        seed: Union[None, int, np.random.SeedSequence]=None, n_workers: int=1,
+    ) -> Tuple[float, np.ndarray]:
     """
     Returns the Standard Error on Measure and the [2.5, 97.5] CI of the <measure_function> on <arr>.
+        * vectorized=True: <measure_function> is called on whole blocks of resamples with an 'axis' argument (np.mean, np.median, ...).
+        * vectorized=False: <measure_function> is called once by resample (for functions that are not axis-aware).
+        * For a given seed, results are identical whatever the number of workers (n_workers).
+    """
+    return bootstrap_standard_errors(
+        [(arr, measure_function)],
+        n_repeats=n_repeats, max_memory_bytes=max_memory_bytes, vectorized=vectorized,
+        seed=seed, n_workers=n_workers,
+    )[0]
+
+def bootstrap_standard_errors(
+        tasks: List[Tuple[np.ndarray, Callable]],
+        n_repeats: int=N_REPEATS, max_memory_bytes: int=MAX_MEMORY_BYTES,
+        vectorized: bool=True,
+        seed: Union[None, int, np.random.SeedSequence]=None, n_workers: int=1,
+    ) -> List[Tuple[float, np.ndarray]]:
+    """
+    Returns the (Standard Error, CI) of each (arr, measure_function) task.
+        * The replicates of each task are splitted in blocks of BLOCK_SIZE resamples.
+        * Each block has its own random stream (child of numpy.random.SeedSequence(seed)).
+        * Blocks of all tasks are spread over a pool of <n_workers> processes (n_workers=1: no pool),
+          the tasks are sent once by worker and each block only sends its task id and random stream.
     """
 
-    # Init
-    CI_RANGE = [2.5, 97.5]
-    N_REPEATS = 50000
-    bootstrap_measures = []
-    
-    # Repeats measurements on samples
-    for i in range(N_REPEATS):
-        # Sample with replacement from the original data
-        sample = np.random.choice(arr, size=len(arr), replace=True)
-        measure = measure_function(sample)
-        bootstrap_measures.append(measure)
+    # Generate one random stream by block of each task
+    tasks = [(np.asarray(arr), measure_function) for arr, measure_function in tasks]
+    tasks_seeds = get_seed_sequence(seed).spawn(len(tasks))
+    blocks = []
+    for task_id, task_seed in enumerate(tasks_seeds):
+        block_sizes = [min(BLOCK_SIZE, n_repeats - block_start) for block_start in range(0, n_repeats, BLOCK_SIZE)]
+        for block_size, block_seed in zip(block_sizes, task_seed.spawn(len(block_sizes))):
+            blocks.append((task_id, block_size, block_seed, max_memory_bytes, vectorized))
+
+    # Run blocks
+    count("bootstrap_replicates", sum(block[1] for block in blocks))
+    if n_workers <= 1:
+        blocks_measures = [bootstrap_block(*tasks[task_id], *block_args) for task_id, *block_args in blocks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor # Lazy import: multiprocessing is only loaded when a pool is used
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=init_bootstrap_worker, initargs=(tasks,)) as executor:
+            blocks_measures = list(executor.map(bootstrap_block_task, blocks))
 
     # Compute stats
-    SE = np.std(bootstrap_measures) # Standard Error on Measure (mean, median, ...)
-    # Compute the 2.5th and 97.5th percentiles (Containing 95% of all data)
-    CI = np.percentile(bootstrap_measures, CI_RANGE)
-    return SE, CI
+    results = []
+    for task_id in range(len(tasks)):
+        bootstrap_measures = np.concatenate([
+            measures for (block_task_id, *_), measures in zip(blocks, blocks_measures)
+            if block_task_id == task_id
+        ])
+        SE = np.std(bootstrap_measures) # Standard Error on Measure (mean, median, ...)
+        # Compute the 2.5th and 97.5th percentiles (Containing 95% of all data)
+        CI = np.percentile(bootstrap_measures, CI_RANGE)
+        results.append((SE, CI))
+    return results
+
+def bootstrap_block(
+        arr: np.ndarray, measure_function: Callable,
+        n_repeats: int, seed_sequence: np.random.SeedSequence,
+        max_memory_bytes: int=MAX_MEMORY_BYTES, vectorized: bool=True,
+    ) -> np.ndarray:
+    """Returns the array of the <n_repeats> bootstrap measures of <measure_function> on <arr> from the random stream of <seed_sequence>."""
+    arr = np.asarray(arr)
+    assert arr.ndim == 1, f"ERROR in bootstrap_block(): arr should be 1-dimensional (ndim={arr.ndim})."
+    assert len(arr) > 0, f"ERROR in bootstrap_block(): arr should not be empty."
+    rng = np.random.default_rng(seed_sequence)
+    bootstrap_measures = np.empty(n_repeats, dtype=float)
+    for block_start, samples in iter_bootstrap_samples(arr, n_repeats, rng, max_memory_bytes=max_memory_bytes):
+        block_end = block_start + len(samples)
+        if vectorized:
+            bootstrap_measures[block_start:block_end] = measure_function(samples, axis=1)
+        else:
+            bootstrap_measures[block_start:block_end] = [measure_function(sample) for sample in samples]
+    return bootstrap_measures
+
+# Workers of the blocks pool: the tasks (arrays and measures) are sent once by worker
+WORKER_TASKS: List[Tuple[np.ndarray, Callable]] = []
+
+def init_bootstrap_worker(tasks: List[Tuple[np.ndarray, Callable]]) -> None:
+    WORKER_TASKS[:] = tasks
+
+def bootstrap_block_task(block: Tuple[int, int, np.random.SeedSequence, int, bool]) -> np.ndarray:
+    task_id, *block_args = block
+    return bootstrap_block(*WORKER_TASKS[task_id], *block_args)
+
+# Dependencies -----------------------------------------------------------------
+def get_seed_sequence(seed: Union[None, int, np.random.SeedSequence]=None) -> np.random.SeedSequence:
+    """Root SeedSequence of a bootstrap run (seed=None: fresh entropy, not reproducible)."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+def get_chunk_size(n: int, itemsize: int, n_repeats: int, max_memory_bytes: int=MAX_MEMORY_BYTES) -> int:
+    """Number of resamples by chunk such that the indices and the samples matrices of a chunk fit in <max_memory_bytes>."""
+    bytes_by_resample = n * (np.dtype(np.intp).itemsize + itemsize)
+    return int(max(1, min(n_repeats, max_memory_bytes // bytes_by_resample)))
+
+def iter_bootstrap_samples(
+        arr: np.ndarray, n_repeats: int, rng: np.random.Generator,
+        max_memory_bytes: int=MAX_MEMORY_BYTES,
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield chunks (chunk_start, samples) of resamples with replacement from <arr>.
+        * samples is a 2D matrix of shape (chunk_size, len(arr)): one resample by row.
+    """
+    n = len(arr)
+    chunk_size = get_chunk_size(n, arr.itemsize, n_repeats, max_memory_bytes)
+    for chunk_start in range(0, n_repeats, chunk_size):
+        current_chunk_size = min(chunk_size, n_repeats - chunk_start)
+        indices = rng.integers(0, n, size=(current_chunk_size, n))
+        yield chunk_start, arr[indices]
@@ -0,0 +1,113 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import pickle
+import hashlib
+from typing import Any, Callable, List, Union
+import numpy as np
+
+# Constants --------------------------------------------------------------------
+CACHE_DIR = "./.cache/"                                # Directory of the build cache (can be deleted at any time)
+CACHE_VERSION = 1                                      # Increase to invalidate all entries of the cache
+HASH_CHUNK_SIZE = 1024**2                              # Bytes read at once when hashing files
+
+# Main -------------------------------------------------------------------------
+class BuildCache:
+    """
+    Build cache: each entry (namespace, name) stores a value with the key it was computed from.
+        * A key is a content hash of the inputs (files, constants, arrays): see get_key().
+        * An entry is valid only when its stored key equals the current key (otherwise it is recomputed and overwritten).
+        * enabled=False: nothing is read or written (everything is recomputed).
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, cache_dir: str=CACHE_DIR, enabled: bool=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    def __str__(self) -> str:
+        return f"BuildCache('{self.cache_dir}', enabled={self.enabled})"
+
+    # Methods ------------------------------------------------------------------
+    def get_path(self, namespace: str, name: str) -> str:
+        return os.path.join(self.cache_dir, namespace, f"{name}.pkl")
+
+    def load(self, namespace: str, name: str, key: str) -> Union[None, Any]:
+        """Value of the entry if it exists and was computed with key (None otherwise)."""
+        if not self.enabled:
+            return None
+        path = self.get_path(namespace, name)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as fs:
+                entry = pickle.load(fs)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None # Corrupted or outdated entry: recompute it
+        if entry.get("key") != key:
+            return None
+        return entry["value"]
+
+    def save(self, namespace: str, name: str, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        path = self.get_path(namespace, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fs:
+            pickle.dump({"key": key, "value": value}, fs, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path) # Atomic: concurrent workers never read a partial entry
+
+    def get_or_compute(self, namespace: str, name: str, key: str, compute_function: Callable[[], Any]) -> Any:
+        """Value of the entry if it is valid for key, else compute it with compute_function() and save it."""
+        value = self.load(namespace, name, key)
+        if value is None:
+            value = compute_function()
+            self.save(namespace, name, key, value)
+        return value
+
+    def is_up_to_date(self, namespace: str, name: str, key: str) -> bool:
+        """For file outputs (ex: figures): the entry stores the list of output paths, it is up to date if they all exist."""
+        outputs = self.load(namespace, name, key)
+        return outputs is not None and all(os.path.isfile(path) for path in outputs)
+
+    def set_up_to_date(self, namespace: str, name: str, key: str, outputs: List[str]) -> None:
+        self.save(namespace, name, key, list(outputs))
+
+
+# Dependencies -----------------------------------------------------------------
+def get_key(input_paths: List[str]=[], **params) -> str:
+    """Content hash of the input files (content, not path or mtime) and of the params (constants, arrays, ...)."""
+    h = hashlib.sha256()
+    h.update(f"version={CACHE_VERSION}".encode())
+    for path in input_paths:
+        h.update(hash_file(path).encode())
+    for param_name in sorted(params):
+        h.update(param_name.encode())
+        update_hash(h, params[param_name])
+    return h.hexdigest()
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fs:
+        for chunk in iter(lambda: fs.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def update_hash(h: "hashlib._Hash", value: Any) -> None:
+    """Update the hash with a value (arrays are hashed by dtype, shape and content, containers recursively)."""
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        h.update(f"ndarray:{value.dtype.str}:{value.shape}".encode())
+        h.update(value.tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}:{len(value)}".encode())
+        for v in value:
+            update_hash(h, v)
+    elif isinstance(value, dict):
+        h.update(f"dict:{len(value)}".encode())
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode())
+            update_hash(h, value[k])
+    else:
+        h.update(f"{type(value).__name__}:{value!r}".encode())
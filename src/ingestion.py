@@ -0,0 +1,88 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+from typing import Dict, List, Tuple
+import numpy as np
+from src.ActivityTable import ActivityTable
+from src.parsed_cache import load_video
+
+# Constants --------------------------------------------------------------------
+ACTIVITY_SUFFIX = "_Activity.csv"
+PREDATOR_SUFFIX = "_Predator.csv"
+
+# Main -------------------------------------------------------------------------
+def discover_videos(data_dir: str) -> List[str]:
+    """Names of the videos of data_dir: every NAME with both '<NAME>_Activity.csv' and '<NAME>_Predator.csv' (sorted)."""
+    assert os.path.isdir(data_dir), f"ERROR in discover_videos(): data_dir='{data_dir}' does not exists."
+    files = set(os.listdir(data_dir))
+    names = sorted([file[:-len(ACTIVITY_SUFFIX)] for file in files if file.endswith(ACTIVITY_SUFFIX)])
+    for name in names:
+        if f"{name}{PREDATOR_SUFFIX}" not in files:
+            print(f"WARNING in discover_videos(): '{name}{ACTIVITY_SUFFIX}' has no '{name}{PREDATOR_SUFFIX}' in '{data_dir}', video is skipped.")
+    return [name for name in names if f"{name}{PREDATOR_SUFFIX}" in files]
+
+def ingest_videos(
+        names: List[str], data_dir: str, cameras: List[str], incomplete_duration_thr: int,
+        use_cache: bool=True, n_workers: int=1, columnar_csv: bool=False,
+    ) -> List[Dict[str, ActivityTable]]:
+    """
+    Tables of each video of names (in the same order), see read_video_tables().
+        * Videos are spread over a pool of <n_workers> processes (n_workers=1: no pool).
+    """
+    tasks = [(NAME, data_dir, cameras, incomplete_duration_thr, use_cache, columnar_csv) for NAME in names]
+    if n_workers <= 1 or len(tasks) <= 1:
+        return [read_video_tables_task(task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor # Lazy import: multiprocessing is only loaded when a pool is used
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+        return list(executor.map(read_video_tables_task, tasks))
+
+def read_video_tables(
+        NAME: str, data_dir: str, cameras: List[str], incomplete_duration_thr: int,
+        use_cache: bool=True, columnar_csv: bool=False,
+    ) -> Dict[str, ActivityTable]:
+    """
+    Tables of the activities, predators, complete activities and merged activities of video NAME.
+        * The text files of the video are parsed once (or loaded from the parsed cache), the other tables are derived from them.
+        * columnar_csv: parse the text files through ColumnarCSV objects (see load_video()).
+    """
+    activities_table, predators_table = load_video(NAME, data_dir, use_cache=use_cache, columnar_csv=columnar_csv)
+    complete_activities_table = activities_table.select(get_complete_ids(activities_table, cameras, incomplete_duration_thr))
+    return {
+        "activities": activities_table,
+        "predators": predators_table,
+        "complete_activities": complete_activities_table,
+        "merged_activities": get_merged_table(complete_activities_table),
+    }
+
+# Dependencies -----------------------------------------------------------------
+def read_video_tables_task(task: Tuple[str, str, List[str], int, bool, bool]) -> Dict[str, ActivityTable]:
+    return read_video_tables(*task)
+
+def get_complete_ids(table: ActivityTable, cameras: List[str], incomplete_duration_thr: int) -> np.ndarray:
+    """
+    Ids of the complete activities of a video table, cam by cam (in the order of cameras).
+        * An activity is cutted by the video if it is the first or the last of its cam, or if it is not contiguous with the previous or next one.
+        * Cutted activities that last at most incomplete_duration_thr minutes are skipped.
+    """
+    durations = table.durations_minutes("all")
+    complete_ids = []
+    for cam in cameras:
+        cam_ids = np.flatnonzero(table.mask(cam=cam)) if cam in table.cams_labels else np.zeros(0, dtype=np.int64)
+        starts, ends = table.starts[cam_ids], table.ends[cam_ids]
+        is_cutted = np.ones(len(cam_ids), dtype=bool)
+        is_cutted[1:-1] = (starts[1:-1] != ends[:-2]) | (ends[1:-1] != starts[2:])
+        complete_ids.append(cam_ids[~is_cutted | (durations[cam_ids] > incomplete_duration_thr)])
+    return np.concatenate([np.zeros(0, dtype=np.int64)] + complete_ids)
+
+def get_merged_table(table: ActivityTable) -> ActivityTable:
+    """Each activity that follows (without gap) the previous one of the same video, cam and grouped activity starts at the start of the previous one."""
+    previous_ids = np.roll(np.arange(len(table)), 1)
+    is_merged = (
+        (table.videos[previous_ids] == table.videos) & (table.cams[previous_ids] == table.cams)
+        & (table.groupped[previous_ids] == table.groupped) & (table.ends[previous_ids] == table.starts)
+    )
+    return ActivityTable(
+        np.where(is_merged, table.starts[previous_ids], table.starts), table.ends,
+        table.types, table.cams, table.videos,
+        table.types_labels, table.cams_labels, table.videos_labels,
+    )
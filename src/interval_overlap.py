@@ -0,0 +1,206 @@
+
+# Imports ----------------------------------------------------------------------
+from typing import Dict, Hashable, List, Tuple
+import numpy as np
+
+
+# Main -------------------------------------------------------------------------
+class SortedIntervals:
+    """
+    Intervals [start, end[ sorted by start for sweep-line queries in O(log n).
+        * max_ends[i]: maximum end of the intervals 0..i (sorted by start) -> is a point contained in any interval.
+        * union of the intervals as disjoint sorted intervals with cumulated lengths -> overlap durations with the union.
+        * max_ends is sorted: the intervals that can overlap a query [start, end[ are a contiguous range of the sorted intervals
+          -> stabbing and range queries that report the matching intervals, vectorized over all the queries.
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        assert len(starts) == len(ends), f"ERROR in SortedIntervals(): length of starts ({len(starts)}) != length of ends ({len(ends)})."
+
+        # Sort by start
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+
+        # Running maximum of ends (and the interval that reaches it)
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self) > 0 else self.ends
+        ids = np.arange(len(self))
+        self.max_ends_ids = np.maximum.accumulate(np.where(self.ends == self.max_ends, ids, -1)) if len(self) > 0 else ids
+
+        # Union of intervals (empty intervals are ignored)
+        is_valid = self.ends > self.starts
+        valid_starts, valid_ends = self.starts[is_valid], self.ends[is_valid]
+        if len(valid_starts) > 0:
+            previous_max_ends = np.concatenate([[valid_starts[0]], np.maximum.accumulate(valid_ends)[:-1]])
+            is_new_block = np.concatenate([[True], valid_starts[1:] > previous_max_ends[1:]])
+            self.union_starts = valid_starts[is_new_block]
+            self.union_ends = np.maximum.reduceat(valid_ends, np.flatnonzero(is_new_block))
+        else:
+            self.union_starts, self.union_ends = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self.union_cumulated_lengths = np.concatenate([[0], np.cumsum(self.union_ends - self.union_starts)])
+
+    # Basic properties ---------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __str__(self) -> str:
+        return f"SortedIntervals(n={len(self)}, union={len(self.union_starts)})"
+
+    # Methods ------------------------------------------------------------------
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """For each point, is it contained in at least one interval (start <= point < end)."""
+        return self.containing(points) >= 0
+
+    def containing(self, points: np.ndarray) -> np.ndarray:
+        """For each point, index (in the input order) of an interval that contains it (-1 if none)."""
+        points = np.asarray(points, dtype=np.int64)
+        if len(self) == 0:
+            return np.full(len(points), -1, dtype=np.int64)
+        last_started = np.searchsorted(self.starts, points, side="right") - 1
+        last_started_clipped = np.maximum(last_started, 0)
+        is_contained = (last_started >= 0) & (self.max_ends[last_started_clipped] > points)
+        return np.where(is_contained, self.order[self.max_ends_ids[last_started_clipped]], -1)
+
+    def count_containing(self, points: np.ndarray) -> np.ndarray:
+        """For each point t, number of (non-empty) intervals that contain it: #(start <= t) - #(end <= t)."""
+        points = np.asarray(points, dtype=np.int64)
+        is_valid = self.ends > self.starts
+        n_started = np.searchsorted(self.starts[is_valid], points, side="right")
+        n_ended = np.searchsorted(np.sort(self.ends[is_valid]), points, side="right")
+        return n_started - n_ended
+
+    def overlapping(self, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Range queries: (query ids, interval ids in the input order) of each (query [start, end[, interval) that overlap,
+        sorted by query then by interval start (empty intervals and empty queries never overlap).
+            * Candidates of a query: sorted intervals from the first one whose running max end is > start to the last one that starts before end
+              (exactly the overlapping intervals when intervals are not nested, ex: the activities of a (video, cam)).
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        first_candidates = np.searchsorted(self.max_ends, starts, side="right")
+        n_candidates = np.maximum(np.searchsorted(self.starts, ends, side="left") - first_candidates, 0) * (ends > starts)
+        query_ids = np.repeat(np.arange(len(starts), dtype=np.int64), n_candidates)
+        candidates = get_ragged_ranges(first_candidates, n_candidates)
+        is_overlapping = (self.ends[candidates] > starts[query_ids]) & (self.ends[candidates] > self.starts[candidates])
+        return query_ids[is_overlapping], self.order[candidates[is_overlapping]]
+
+    def stabbing(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Stabbing queries: (point ids, interval ids in the input order) of each (point, interval) where the interval contains the point."""
+        points = np.asarray(points, dtype=np.int64)
+        return self.overlapping(points, points + 1)
+
+    def covered_before(self, points: np.ndarray) -> np.ndarray:
+        """For each point t, length of the union of the intervals that lies before t."""
+        points = np.asarray(points, dtype=np.int64)
+        block = np.searchsorted(self.union_starts, points, side="right") - 1
+        block_clipped = np.maximum(block, 0)
+        if len(self.union_starts) == 0:
+            return np.zeros(len(points), dtype=np.int64)
+        in_block = np.minimum(points, self.union_ends[block_clipped]) - self.union_starts[block_clipped]
+        return np.where(block >= 0, self.union_cumulated_lengths[block_clipped] + in_block, 0)
+
+    def overlap(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """For each query interval [start, end[, length of its overlap with the union of the intervals (0 if end <= start)."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        return np.maximum(self.covered_before(ends) - self.covered_before(starts), 0) * (ends > starts)
+
+
+class KeyedIntervals:
+    """
+    One SortedIntervals by key (ex: (video, cam)): queries only match intervals with the same key.
+        * Build in O(n log n), queries in O(log n) by query.
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, keys: List[Hashable]):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        assert len(keys) == len(starts), f"ERROR in KeyedIntervals(): length of keys ({len(keys)}) != number of intervals ({len(starts)})."
+        self.ids_by_key = group_ids_by_key(keys)
+        self.intervals_by_key = {
+            key: SortedIntervals(starts[ids], ends[ids])
+            for key, ids in self.ids_by_key.items()
+        }
+
+    @classmethod
+    def from_table(cls, table: "ActivityTable") -> "KeyedIntervals":
+        """KeyedIntervals of the activities of an ActivityTable keyed by (video, cam)."""
+        return cls(table.starts, table.ends, get_video_cam_keys(table))
+
+    # Basic properties ---------------------------------------------------------
+    def __len__(self) -> int:
+        return sum(len(intervals) for intervals in self.intervals_by_key.values())
+
+    def __str__(self) -> str:
+        return f"KeyedIntervals(n={len(self)}, keys={len(self.intervals_by_key)})"
+
+    # Methods ------------------------------------------------------------------
+    def containing(self, points: np.ndarray, keys: List[Hashable]) -> np.ndarray:
+        """For each (point, key), index (in the input order) of an interval with the same key that contains it (-1 if none)."""
+        points = np.asarray(points, dtype=np.int64)
+        result = np.full(len(points), -1, dtype=np.int64)
+        for key, query_ids in group_ids_by_key(keys).items():
+            if key not in self.intervals_by_key: continue
+            local_ids = self.intervals_by_key[key].containing(points[query_ids])
+            result[query_ids] = np.where(local_ids >= 0, self.ids_by_key[key][np.maximum(local_ids, 0)], -1)
+        return result
+
+    def contains(self, points: np.ndarray, keys: List[Hashable]) -> np.ndarray:
+        """For each (point, key), is it contained in at least one interval with the same key."""
+        return self.containing(points, keys) >= 0
+
+    def overlap(self, starts: np.ndarray, ends: np.ndarray, keys: List[Hashable]) -> np.ndarray:
+        """For each query ([start, end[, key), length of its overlap with the union of the intervals with the same key."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        result = np.zeros(len(starts), dtype=np.int64)
+        for key, query_ids in group_ids_by_key(keys).items():
+            if key not in self.intervals_by_key: continue
+            result[query_ids] = self.intervals_by_key[key].overlap(starts[query_ids], ends[query_ids])
+        return result
+
+    def overlapping(self, starts: np.ndarray, ends: np.ndarray, keys: List[Hashable]) -> Tuple[np.ndarray, np.ndarray]:
+        """Range queries on the intervals with the same key: (query ids, interval ids in the input order), sorted by query (see SortedIntervals.overlapping())."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        query_ids_list, interval_ids_list = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for key, query_ids in group_ids_by_key(keys).items():
+            if key not in self.intervals_by_key: continue
+            local_query_ids, local_interval_ids = self.intervals_by_key[key].overlapping(starts[query_ids], ends[query_ids])
+            query_ids_list.append(query_ids[local_query_ids])
+            interval_ids_list.append(self.ids_by_key[key][local_interval_ids])
+        query_ids, interval_ids = np.concatenate(query_ids_list), np.concatenate(interval_ids_list)
+        order = np.argsort(query_ids, kind="stable")
+        return query_ids[order], interval_ids[order]
+
+    def stabbing(self, points: np.ndarray, keys: List[Hashable]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stabbing queries on the intervals with the same key: (point ids, interval ids in the input order) of each match."""
+        points = np.asarray(points, dtype=np.int64)
+        return self.overlapping(points, points + 1, keys)
+
+
+# Dependencies -----------------------------------------------------------------
+def get_ragged_ranges(firsts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenation of the ranges [first, first + length[ (vectorized)."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum(), dtype=np.int64) - np.repeat(offsets - np.asarray(firsts, dtype=np.int64), lengths)
+
+def group_ids_by_key(keys: List[Hashable]) -> Dict[Hashable, np.ndarray]:
+    """Map {key -> array of the indices of this key}."""
+    ids_by_key = {}
+    for i, key in enumerate(keys):
+        ids_by_key.setdefault(key, []).append(i)
+    return {key: np.array(ids, dtype=np.int64) for key, ids in ids_by_key.items()}
+
+def get_video_cam_keys(table: "ActivityTable") -> List[Tuple[str, str]]:
+    """(video, cam) key of each activity of an ActivityTable (or PredatorTable)."""
+    return [
+        (table.videos_labels[v], table.cams_labels[c])
+        for v, c in zip(table.videos.tolist(), table.cams.tolist())
+    ]
@@ -0,0 +1,112 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import inspect
+import zipfile
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from src.CSV import CSV, ColumnarCSV
+from src.Activity import REFERENCE_DATETIME, HOURS_BY_LINE, add_dayshifts, Activity
+from src.ActivityTable import ActivityTable, PredatorTable
+from src.build_cache import CACHE_DIR, get_key, hash_file
+from src.profiling import count, stage
+
+# Constants --------------------------------------------------------------------
+PARSED_CACHE_DIR = os.path.join(CACHE_DIR, "parsed")   # Directory of the parsed annotations (one .npz file by video)
+COLUMNAR_CSV = False                                   # Parse the text files in a ColumnarCSV (one typed array by column) instead of one :dict by entry
+
+# Main -------------------------------------------------------------------------
+def load_video(NAME: str, data_dir: str, use_cache: bool=True, cache_dir: str=PARSED_CACHE_DIR, columnar_csv: bool=COLUMNAR_CSV) -> Tuple[ActivityTable, PredatorTable]:
+    """
+    Activities and predators of video NAME (files '<NAME>_Activity.csv' and '<NAME>_Predator.csv' of data_dir).
+        * The text files are parsed once and their tables (integer seconds, categorical codes, attacks offsets) are saved in '<cache_dir>/<NAME>.npz'.
+        * The .npz file is used while the size and mtime of the text files did not change (or, if they changed, while their content hash did not change).
+        * The .npz file is also invalidated when the parsing code or REFERENCE_DATETIME / HOURS_BY_LINE change.
+        * columnar_csv: parse the text files in ColumnarCSV objects (same tables, a fraction of the memory for large files).
+    """
+    sources = get_sources_paths(NAME, data_dir)
+    if not use_cache:
+        return parse_video(NAME, data_dir, columnar_csv)
+    count("videos_loaded")
+
+    # Load from cache
+    cache_path = os.path.join(cache_dir, f"{NAME}.npz")
+    parser_key = get_parser_key()
+    signatures = get_sources_signatures(sources)
+    arrays = load_arrays(cache_path)
+    if arrays is not None and str(arrays.get("parser_key")) == parser_key:
+        if np.array_equal(arrays["sources_signatures"], signatures):
+            count("videos_loaded_from_cache")
+            return get_tables(arrays)
+        if arrays["sources_hashes"].tolist() == [hash_file(path) for path in sources]: # Touched but not modified
+            arrays["sources_signatures"] = signatures
+            save_arrays(cache_path, arrays)
+            return get_tables(arrays)
+
+    # Parse text files and save in cache
+    activities_table, predators_table = parse_video(NAME, data_dir, columnar_csv)
+    arrays = {
+        **activities_table.to_arrays("activities_"), **predators_table.to_arrays("predators_"),
+        "parser_key": np.array(parser_key), "sources_signatures": signatures,
+        "sources_hashes": np.array([hash_file(path) for path in sources], dtype=str),
+    }
+    save_arrays(cache_path, arrays)
+    return activities_table, predators_table
+
+def parse_video(NAME: str, data_dir: str, columnar_csv: bool=COLUMNAR_CSV) -> Tuple[ActivityTable, PredatorTable]:
+    """Parse the text files of video NAME in tables (without cache), through ColumnarCSV objects if columnar_csv is set."""
+    activities_path, predators_path = get_sources_paths(NAME, data_dir)
+    csv_class = ColumnarCSV if columnar_csv else CSV
+    with stage("csv_read"):
+        activities_data = csv_class().read(activities_path)
+        predators_data = csv_class().read(predators_path)
+    count("csv_rows_parsed", len(activities_data) + len(predators_data))
+    with stage("add_dayshifts"):
+        add_dayshifts(activities_data)
+        add_dayshifts(predators_data)
+    with stage("parse_tables"):
+        return (
+            ActivityTable.parse_activities(activities_data, NAME),
+            PredatorTable.parse_predators(predators_data, NAME),
+        )
+
+# Dependencies -----------------------------------------------------------------
+def get_sources_paths(NAME: str, data_dir: str) -> List[str]:
+    return [os.path.join(data_dir, f"{NAME}_Activity.csv"), os.path.join(data_dir, f"{NAME}_Predator.csv")]
+
+def get_sources_signatures(sources: List[str]) -> np.ndarray:
+    """(size, mtime in ns) of each source file."""
+    signatures = []
+    for path in sources:
+        stat = os.stat(path)
+        signatures.append([stat.st_size, stat.st_mtime_ns])
+    return np.array(signatures, dtype=np.int64)
+
+@lru_cache(maxsize=1)
+def get_parser_key() -> str:
+    """Key of the parsing code and constants (the .npz files are outdated when it changes), computed once by process."""
+    parser_modules = [CSV, Activity, ActivityTable, load_video]
+    return get_key(
+        [inspect.getsourcefile(obj) for obj in parser_modules],
+        reference_datetime=REFERENCE_DATETIME, hours_by_line=HOURS_BY_LINE,
+    )
+
+def get_tables(arrays: Dict[str, np.ndarray]) -> Tuple[ActivityTable, PredatorTable]:
+    return ActivityTable.from_arrays(arrays, "activities_"), PredatorTable.from_arrays(arrays, "predators_")
+
+def load_arrays(path: str) -> Union[None, Dict[str, np.ndarray]]:
+    """Arrays of a .npz file (None if it does not exist or is corrupted)."""
+    if not os.path.isfile(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            return {name: npz[name] for name in npz.files}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+def save_arrays(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path) # Atomic: concurrent workers never read a partial file
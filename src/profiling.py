@@ -0,0 +1,187 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import io
+import json
+import time
+import signal
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Union
+from src.CSV import CSV
+
+# Constants --------------------------------------------------------------------
+PROFILE_MODES = [None, "cprofile", "sampling"]         # Optional capture of the functions (None: only stages and counters)
+SAMPLING_INTERVAL = 0.005                              # Seconds of CPU time between two samples (mode 'sampling')
+N_TOP_FUNCTIONS = 30                                   # Number of functions in the report (modes 'cprofile' and 'sampling')
+
+# Main -------------------------------------------------------------------------
+class Profiler:
+    """
+    Instrumentation of a run: named stages (wall-clock time), counters and optional capture of the functions.
+        * Stages are nested with .stage(name) (name of a sub-stage: 'parent/name') or chained with .start(name) (flat scripts).
+        * Counters are incremented with .count(name, n) (ex: activities scanned, bootstrap replicates drawn).
+        * mode='cprofile': deterministic profile of all functions (slower), mode='sampling': CPU time samples of the running functions (Unix only).
+        * Stages and counters of worker processes are not collected (run with one worker to profile them).
+    """
+
+    # Constructor --------------------------------------------------------------
+    def __init__(self, enabled: bool=True, mode: Union[None, str]=None):
+        assert mode in PROFILE_MODES, f"ERROR in Profiler(): mode='{mode}' should be in {PROFILE_MODES}."
+        self.enabled = enabled
+        self.mode = mode if enabled else None
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.stack: List[str] = []
+        self.current_stage: Union[None, str] = None
+        self.current_stage_start = 0.0
+        self.start_time = time.perf_counter()
+        self.end_time: Union[None, float] = None
+        self.cprofile = None
+        self.samples: Dict[str, int] = {}
+        if self.mode == "cprofile":
+            import cProfile # Lazy imports of the profiling modes: only loaded when they are used
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        elif self.mode == "sampling":
+            signal.signal(signal.SIGPROF, self.sample)
+            signal.setitimer(signal.ITIMER_PROF, SAMPLING_INTERVAL, SAMPLING_INTERVAL)
+
+    def __str__(self) -> str:
+        return f"Profiler(mode={self.mode}, stages={len(self.stages)}, counters={len(self.counters)})"
+
+    # Stages and counters ------------------------------------------------------
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the block as the stage 'name' (nested in the current stage)."""
+        if not self.enabled:
+            yield
+            return
+        self.stack.append(name)
+        full_name = "/".join(self.stack)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(full_name, time.perf_counter() - t0)
+            self.stack.pop()
+
+    def start(self, name: str) -> None:
+        """End the current chained stage and start the stage 'name' (ends at the next .start() or at .stop())."""
+        if not self.enabled:
+            return
+        self.end_chained_stage()
+        self.current_stage = name
+        self.stack = [name]
+        self.current_stage_start = time.perf_counter()
+
+    def stop(self) -> None:
+        """End the current chained stage and the captures of the functions."""
+        if not self.enabled or self.end_time is not None:
+            return
+        self.end_chained_stage()
+        self.end_time = time.perf_counter()
+        if self.mode == "cprofile":
+            self.cprofile.disable()
+        elif self.mode == "sampling":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def count(self, name: str, n: int=1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    # Report -------------------------------------------------------------------
+    def get_report(self) -> dict:
+        self.stop()
+        total_seconds = self.end_time - self.start_time if self.enabled else 0.0
+        report = {
+            "total_seconds": total_seconds,
+            "stages": [
+                {"stage": name, "calls": int(stage["calls"]), "seconds": stage["seconds"], "ratio": stage["seconds"] / total_seconds if total_seconds > 0 else 0.0}
+                for name, stage in self.stages.items()
+            ],
+            "counters": dict(self.counters),
+            "mode": self.mode,
+        }
+        if self.mode == "cprofile":
+            report["functions"] = get_cprofile_functions(self.cprofile)
+        elif self.mode == "sampling":
+            n_samples = sum(self.samples.values())
+            report["functions"] = [
+                {"function": function, "samples": n, "ratio": n / n_samples}
+                for function, n in sorted(self.samples.items(), key=lambda item: -item[1])[:N_TOP_FUNCTIONS]
+            ]
+        return report
+
+    def write_report(self, output_dir: str, name: str="timing_report") -> List[str]:
+        """Save the report in '<output_dir>/<name>.json' (everything) and '<output_dir>/<name>.csv' (stages and counters), returns the paths."""
+        report = self.get_report()
+        json_path = os.path.join(output_dir, f"{name}.json")
+        with open(json_path, "w") as fs:
+            json.dump(report, fs, indent=1)
+        csv_path = os.path.join(output_dir, f"{name}.csv")
+        report_csv = CSV(["kind", "name", "calls", "seconds", "ratio"])
+        report_csv.add_entry({"kind": "total", "name": "total", "calls": 1, "seconds": f"{report['total_seconds']:.6f}", "ratio": "1.0000"})
+        for stage in report["stages"]:
+            report_csv.add_entry({"kind": "stage", "name": stage["stage"], "calls": stage["calls"], "seconds": f"{stage['seconds']:.6f}", "ratio": f"{stage['ratio']:.4f}"})
+        for counter_name, n in report["counters"].items():
+            report_csv.add_entry({"kind": "counter", "name": counter_name, "calls": n, "seconds": "", "ratio": ""})
+        report_csv.write(csv_path)
+        paths = [json_path, csv_path]
+        if self.mode == "cprofile":
+            paths.append(os.path.join(output_dir, f"{name}.prof"))
+            self.cprofile.dump_stats(paths[-1]) # Open with pstats or snakeviz
+        return paths
+
+    # Dependencies -------------------------------------------------------------
+    def add_time(self, name: str, seconds: float) -> None:
+        stage = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+        stage["calls"] += 1
+        stage["seconds"] += seconds
+
+    def end_chained_stage(self) -> None:
+        if self.current_stage is not None:
+            self.add_time(self.current_stage, time.perf_counter() - self.current_stage_start)
+            self.current_stage = None
+            self.stack = []
+
+    def sample(self, signum: int, frame) -> None:
+        if frame is None:
+            return
+        function = f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}"
+        self.samples[function] = self.samples.get(function, 0) + 1
+
+
+# Global profiler --------------------------------------------------------------
+# Modules report their stages and counters to the active profiler (disabled until a script calls enable_profiler())
+PROFILER = Profiler(enabled=False)
+
+def enable_profiler(mode: Union[None, str]=None) -> Profiler:
+    global PROFILER
+    PROFILER = Profiler(enabled=True, mode=mode)
+    return PROFILER
+
+def get_profiler() -> Profiler:
+    return PROFILER
+
+def stage(name: str):
+    """Stage of the active profiler (see Profiler.stage())."""
+    return PROFILER.stage(name)
+
+def count(name: str, n: int=1) -> None:
+    """Counter of the active profiler (see Profiler.count())."""
+    if PROFILER.enabled:
+        PROFILER.count(name, n)
+
+# Dependencies -----------------------------------------------------------------
+def get_cprofile_functions(profile: "cProfile.Profile") -> List[dict]:
+    """Top N_TOP_FUNCTIONS functions by cumulative time of a cProfile profile."""
+    import pstats
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    functions = []
+    for (filename, lineno, function_name), (_, n_calls, total_time, cumulative_time, _) in stats.stats.items():
+        functions.append({
+            "function": f"{os.path.basename(filename)}:{lineno}:{function_name}",
+            "calls": n_calls, "total_seconds": total_time, "cumulative_seconds": cumulative_time,
+        })
+    return sorted(functions, key=lambda f: -f["cumulative_seconds"])[:N_TOP_FUNCTIONS]
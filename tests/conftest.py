@@ -0,0 +1,22 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import sys
+import pytest
+
+# Constants --------------------------------------------------------------------
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR) # Modules are imported as 'src.<module>' and scripts as top-level modules
+os.chdir(REPO_DIR) # Scripts read their default directories ('./data/', ...) when they are imported
+SYNTHETIC_SCALE = 3                                    # Synthetic dataset of 3 times the number of videos of the shipped data (12 videos)
+SYNTHETIC_N_DAYS = 3
+
+# Fixtures ---------------------------------------------------------------------
+@pytest.fixture(scope="session")
+def synthetic_data(tmp_path_factory):
+    """(data_dir, names) of a synthetic dataset written once by test session."""
+    from benchmarks.synthetic_data import generate_dataset
+    data_dir = str(tmp_path_factory.mktemp("synthetic_data"))
+    names = generate_dataset(data_dir, scale=SYNTHETIC_SCALE, n_days=SYNTHETIC_N_DAYS, seed=0)
+    return data_dir, names
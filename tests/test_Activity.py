@@ -0,0 +1,86 @@
+
+# Imports ----------------------------------------------------------------------
+import numpy as np
+import pytest
+from src.CSV import CSV
+from src.Activity import SECONDS_BY_DAY, SECONDS_BY_LINE, REFERENCE_SECONDS_IN_DAY
+from src.Activity import add_dayshifts, get_durations_minutes, get_durations_minutes_array, get_seconds
+from src.Activity import parse_attacks_array, parse_datetime, parse_dayshifts_array, parse_seconds_array, Activity, Predator
+
+# Constants --------------------------------------------------------------------
+VALID_TIMES = ["00:00:00", "06:30:00", "23:59:59", "1:2:3", "01:02:3", " 01:02:03", "01:02:03 ", "\t7:05:09 "]
+INVALID_TIMES = ["", "24:00:00", "12:60:00", "12:00:60", "001:02:03", "1:02", "01:02:03:04", "+1:02:03", "1_0:00:00", "01 :02:03", "ab:cd:ef", "-1:00:00"]
+
+# Tests: times -----------------------------------------------------------------
+@pytest.mark.parametrize("time_str", VALID_TIMES)
+def test_parse_seconds_array_matches_parse_datetime(time_str):
+    for dayshift in [0, 1, 45]: # 45: past the end of the month of REFERENCE_DATETIME
+        expected = get_seconds(parse_datetime(time_str, dayshift))
+        assert parse_seconds_array([time_str], dayshift).tolist() == [expected]
+        assert parse_seconds_array(["12:00:00", time_str, "13:00:00"], dayshift)[1] == expected # Fast and slow paths in one batch
+
+@pytest.mark.parametrize("time_str", INVALID_TIMES)
+def test_time_parsers_reject_the_same_values(time_str):
+    with pytest.raises(ValueError):
+        parse_datetime(time_str)
+    with pytest.raises(ValueError):
+        parse_seconds_array([time_str])
+
+def test_parse_seconds_array_reports_entries_numbers():
+    with pytest.raises(ValueError, match="2 malformed 'start' values .* entries 2: '25:00:00', 4: 'x'"):
+        parse_seconds_array(["01:00:00", "25:00:00", "02:00:00", "x"], column_name="start")
+
+def test_parse_seconds_array_values():
+    seconds = parse_seconds_array(["06:30:00", "06:29:59", "18:30:00"], [0, 1, 2])
+    assert seconds.tolist() == [0, SECONDS_BY_DAY - 1, 2 * SECONDS_BY_DAY + SECONDS_BY_LINE]
+    assert parse_seconds_array([], []).tolist() == []
+
+# Tests: dayshifts and attacks -------------------------------------------------
+def test_parse_dayshifts_array():
+    starts, ends = parse_dayshifts_array(["1", "1/2", " 3 ", "10/11"])
+    assert starts.tolist() == [0, 0, 2, 9]
+    assert ends.tolist() == [0, 1, 2, 10]
+    with pytest.raises(ValueError, match="entries 2: '1/'"):
+        parse_dayshifts_array(["1", "1/", "2"])
+
+def test_parse_attacks_array_rollover():
+    attacks_str = np.array([
+        ["23:50:00", "23:59:59", "00:00:10", "00:05:00"], # Rollover between the 2nd and the 3rd attack
+        ["00:10:00", "", "12:00:00", ""], # Attacks stop at the first empty value
+        ["", "", "", ""],
+        ["08:00:00", "07:00:00", "06:00:00", "09:00:00"], # Two rollovers
+    ])
+    starts_str = ["23:45:00", "23:00:00", "10:00:00", "08:00:00"]
+    dayshifts_start = [0, 4, 1, 0]
+    offsets, seconds = parse_attacks_array(attacks_str, starts_str, dayshifts_start)
+    assert offsets.tolist() == [0, 4, 5, 5, 9]
+    expected = parse_seconds_array(
+        ["23:50:00", "23:59:59", "00:00:10", "00:05:00", "00:10:00", "08:00:00", "07:00:00", "06:00:00", "09:00:00"],
+        [0, 0, 1, 1, 5, 0, 1, 2, 2],
+    )
+    assert seconds.tolist() == expected.tolist()
+
+def test_parse_predator_matches_parse_predators():
+    predators = CSV(["day", "start", "end", "predator", "attack1", "attack2", "attack3", "cam"])
+    predators.add_entry({"day": "1/2", "start": "23:55:00", "end": "00:10:00", "predator": "Opiliones", "attack1": "23:58:00", "attack2": "00:01:00", "attack3": "", "cam": "cam_inf"})
+    predators.add_entry({"day": "2", "start": "10:00:00", "end": "10:05:00", "predator": "Reduviidae", "attack1": "", "attack2": "", "attack3": "", "cam": "cam_sup"})
+    add_dayshifts(predators)
+    from_table = Predator.parse_predators(predators, "N1_video1")
+    from_entries = [Predator.parse_predator(entry, "N1_video1") for entry in predators]
+    assert [str(p) for p in from_table] == [str(p) for p in from_entries]
+    assert from_table[0].attacks_seconds == tuple(parse_seconds_array(["23:58:00", "00:01:00"], [0, 1]).tolist())
+    assert from_table[1].attacks_seconds == ()
+
+# Tests: durations -------------------------------------------------------------
+def test_durations_minutes_array_matches_scalar_and_segments():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(-REFERENCE_SECONDS_IN_DAY, 5 * SECONDS_BY_DAY, 2000)
+    ends = starts + rng.integers(-600, 3 * SECONDS_BY_DAY, 2000)
+    durations = get_durations_minutes_array(starts, ends)
+    for start, end, duration in zip(starts.tolist(), ends.tolist(), durations.tolist()):
+        assert tuple(duration) == get_durations_minutes(start, end)
+    for start, end, duration in zip(starts.tolist(), ends.tolist(), durations.tolist()):
+        if end < start: continue
+        activity = Activity(start, end, "resting", "cam_inf")
+        segments_minutes = [int((x1 - x0) / 60) for (x0, _), (x1, _) in activity.get_coords()]
+        assert duration[0] == sum(segments_minutes)
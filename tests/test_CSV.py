@@ -0,0 +1,53 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import pytest
+from src.CSV import CSV, ColumnarCSV, Row
+
+# Constants --------------------------------------------------------------------
+DATA_PATHS = ["./data/N1_video1-2_Activity.csv", "./data/N2_video3-4-5-6-7_Predator.csv"]
+
+# Tests ------------------------------------------------------------------------
+@pytest.fixture(params=DATA_PATHS)
+def data_path(request):
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), request.param)
+
+def test_iter_read_matches_read(data_path):
+    csv = CSV().read(data_path)
+    assert list(CSV().iter_read(data_path)) == csv.entries
+    chunks = list(CSV().iter_read(data_path, chunk_size=7))
+    assert all(len(chunk) == 7 for chunk in chunks[:-1]) and 0 < len(chunks[-1]) <= 7
+    assert [entry for chunk in chunks for entry in chunk] == csv.entries
+    assert all(chunk.header() == csv.header() for chunk in chunks)
+
+def test_columnar_csv_matches_csv(data_path, tmp_path):
+    csv = CSV().read(data_path)
+    columnar = ColumnarCSV().read(data_path)
+    assert len(columnar) == len(csv) and columnar.header() == csv.header()
+    assert [row.to_dict() for row in columnar] == csv.entries
+    for column in csv.header():
+        assert columnar.get_col(column) == csv.get_col(column)
+        assert columnar.get_col(column, as_numpy=True).tolist() == csv.get_col(column, as_numpy=True).tolist()
+
+    # Same groups, filters and written files
+    keep = lambda entry: entry["cam"] == "cam_inf"
+    assert [row.to_dict() for row in columnar.copy().filter(keep)] == CSV().read(data_path).filter(keep).entries
+    csv.write(str(tmp_path / "csv.csv"))
+    columnar.write(str(tmp_path / "columnar.csv"))
+    assert (tmp_path / "csv.csv").read_text() == (tmp_path / "columnar.csv").read_text()
+
+def test_columnar_csv_typed_columns():
+    columnar = ColumnarCSV(["name", "n"])
+    columnar.add_entry({"name": "a", "n": 1})
+    columnar.add_entry({"name": "b", "n": 2})
+    assert columnar.get_col("n", as_numpy=True).dtype.kind == "i"
+    columnar[1]["n"] = "x" # Values that do not fit the column type are kept
+    assert columnar.get_col("n") == [1, "x"]
+
+def test_row_equality():
+    columnar = ColumnarCSV(["name", "n"])
+    columnar.add_entry({"name": "a", "n": 1})
+    row = columnar[0]
+    assert isinstance(row, Row) and row == {"name": "a", "n": 1} and {"name": "a", "n": 1} == row
+    assert row != {"name": "a", "n": 2}
+    assert row.__eq__(["name", "n"]) is NotImplemented and row != ["name", "n"]
@@ -0,0 +1,42 @@
+
+# Imports ----------------------------------------------------------------------
+import numpy as np
+from src.QuantileSketch import MAX_EXACT_CENTROIDS, QuantileSketch
+
+# Tests ------------------------------------------------------------------------
+def test_exact_sketch_matches_numpy():
+    values = np.random.default_rng(0).integers(0, 500, 3000)
+    sketch = QuantileSketch.from_values(values)
+    assert sketch.is_exact and sketch.count == len(values) and sketch.sum == int(values.sum())
+    assert sketch.mean() == np.mean(values)
+    for q in [0.0, 0.1, 0.25, 0.5, 0.9, 1.0]:
+        assert sketch.quantile(q) == np.quantile(values, q)
+
+def test_exact_merge_equals_sketch_of_union():
+    rng = np.random.default_rng(1)
+    parts = [rng.integers(0, 300, int(rng.integers(0, 200))) for _ in range(10)]
+    merged = QuantileSketch.merge([QuantileSketch.from_values(part) for part in parts])
+    values = np.concatenate(parts)
+    assert merged.is_exact and merged.count == len(values)
+    assert np.array_equal(merged.means, np.unique(values)) and merged.median() == np.median(values)
+
+def test_merge_past_the_exact_limit():
+    rng = np.random.default_rng(2)
+    parts = [rng.integers(0, 10 * MAX_EXACT_CENTROIDS, 20000) for _ in range(5)]
+    values = np.concatenate(parts)
+    merged = QuantileSketch.merge([QuantileSketch.from_values(part) for part in parts])
+    assert not merged.is_exact and len(merged.means) < MAX_EXACT_CENTROIDS
+
+    # Count, sum, min, max and mean stay exact, quantiles are approximate (small rank error)
+    assert merged.count == len(values) and merged.sum == int(values.sum())
+    assert merged.min == values.min() and merged.max == values.max() and merged.mean() == np.mean(values)
+    sorted_values = np.sort(values)
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        rank = np.searchsorted(sorted_values, merged.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.005
+
+def test_merge_of_empty_sketches():
+    empty = QuantileSketch()
+    assert QuantileSketch.merge([]).count == 0 and np.isnan(QuantileSketch.merge([empty, empty]).median())
+    sketch = QuantileSketch.from_values([3, 1, 2])
+    assert QuantileSketch.merge([empty, sketch, empty]).median() == 2
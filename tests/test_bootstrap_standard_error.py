@@ -0,0 +1,54 @@
+
+# Imports ----------------------------------------------------------------------
+import numpy as np
+from src.bootstrap_standard_error import BLOCK_SIZE, bootstrap_standard_error, bootstrap_standard_errors, get_chunk_size
+
+# Constants --------------------------------------------------------------------
+N_REPEATS = 2 * BLOCK_SIZE + 123                       # Several blocks, the last one is partial
+SEED = 2024
+
+# Tests ------------------------------------------------------------------------
+def get_durations() -> np.ndarray:
+    return np.random.default_rng(0).integers(1, 600, 200)
+
+def test_seeded_bootstrap_is_reproducible():
+    arr = get_durations()
+    SE1, CI1 = bootstrap_standard_error(arr, np.mean, n_repeats=N_REPEATS, seed=SEED)
+    SE2, CI2 = bootstrap_standard_error(arr, np.mean, n_repeats=N_REPEATS, seed=SEED)
+    SE3, _ = bootstrap_standard_error(arr, np.mean, n_repeats=N_REPEATS, seed=SEED + 1)
+    assert SE1 == SE2 and np.array_equal(CI1, CI2)
+    assert SE1 != SE3
+
+def test_bootstrap_does_not_depend_on_workers():
+    tasks = [(get_durations(), np.mean), (get_durations()[:50], np.median)]
+    results_1 = bootstrap_standard_errors(tasks, n_repeats=N_REPEATS, seed=SEED, n_workers=1)
+    results_3 = bootstrap_standard_errors(tasks, n_repeats=N_REPEATS, seed=SEED, n_workers=3)
+    for (SE1, CI1), (SE3, CI3) in zip(results_1, results_3):
+        assert SE1 == SE3 and np.array_equal(CI1, CI3)
+
+def test_bootstrap_tasks_match_single_task_streams():
+    """Task i of bootstrap_standard_errors() uses the i-th child stream of the seed, whatever the other tasks."""
+    arr = get_durations()
+    SE_single, _ = bootstrap_standard_errors([(arr, np.mean)], n_repeats=N_REPEATS, seed=SEED)[0]
+    SE_first, _ = bootstrap_standard_errors([(arr, np.mean), (arr[:10], np.median)], n_repeats=N_REPEATS, seed=SEED)[0]
+    assert SE_single == SE_first
+
+def test_vectorized_and_loop_measures_agree():
+    arr = get_durations()
+    SE_vectorized, CI_vectorized = bootstrap_standard_error(arr, np.median, n_repeats=N_REPEATS, seed=SEED, vectorized=True)
+    SE_loop, CI_loop = bootstrap_standard_error(arr, np.median, n_repeats=N_REPEATS, seed=SEED, vectorized=False)
+    assert SE_vectorized == SE_loop and np.array_equal(CI_vectorized, CI_loop)
+
+def test_standard_error_of_the_mean():
+    arr = get_durations()
+    SE, CI = bootstrap_standard_error(arr, np.mean, n_repeats=N_REPEATS, seed=SEED)
+    expected_SE = np.std(arr) / np.sqrt(len(arr))
+    assert abs(SE - expected_SE) < 0.05 * expected_SE
+    assert CI[0] < np.mean(arr) < CI[1]
+
+def test_chunk_size_respects_memory_cap():
+    n, itemsize = 1000, 8
+    chunk_size = get_chunk_size(n, itemsize, n_repeats=10**6, max_memory_bytes=10**6)
+    assert chunk_size * n * (np.dtype(np.intp).itemsize + itemsize) <= 10**6
+    assert get_chunk_size(n, itemsize, n_repeats=10, max_memory_bytes=10**9) == 10
+    assert get_chunk_size(10**9, itemsize, n_repeats=10, max_memory_bytes=1) == 1
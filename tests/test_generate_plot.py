@@ -0,0 +1,38 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import pytest
+from src.CSV import CSV
+import generate_plot
+from generate_plot import get_pages, split_by_page
+
+# Constants --------------------------------------------------------------------
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tests ------------------------------------------------------------------------
+def test_get_pages():
+    assert get_pages(5, None) == [(0, 5)]
+    assert get_pages(5, 2) == [(0, 2), (2, 4), (4, 5)]
+    assert get_pages(4, 2) == [(0, 2), (2, 4)]
+    with pytest.raises(AssertionError):
+        get_pages(5, 0)
+
+def test_split_by_page():
+    elements = [(2, "c"), (0, "a"), (4, "e"), (1, "b"), (0, "a2"), (7, "outside")]
+    assert split_by_page(elements, [(0, 2), (2, 4), (4, 5)]) == [["a", "b", "a2"], ["c"], ["e"]]
+    assert split_by_page(elements, [(0, 8)]) == [["c", "a", "e", "b", "a2", "outside"]]
+
+def test_pages_and_tiles_index_follow_lines_by_page(tmp_path, monkeypatch):
+    pytest.importorskip("matplotlib")
+    monkeypatch.chdir(REPO_DIR)
+    monkeypatch.setattr(generate_plot, "LINES_BY_PAGE", 2) # Set after import: read when the figure is plotted
+    monkeypatch.setattr(generate_plot, "FIG_DIR", str(tmp_path))
+    monkeypatch.setattr(generate_plot, "USE_CACHE", False)
+    NAME = generate_plot.NAMES_LIST[0]
+    fig_paths = generate_plot.plot_video(NAME)
+    tiles_index = CSV().read(os.path.join(str(tmp_path), f"{NAME}_tiles.csv"))
+    pages_paths = [path for path in fig_paths if not path.endswith("_tiles.csv")]
+    assert len(pages_paths) == len(tiles_index) > 1
+    for page_i, (path, entry) in enumerate(zip(pages_paths, tiles_index)):
+        assert os.path.isfile(path) and path.endswith(f"_page{page_i+1:03d}.png") and entry["path"] == path
+        assert int(entry["first_line"]) == 2 * page_i and int(entry["last_line"]) - int(entry["first_line"]) <= 1
@@ -0,0 +1,51 @@
+
+# Imports ----------------------------------------------------------------------
+import os
+import pytest
+from generate_stats import TABLES, generate_stats
+
+# Constants --------------------------------------------------------------------
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_DIR, "data")
+STATS_DIR = os.path.join(REPO_DIR, "stats")
+
+# Tests ------------------------------------------------------------------------
+def run_tables(stats_dir, data_dir: str=DATA_DIR, **kwargs):
+    os.makedirs(stats_dir, exist_ok=True)
+    return generate_stats(data_dir=data_dir, stats_dir=str(stats_dir), use_cache=False, profile=False, **kwargs)
+
+def get_entries(results):
+    return {table_id: table.entries for table_id, table in results.items()}
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_shipped_data_matches_versioned_stats(tmp_path, streaming):
+    run_tables(tmp_path, streaming=streaming)
+    versioned_tables = [file_name for _, file_name, _ in TABLES.values() if os.path.isfile(os.path.join(STATS_DIR, file_name))]
+    assert len(versioned_tables) > 0
+    for file_name in versioned_tables:
+        with open(os.path.join(STATS_DIR, file_name)) as fs_expected, open(tmp_path / file_name) as fs:
+            assert fs.read() == fs_expected.read(), f"{file_name} differs from the versioned table"
+
+@pytest.fixture(scope="module")
+def synthetic_results(synthetic_data, tmp_path_factory):
+    data_dir, names = synthetic_data
+    return get_entries(run_tables(tmp_path_factory.mktemp("stats"), data_dir, names=names))
+
+@pytest.mark.parametrize("options", [
+    {"streaming": True},
+    {"columnar_csv": True},
+    {"n_workers": 2},
+    {"streaming": True, "columnar_csv": True, "n_workers": 2},
+], ids=["streaming", "columnar_csv", "workers", "all"])
+def test_synthetic_tables_do_not_depend_on_options(synthetic_data, synthetic_results, tmp_path, options):
+    data_dir, names = synthetic_data
+    results = get_entries(run_tables(tmp_path, data_dir, names=names, **options))
+    assert results.keys() == synthetic_results.keys()
+    for table_id in results:
+        assert results[table_id] == synthetic_results[table_id], f"table {table_id} differs with {options}"
+
+def test_selected_tables(synthetic_data, synthetic_results, tmp_path):
+    data_dir, names = synthetic_data
+    results = get_entries(run_tables(tmp_path, data_dir, names=names, tables=["1a", "4d"]))
+    assert list(results) == ["1a", "4d"]
+    assert results["1a"] == synthetic_results["1a"] and results["4d"] == synthetic_results["4d"]
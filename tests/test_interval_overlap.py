@@ -0,0 +1,85 @@
+
+# Imports ----------------------------------------------------------------------
+import numpy as np
+import pytest
+from src.interval_overlap import KeyedIntervals, SortedIntervals, get_ragged_ranges
+
+# Constants --------------------------------------------------------------------
+N_TRIALS = 100
+
+# Tests ------------------------------------------------------------------------
+def get_random_intervals(rng: np.random.Generator, n: int):
+    """Random nested, overlapping and empty intervals."""
+    starts = rng.integers(0, 100, n)
+    return starts, starts + rng.integers(-3, 40, n)
+
+def brute_overlapping(starts, ends, query_starts, query_ends):
+    return {
+        (q, i) for q in range(len(query_starts)) for i in range(len(starts))
+        if starts[i] < ends[i] and query_starts[q] < query_ends[q] and starts[i] < query_ends[q] and ends[i] > query_starts[q]
+    }
+
+def brute_union_overlap(starts, ends, query_start, query_end):
+    covered = np.zeros(200, dtype=bool)
+    for start, end in zip(starts, ends):
+        covered[max(start, 0):max(end, 0)] = True
+    return int(covered[query_start:max(query_end, query_start)].sum())
+
+@pytest.mark.parametrize("seed", range(N_TRIALS))
+def test_sorted_intervals_queries(seed):
+    rng = np.random.default_rng(seed)
+    starts, ends = get_random_intervals(rng, int(rng.integers(0, 30)))
+    query_starts = rng.integers(-10, 120, 25)
+    query_ends = query_starts + rng.integers(-2, 30, 25)
+    points = rng.integers(-5, 130, 20)
+    intervals = SortedIntervals(starts, ends)
+    is_valid = ends > starts
+
+    # Range queries: pairs sorted by query then by interval start
+    query_ids, interval_ids = intervals.overlapping(query_starts, query_ends)
+    assert set(zip(query_ids.tolist(), interval_ids.tolist())) == brute_overlapping(starts, ends, query_starts, query_ends)
+    assert len(set(zip(query_ids.tolist(), interval_ids.tolist()))) == len(query_ids)
+    assert all(np.diff(query_ids) >= 0)
+
+    # Stabbing queries and counts
+    expected_counts = np.array([np.sum(is_valid & (starts <= point) & (ends > point)) for point in points.tolist()], dtype=np.int64)
+    point_ids, point_interval_ids = intervals.stabbing(points)
+    assert np.array_equal(np.bincount(point_ids, minlength=len(points)), expected_counts)
+    assert np.all(starts[point_interval_ids] <= points[point_ids]) and np.all(ends[point_interval_ids] > points[point_ids])
+    assert np.array_equal(intervals.count_containing(points), expected_counts)
+    assert np.array_equal(intervals.contains(points), expected_counts > 0)
+
+    # Overlap with the union
+    expected_overlaps = [brute_union_overlap(starts, ends, max(start, 0), end) for start, end in zip(query_starts.tolist(), query_ends.tolist())]
+    assert intervals.overlap(np.maximum(query_starts, 0), query_ends).tolist() == expected_overlaps
+
+@pytest.mark.parametrize("seed", range(N_TRIALS // 4))
+def test_keyed_intervals_queries(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(0, 40))
+    starts, ends = get_random_intervals(rng, n)
+    keys = [("N1_video1", f"cam_{k}") for k in rng.integers(0, 3, n).tolist()]
+    query_starts = rng.integers(-10, 120, 30)
+    query_ends = query_starts + rng.integers(-2, 30, 30)
+    query_keys = [("N1_video1", f"cam_{k}") for k in rng.integers(0, 4, 30).tolist()]
+    intervals = KeyedIntervals(starts, ends, keys)
+
+    query_ids, interval_ids = intervals.overlapping(query_starts, query_ends, query_keys)
+    expected = {(q, i) for q, i in brute_overlapping(starts, ends, query_starts, query_ends) if keys[i] == query_keys[q]}
+    assert set(zip(query_ids.tolist(), interval_ids.tolist())) == expected and len(expected) == len(query_ids)
+    assert all(np.diff(query_ids) >= 0)
+
+    point_ids, point_interval_ids = intervals.stabbing(query_starts, query_keys)
+    assert all(keys[i] == query_keys[q] for q, i in zip(point_ids.tolist(), point_interval_ids.tolist()))
+    assert np.array_equal(np.bincount(point_ids, minlength=len(query_starts)) > 0, intervals.contains(query_starts, query_keys))
+
+def test_empty_intervals_and_queries():
+    intervals = SortedIntervals([], [])
+    assert [ids.tolist() for ids in intervals.overlapping([1, 5], [4, 9])] == [[], []]
+    assert [ids.tolist() for ids in intervals.stabbing([])] == [[], []]
+    assert intervals.count_containing([3]).tolist() == [0]
+    assert intervals.containing([3]).tolist() == [-1]
+
+def test_get_ragged_ranges():
+    assert get_ragged_ranges(np.array([5, 0, 2]), np.array([2, 0, 3])).tolist() == [5, 6, 2, 3, 4]
+    assert get_ragged_ranges(np.array([], dtype=np.int64), np.array([], dtype=np.int64)).tolist() == []